@@ -1,10 +1,14 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
 from app.services.chatbot_system import chatbot_system
 from collections import defaultdict
 from app.core.security import get_current_user_id
-from collections import defaultdict, Counter
+from app.core import time_range
+from app.core.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from app.db.pagination import InvalidCursorError
 from datetime import date, timedelta
 import calendar
+import asyncio
 
 router = APIRouter()
 
@@ -17,19 +21,18 @@ async def get_daily_sentiment_summary(
     user_id: int = Depends(get_current_user_id)
 ):
     
-    # 1. DB에서 해당 날짜의 분석 기록만 가져옴
-    records = chatbot_system.db_manager.get_analyses_by_date(profile_id, target_date)
+    # 1. DB에서 해당 날짜의 일간 집계만 가져옴
+    rollups = await chatbot_system.db_manager.aget_daily_rollups(profile_id, target_date, target_date + timedelta(days=1))
 
     positive_keywords = []
     negative_keywords = []
 
-    # 2. 긍정/부정 키워드 분리
-    for record in records:
-        if record['keyword']:
-            if record['is_positive']:
-                positive_keywords.append(record['keyword'])
-            else:
-                negative_keywords.append(record['keyword'])
+    # 2. 긍정/부정 키워드 분리 (집계된 횟수만큼 펼침)
+    for rollup in rollups:
+        for keyword, count in rollup['keyword_counts'].get('positive', {}).items():
+            positive_keywords.extend([keyword] * count)
+        for keyword, count in rollup['keyword_counts'].get('negative', {}).items():
+            negative_keywords.extend([keyword] * count)
     
     # 3. 최종 응답 형식 구성
     total_count = len(positive_keywords) + len(negative_keywords)
@@ -51,28 +54,19 @@ async def get_weekly_sentiment_summary(
     profile_id: int,
     user_id: int = Depends(get_current_user_id)
 ):
-    today = date.today()
-    last_monday = today - timedelta(days=today.weekday() + 7)
-    this_monday = today - timedelta(days=today.weekday())
+    last_monday, this_monday = time_range.last_week_dates()
 
-    records = chatbot_system.db_manager.get_analyses_by_date_range(profile_id, last_monday, this_monday)
+    daily_counts, top_keywords = await asyncio.gather(
+        chatbot_system.db_manager.aget_daily_sentiment_counts(profile_id, last_monday, this_monday, keywords_only=True),
+        chatbot_system.db_manager.aget_top_keywords(profile_id, last_monday, this_monday, limit=5)
+    )
 
-    if not records:
+    if not daily_counts:
         raise HTTPException(status_code=404, detail="지난주에 분석된 대화 기록이 없습니다.")
 
-    positive_keyword_counts = Counter()
-    negative_keyword_counts = Counter()
     daily_summary_data = {i: {'positive': 0, 'negative': 0} for i in range(7)}
-
-    for record in records:
-        day_index = record['created_at'].weekday()
-        if record['keyword']:
-            if record['is_positive']:
-                positive_keyword_counts[record['keyword']] += 1
-                daily_summary_data[day_index]['positive'] += 1
-            else:
-                negative_keyword_counts[record['keyword']] += 1
-                daily_summary_data[day_index]['negative'] += 1
+    for day_count in daily_counts:
+        daily_summary_data[day_count['day'].weekday()] = {'positive': day_count['positive'], 'negative': day_count['negative']}
     
     day_names = ["월", "화", "수", "목", "금", "토", "일"]
     daily_ratios = []
@@ -93,8 +87,8 @@ async def get_weekly_sentiment_summary(
         "profile_id": profile_id,
         "start_date": last_monday.strftime('%Y-%m-%d'),
         "end_date": (this_monday - timedelta(days=1)).strftime('%Y-%m-%d'),
-        "top_positive_keywords": [{"keyword": kw, "count": count} for kw, count in positive_keyword_counts.most_common(5)],
-        "top_negative_keywords": [{"keyword": kw, "count": count} for kw, count in negative_keyword_counts.most_common(5)],
+        "top_positive_keywords": top_keywords['positive'],
+        "top_negative_keywords": top_keywords['negative'],
         "daily_summary": daily_ratios
     }
 
@@ -102,11 +96,16 @@ async def get_weekly_sentiment_summary(
 @router.get("/sentiment-summary/{profile_id}", summary="전체 기간 날짜별 분석 목록 조회")
 async def get_all_sentiment_summary(
     profile_id: int,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="한 페이지에 담을 분석 기록 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (첫 페이지는 생략)"),
     user_id: int = Depends(get_current_user_id)
 ):
-    analyses = chatbot_system.db_manager.get_analyses_by_profile_id(profile_id)
+    try:
+        analyses, next_cursor = await chatbot_system.db_manager.aget_analyses_by_profile_id(profile_id, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if not analyses:
+    if not analyses and cursor is None:
         raise HTTPException(
             status_code=404,
             detail="분석된 감정 대화 기록이 없습니다."
@@ -125,7 +124,7 @@ async def get_all_sentiment_summary(
         }
         grouped_analyses[date_key].append(formatted_record)
         
-    return grouped_analyses
+    return {"items": grouped_analyses, "next_cursor": next_cursor}
 
 
 @router.get("/summary/monthly/{profile_id}", summary="월간 긍정/부정 상태 리포트")
@@ -135,17 +134,13 @@ async def get_monthly_sentiment_summary(
     month: int = Query(..., ge=1, le=12, description="조회할 월 (1~12)"),
     user_id: int = Depends(get_current_user_id)
 ):
-    # 1. DB에서 해당 월의 데이터 조회
-    records = chatbot_system.db_manager.get_analyses_by_month(profile_id, year, month)
+    # 1. DB에서 해당 월의 일간 집계 조회
+    day_counts = await chatbot_system.db_manager.aget_daily_sentiment_counts(profile_id, *time_range.month_dates(year, month))
     
-    # 2. 일자별 긍정/부정 카운트 집계
+    # 2. 일자별 긍정/부정 카운트
     daily_counts = defaultdict(lambda: {'positive': 0, 'negative': 0})
-    for record in records:
-        day = record['created_at'].day
-        if record['is_positive']:
-            daily_counts[day]['positive'] += 1
-        else:
-            daily_counts[day]['negative'] += 1
+    for day_count in day_counts:
+        daily_counts[day_count['day'].day] = {'positive': day_count['positive'], 'negative': day_count['negative']}
             
     # 3. 해당 월의 마지막 날짜 계산
     _, num_days_in_month = calendar.monthrange(year, month)
@@ -13,6 +13,6 @@ async def check_chatroom_creation_today(
     특정 프로필에 대해 오늘 날짜로 생성된 채팅방이 있는지 확인합니다.
     """
     
-    was_created = chatbot_system.db_manager.check_chatroom_created_today(profile_id)
+    was_created = await chatbot_system.db_manager.acheck_chatroom_created_today(profile_id)
     
     return {"created_today": was_created}
\ No newline at end of file
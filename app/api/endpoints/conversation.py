@@ -1,14 +1,14 @@
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends
 from app.models.schemas import ChatRequest
 from app.services.chatbot_system import chatbot_system
 from app.core.security import get_current_user_id
+from app.api.sse import format_sse, sse_response
 
 router = APIRouter()
 
 @router.post("/talk", summary="일상 대화")
 async def handle_conversation(
     req: ChatRequest, 
-    background_tasks: BackgroundTasks,
     user_id: int = Depends(get_current_user_id) 
 ):
     result = await chatbot_system.conversation_logic.talk(req.dict(), user_id, req.profile_id)
@@ -17,8 +17,7 @@ async def handle_conversation(
     response_text = result.get("response")
 
     if result.get("type") == "continue" and chatroom_id:
-        background_tasks.add_task(
-            chatbot_system.db_manager.save_conversation_to_db, 
+        await chatbot_system.db_manager.enqueue_conversation_save(
             req.session_id, 
             req.user_input, 
             response_text, 
@@ -29,4 +28,39 @@ async def handle_conversation(
     return {
         "chatroom_id": chatroom_id,
         "response": response_text
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/talk/stream", summary="일상 대화 (스트리밍)")
+async def stream_conversation(
+    req: ChatRequest, 
+    user_id: int = Depends(get_current_user_id) 
+):
+    """
+    응답을 server-sent events 로 보냅니다.
+    - `token`: 생성된 응답 조각 `{"text": ...}`
+    - `done`: 최종 결과 `{"status", "chatroom_id", "response"}`
+    """
+    async def events():
+        async for event, payload in chatbot_system.conversation_logic.stream_talk(req.dict(), user_id, req.profile_id):
+            if event == "token":
+                yield format_sse("token", {"text": payload})
+                continue
+
+            chatroom_id = payload.get("chatroom_id")
+            if payload.get("type") == "continue" and chatroom_id:
+                # 전체 응답이 나온 뒤 저장 작업을 큐에 넣습니다.
+                await chatbot_system.db_manager.enqueue_conversation_save(
+                    req.session_id, 
+                    req.user_input, 
+                    payload.get("response"), 
+                    chatroom_id, 
+                    req.profile_id
+                )
+            yield format_sse("done", {
+                "status": payload.get("type"),
+                "chatroom_id": chatroom_id,
+                "response": payload.get("response")
+            })
+
+    return sse_response(events())
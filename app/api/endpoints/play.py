@@ -0,0 +1,114 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from app.services.chatbot_system import chatbot_system
+from app.core.security import decode_user_id
+
+router = APIRouter()
+
+async def _stream_reply(websocket: WebSocket, events, request_id):
+    """stream_talk 이 내보내는 토큰을 그대로 보내고, 마지막 결과를 반환합니다."""
+    async for event, payload in events:
+        if event == "token":
+            await websocket.send_json({"type": "token", "request_id": request_id, "text": payload})
+        else:
+            return payload
+    return {"type": "error", "response": "미안, 지금은 대답하기가 좀 힘들어."}
+
+
+async def _handle_turn(websocket: WebSocket, message: dict, user_id: int, session_id: str, profile_id: int):
+    mode = message.get("mode")
+    request_id = message.get("request_id")
+    user_input = message.get("user_input", "")
+    req = {**message, "session_id": session_id, "profile_id": profile_id, "user_input": user_input}
+
+    if mode == "conversation":
+        result = await _stream_reply(websocket, chatbot_system.conversation_logic.stream_talk(req, user_id, profile_id), request_id)
+        chatroom_id = result.get("chatroom_id")
+        if result.get("type") == "continue" and chatroom_id:
+            await chatbot_system.db_manager.enqueue_conversation_save(session_id, user_input, result.get("response"), chatroom_id, profile_id)
+        result = {"status": result.get("type"), "chatroom_id": chatroom_id, "response": result.get("response")}
+
+    elif mode == "roleplay_start":
+        response_text, chatroom_id = await chatbot_system.roleplay_logic.start(req, profile_id)
+        if chatroom_id:
+            initial_system_input = f"역할놀이 시작: 사용자({req.get('user_role')}), 봇({req.get('bot_role')})"
+            await chatbot_system.db_manager.enqueue_conversation_save(session_id, initial_system_input, response_text, chatroom_id, profile_id)
+        result = {"message": "새로운 역할놀이가 생성되었습니다.", "chatroom_id": chatroom_id, "response": response_text}
+
+    elif mode == "roleplay":
+        chatroom_id = message.get("chatroom_id")
+        result = await _stream_reply(websocket, chatbot_system.roleplay_logic.stream_talk(req, profile_id, chatroom_id), request_id)
+        if result.get("type") == "continue":
+            await chatbot_system.db_manager.enqueue_conversation_save(session_id, user_input, result.get("response"), chatroom_id, profile_id)
+        result = {
+            "status": result.get("type"),
+            "user_role": result.get("user_role"),
+            "bot_role": result.get("bot_role"),
+            "chatroom_id": chatroom_id,
+            "response": result.get("response")
+        }
+
+    elif mode in ("quiz", "chosung", "animal"):
+        if mode == "quiz":
+            result = await chatbot_system.quiz_logic.talk(req, profile_id)
+            response_text_for_db = result.get("message", "")
+        elif mode == "chosung":
+            result = await chatbot_system.chosung_logic.talk(req, profile_id)
+            response_text_for_db = result.get("message", "")
+        else:
+            result = await chatbot_system.animal_logic.talk(req, user_id, profile_id)
+            response_text_for_db = result.get("message", result.get("question", ""))
+        if result.get("chatroom_id"):
+            await chatbot_system.db_manager.enqueue_conversation_save(session_id, user_input, response_text_for_db, result["chatroom_id"], profile_id)
+
+    else:
+        await websocket.send_json({"type": "error", "request_id": request_id, "detail": f"지원하지 않는 mode 입니다: {mode}"})
+        return
+
+    await websocket.send_json({"type": "done", "request_id": request_id, "mode": mode, **result})
+
+
+@router.websocket("/play")
+async def play_session(websocket: WebSocket, session_id: str, profile_id: int, token: str = None):
+    """
+    하나의 연결에 인증된 세션 하나를 묶고, 모든 놀이 모드의 턴을 주고받습니다.
+
+    접속: `/api/ws/play?session_id=...&profile_id=...&token=<JWT>` (또는 Authorization: Bearer 헤더)
+
+    보내기: `{"mode": "conversation" | "roleplay_start" | "roleplay" | "quiz" | "chosung" | "animal", "user_input": ..., "request_id": ...}`
+    - roleplay_start 는 user_role, bot_role / roleplay 는 chatroom_id / quiz 는 topic / animal 은 animal_name 을 함께 보냅니다.
+
+    받기:
+    - `{"type": "token", "request_id", "text"}`: 대화·역할놀이 응답 조각
+    - `{"type": "done", "request_id", "mode", ...}`: 해당 HTTP 엔드포인트와 같은 최종 결과
+    - `{"type": "error", "request_id", "detail"}`
+    """
+    if token is None:
+        authorization = websocket.headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            token = authorization[7:]
+    user_id = decode_user_id(token) if token else None
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "request_id": None, "detail": "JSON 형식의 메시지만 받을 수 있습니다."})
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "request_id": None, "detail": "JSON 객체 형식의 메시지만 받을 수 있습니다."})
+                continue
+
+            try:
+                await _handle_turn(websocket, message, user_id, session_id, profile_id)
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                print(f"[오류] 웹소켓 턴 처리 중 문제 발생: {e}")
+                await websocket.send_json({"type": "error", "request_id": message.get("request_id"), "detail": "요청을 처리하지 못했습니다."})
+    except WebSocketDisconnect:
+        print(f"🔌 세션 [{session_id}] 웹소켓 연결 종료")
@@ -1,22 +1,21 @@
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends
 from app.models.schemas import RolePlayStartRequest, ChatRequest
 from app.services.chatbot_system import chatbot_system
 from app.core.security import get_current_user_id 
+from app.api.sse import format_sse, sse_response
 
 router = APIRouter()
 
 @router.post("/start", summary="역할놀이 시작")
 async def start_roleplay(
     req: RolePlayStartRequest, 
-    background_tasks: BackgroundTasks,
     profile_id: int = Depends(get_current_user_id)
     ):
     response_text, chatroom_id = await chatbot_system.roleplay_logic.start(req.dict(), profile_id)
     
     if chatroom_id:
         initial_system_input = f"역할놀이 시작: 사용자({req.user_role}), 봇({req.bot_role})"
-        background_tasks.add_task(
-            chatbot_system.db_manager.save_conversation_to_db, 
+        await chatbot_system.db_manager.enqueue_conversation_save(
             req.session_id, 
             initial_system_input, 
             response_text, 
@@ -34,7 +33,6 @@ async def start_roleplay(
 async def handle_roleplay(
     req: ChatRequest, 
     chatroom_id: int, 
-    background_tasks: BackgroundTasks,
     user_id: int = Depends(get_current_user_id)
     ):
     result = await chatbot_system.roleplay_logic.talk(req.dict(), req.profile_id, chatroom_id)
@@ -44,8 +42,7 @@ async def handle_roleplay(
     bot_role = result.get("bot_role")
 
     if result.get("type") == "continue":
-        background_tasks.add_task(
-            chatbot_system.db_manager.save_conversation_to_db, 
+        await chatbot_system.db_manager.enqueue_conversation_save(
             req.session_id, 
             req.user_input, 
             response_text, 
@@ -59,4 +56,41 @@ async def handle_roleplay(
         "bot_role": bot_role,
         "chatroom_id": chatroom_id,
         "response": response_text
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/{chatroom_id}/talk/stream", summary="역할놀이 대화 (스트리밍)")
+async def stream_roleplay(
+    req: ChatRequest, 
+    chatroom_id: int, 
+    user_id: int = Depends(get_current_user_id)
+    ):
+    """
+    응답을 server-sent events 로 보냅니다.
+    - `token`: 생성된 응답 조각 `{"text": ...}`
+    - `done`: 최종 결과 `{"status", "user_role", "bot_role", "chatroom_id", "response"}`
+    """
+    async def events():
+        async for event, payload in chatbot_system.roleplay_logic.stream_talk(req.dict(), req.profile_id, chatroom_id):
+            if event == "token":
+                yield format_sse("token", {"text": payload})
+                continue
+
+            if payload.get("type") == "continue":
+                # 전체 응답이 나온 뒤 저장 작업을 큐에 넣습니다.
+                await chatbot_system.db_manager.enqueue_conversation_save(
+                    req.session_id, 
+                    req.user_input, 
+                    payload.get("response"), 
+                    chatroom_id, 
+                    req.profile_id
+                )
+            yield format_sse("done", {
+                "status": payload.get("type"),
+                "user_role": payload.get("user_role"),
+                "bot_role": payload.get("bot_role"),
+                "chatroom_id": chatroom_id,
+                "response": payload.get("response")
+            })
+
+    return sse_response(events())
@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends
 from app.models.schemas import EndRequest, AdviceRequest
 from app.services.chatbot_system import chatbot_system
 from app.core.security import get_current_user_id
+from app.services.answer_matcher import grading_metrics
+from app.core.config import PROFILE_CACHE_TTL
 
 router = APIRouter()
 
@@ -11,11 +13,42 @@ async def end_conversation(
     user_id: int = Depends(get_current_user_id)
 ):
     await chatbot_system.db_manager.summarize_and_close_room(req.session_id)
-    return {"message": "대화가 종료되고 요약되었습니다."}
+    return {"message": "대화가 종료되었습니다. 요약은 잠시 후 채팅방에 기록됩니다."}
 
 @router.post("/relationship-advice", summary="관계 조언 생성 또는 조회")
 async def get_relationship_advice(
     req: AdviceRequest,
     user_id: int = Depends(get_current_user_id)
 ):
-    return await chatbot_system.relationship_advisor.generate_and_get_weekly_report(req.profile_id)
\ No newline at end of file
+    return await chatbot_system.relationship_advisor.generate_and_get_weekly_report(req.profile_id)
+
+@router.delete("/profiles/{profile_id}/cache", summary="프로필 캐시 무효화")
+async def invalidate_profile_cache(
+    profile_id: int,
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    프로필 이름이 바뀌었을 때 호출하면, 다음 대화부터 DB에서 새 이름을 다시 조회합니다.
+    캐시는 프로세스마다 따로 있어서 이 요청을 처리한 워커 프로세스의 캐시만 지워집니다.
+    uvicorn 워커가 여럿이면 다른 프로세스는 PROFILE_CACHE_TTL 초가 지날 때까지 이전 이름을 쓸 수 있습니다.
+    """
+    chatbot_system.db_manager.invalidate_profile(profile_id)
+    return {
+        "message": "이 서버 프로세스의 프로필 캐시가 초기화되었습니다. "
+                   f"다른 프로세스에는 최대 {PROFILE_CACHE_TTL:g}초 뒤에 반영됩니다."
+    }
+
+@router.get("/metrics", summary="서버 내부 지표")
+async def get_metrics(user_id: int = Depends(get_current_user_id)):
+    """
+    - grading: 퀴즈 종류별 채점 횟수, 규칙 채점(fast path) 비율, 캐시 포함 LLM 을 거치지 않은 비율
+    - llm: 우선순위 등급(interactive/background/batch)별 동시 호출 한도, 진행 중·대기 중 호출 수, 최대 대기열 길이, 평균 대기 시간
+    - llm_backends: Ollama 서버별 상태(정상 여부), 진행 중 요청 수와 한도, 누적 요청·실패 수, 다른 서버로 넘긴 횟수
+    - jobs: 작업 종류별 대기(queued)·처리 중(running)·포기(dead) 작업 수와 가장 오래 기다린 대기 작업의 대기 시간(초)
+    """
+    return {
+        "grading": grading_metrics.snapshot(),
+        "llm": chatbot_system.llm_dispatcher.snapshot(),
+        "llm_backends": chatbot_system.llm_pool.snapshot(),
+        "jobs": await chatbot_system.db_manager._run_sync(chatbot_system.db_manager.job_queue.stats),
+    }
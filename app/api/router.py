@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.endpoints import conversation, quiz, roleplay, utility, history, analysis, chosung, chatroom, animal
+from app.api.endpoints import conversation, quiz, roleplay, utility, history, analysis, chosung, chatroom, animal, play
 
 api_router = APIRouter()
 
@@ -12,4 +12,5 @@ api_router.include_router(history.router, prefix="/api/history", tags=["History"
 api_router.include_router(analysis.router, prefix="/api/analysis", tags=["Analysis"]) 
 api_router.include_router(chosung.router, prefix="/api/chosung", tags=["Chosung Quiz"]) 
 api_router.include_router(chatroom.router, prefix="/api/chatrooms", tags=["Chatrooms"])
-api_router.include_router(animal.router, prefix="/api/animal-quiz", tags=["Animal Quiz"]) 
+api_router.include_router(animal.router, prefix="/api/animal-quiz", tags=["Animal Quiz"])
+api_router.include_router(play.router, prefix="/api/ws", tags=["Play (WebSocket)"])
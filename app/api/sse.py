@@ -0,0 +1,16 @@
+import json
+from fastapi.responses import StreamingResponse
+
+
+def format_sse(event: str, data) -> str:
+    """server-sent events 형식의 메시지 한 개를 만듭니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events) -> StreamingResponse:
+    # 프록시(nginx 등)가 응답을 모아서 보내지 않도록 버퍼링을 끕니다.
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -13,8 +13,89 @@ DB_CONFIG = {
     'port': os.getenv('DB_PORT')
 }
 
+# --- DB 커넥션 풀 설정 ---
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '5'))  # 커넥션을 빌릴 때 최대 대기 시간(초)
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', '30'))  # 이 시간(초) 이상 쉰 커넥션은 재사용 전에 점검
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))  # 커넥션 최대 수명(초)
+DB_EXECUTOR_MAX_WORKERS = int(os.getenv('DB_EXECUTOR_MAX_WORKERS', str(DB_POOL_MAX_SIZE)))  # 비동기 DB 호출을 처리할 스레드 수
+
+# --- 대화 일괄 저장(write-behind) 설정 ---
+TALK_WRITE_BATCH_SIZE = int(os.getenv('TALK_WRITE_BATCH_SIZE', '50'))  # 이만큼 턴이 모이면 바로 저장
+TALK_WRITE_FLUSH_INTERVAL = float(os.getenv('TALK_WRITE_FLUSH_INTERVAL', '0.5'))  # 턴이 모자라도 이 시간(초)마다 저장
+
+# --- 발화 분석 설정 ---
+COMBINED_TALK_ANALYSIS = os.getenv('COMBINED_TALK_ANALYSIS', 'true').lower() == 'true'  # 감정/키워드 판단과 요약을 LLM 한 번으로 처리
+LEXICON_PRECLASSIFY = os.getenv('LEXICON_PRECLASSIFY', 'true').lower() == 'true'  # 감정이 없는 게 분명한 발화는 LLM 없이 '일반'으로 처리
+PRECLASSIFY_MAX_TOKENS = int(os.getenv('PRECLASSIFY_MAX_TOKENS', '8'))  # 이보다 긴 발화는 항상 LLM 으로 판단
+
+# --- 주제 전환 판단 설정 ---
+LOCAL_TOPIC_CHECK = os.getenv('LOCAL_TOPIC_CHECK', 'true').lower() == 'true'  # 글자 n-gram 유사도로 먼저 판단하고 애매할 때만 LLM 사용
+TOPIC_NEW_BELOW = float(os.getenv('TOPIC_NEW_BELOW', '0.02'))  # 유사도가 이보다 낮으면 새 주제
+TOPIC_SAME_ABOVE = float(os.getenv('TOPIC_SAME_ABOVE', '0.2'))  # 유사도가 이 이상이면 같은 주제
+TOPIC_HISTORY_TURNS = int(os.getenv('TOPIC_HISTORY_TURNS', '4'))  # 비교할 최근 메시지 수
+
+# --- 대화 기억(프롬프트에 넣는 대화 기록) 설정 ---
+MEMORY_TOKEN_BUDGET_CONVERSATION = int(os.getenv('MEMORY_TOKEN_BUDGET_CONVERSATION', '1200'))  # 일상 대화: 지난 대화 요약 + 최근 메시지의 최대 토큰 수
+MEMORY_TOKEN_BUDGET_ROLEPLAY = int(os.getenv('MEMORY_TOKEN_BUDGET_ROLEPLAY', '1600'))  # 역할놀이는 설정·사건을 더 길게 기억
+MEMORY_MIN_RECENT_MESSAGES = int(os.getenv('MEMORY_MIN_RECENT_MESSAGES', '2'))  # 예산을 넘어도 남겨 둘 최근 메시지 수
+ROOM_SUMMARY_EVERY_TURNS = int(os.getenv('ROOM_SUMMARY_EVERY_TURNS', '4'))  # 이 턴 수마다 새 턴을 채팅방 요약에 합침
+ROOM_CLOSE_LEASE_SECONDS = int(os.getenv('ROOM_CLOSE_LEASE_SECONDS', '300'))  # 닫기 작업을 맡은 프로세스가 이 시간(초) 안에 끝내지 못하면 다른 프로세스가 이어받음
+ROOM_CLOSE_RECOVERY_INTERVAL = float(os.getenv('ROOM_CLOSE_RECOVERY_INTERVAL', '60'))  # 이어받을 닫기 작업 확인 간격(초)
+ROOM_CLOSE_MAX_ATTEMPTS = int(os.getenv('ROOM_CLOSE_MAX_ATTEMPTS', '5'))  # 이 횟수만큼 실패한 닫기 작업은 더 시도하지 않음
+
+# --- 작업 큐(응답 뒤에 처리하는 저장·분석) 설정 ---
+JOB_QUEUE_ENABLED = os.getenv('JOB_QUEUE_ENABLED', 'true').lower() == 'true'  # false 면 API 프로세스 안에서 바로 처리 (워커 없이 개발할 때)
+JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', '4'))  # 워커 프로세스 하나가 동시에 처리하는 작업 수
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '300'))  # 작업을 가져간 워커가 이 시간(초) 안에 끝내지 못하면 다른 워커가 다시 가져감
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '5'))  # 이 횟수만큼 실패한 작업은 dead 로 남김
+JOB_RETRY_BASE_SECONDS = float(os.getenv('JOB_RETRY_BASE_SECONDS', '10'))  # 재시도 대기 시간(초), 실패할 때마다 두 배
+JOB_RETRY_MAX_SECONDS = float(os.getenv('JOB_RETRY_MAX_SECONDS', '600'))  # 재시도 대기 시간 상한(초)
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))  # 처리할 작업이 없을 때 큐 확인 간격(초)
+
+# --- 프로필 캐시 설정 ---
+PROFILE_CACHE_MAXSIZE = int(os.getenv('PROFILE_CACHE_MAXSIZE', '10000'))
+PROFILE_CACHE_TTL = float(os.getenv('PROFILE_CACHE_TTL', '600'))  # 프로필 이름 캐시 유지 시간(초)
+
+# --- 주간 리포트 일괄 생성 설정 ---
+WEEKLY_REPORT_CONCURRENCY = int(os.getenv('WEEKLY_REPORT_CONCURRENCY', '2'))  # 동시에 LLM 에 보내는 리포트 생성 요청 수
+WEEKLY_REPORT_LEASE_SECONDS = int(os.getenv('WEEKLY_REPORT_LEASE_SECONDS', '300'))  # 생성 선점 후 이 시간(초)이 지나도 끝나지 않으면 다른 워커가 넘겨받음
+WEEKLY_REPORT_POLL_INTERVAL = float(os.getenv('WEEKLY_REPORT_POLL_INTERVAL', '1'))  # 다른 워커가 생성 중일 때 결과 확인 간격(초)
+WEEKLY_REPORT_WAIT_TIMEOUT = float(os.getenv('WEEKLY_REPORT_WAIT_TIMEOUT', str(WEEKLY_REPORT_LEASE_SECONDS * 2)))  # API 요청이 리포트 생성을 기다리는 최대 시간(초)
+
+# --- 과거 발화 감정 재분석(backfill) 설정 ---
+BACKFILL_BATCH_SIZE = int(os.getenv('BACKFILL_BATCH_SIZE', '500'))  # DB 에서 한 번에 읽고, 한 트랜잭션으로 기록·체크포인트하는 발화 수
+BACKFILL_CONCURRENCY = int(os.getenv('BACKFILL_CONCURRENCY', '4'))  # 동시에 LLM 에 보내는 분석 요청 수
+
+# --- 퀴즈 채점 캐시 설정 ---
+GRADING_CACHE_MAXSIZE = int(os.getenv('GRADING_CACHE_MAXSIZE', '20000'))  # 프로세스 안 LRU 캐시 크기
+GRADING_CACHE_VERSION = os.getenv('GRADING_CACHE_VERSION', '1')  # 올리면 기존 채점 결과를 모두 무시 (프롬프트 외의 이유로 다시 채점할 때)
+GRADING_CACHE_RETENTION_DAYS = int(os.getenv('GRADING_CACHE_RETENTION_DAYS', '30'))  # 이 기간(일)이 지난 채점 결과는 grading_cache_purge 가 지움
+
+# --- LLM 호출 우선순위 설정 ---
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '0'))  # 프로세스에서 Ollama 로 동시에 보내는 전체 요청 수 (0: 백엔드 한도의 합)
+LLM_INTERACTIVE_CONCURRENCY = int(os.getenv('LLM_INTERACTIVE_CONCURRENCY', '0'))  # 대화·역할놀이·퀴즈 채점 등 실시간 응답 (0: 전체 한도까지)
+LLM_BACKGROUND_CONCURRENCY = int(os.getenv('LLM_BACKGROUND_CONCURRENCY', '1'))  # 대화 저장 후 분석, 채팅방 요약
+LLM_BATCH_CONCURRENCY = int(os.getenv('LLM_BATCH_CONCURRENCY', '1'))  # 주간 리포트 일괄 생성 등
+LLM_INTERACTIVE_RESERVED = int(os.getenv('LLM_INTERACTIVE_RESERVED', '1'))  # background + batch 가 차지하지 못하게 실시간 응답용으로 남겨 두는 자리 수
+
+# --- LLM 백엔드(Ollama 서버) 설정 ---
+OLLAMA_BACKENDS = os.getenv('OLLAMA_BACKENDS', 'http://localhost:11434')  # 쉼표로 구분, '주소=동시처리수' 로 서버별 한도 지정 가능
+OLLAMA_BACKEND_CONCURRENCY = int(os.getenv('OLLAMA_BACKEND_CONCURRENCY', '2'))  # 한도를 적지 않은 서버의 동시 처리 수 (서버의 OLLAMA_NUM_PARALLEL 과 맞춤)
+OLLAMA_HEALTH_INTERVAL = float(os.getenv('OLLAMA_HEALTH_INTERVAL', '10'))  # 헬스 체크 간격(초)
+OLLAMA_FAILURE_COOLDOWN = float(os.getenv('OLLAMA_FAILURE_COOLDOWN', '30'))  # 실패한 서버를 라우팅에서 빼 두는 시간(초)
+
+# --- 목록 조회 페이지 크기 ---
+PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', '30'))
+PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', '100'))
+
+# --- 시간대 설정 ---
+APP_TIMEZONE = os.getenv('APP_TIMEZONE', 'Asia/Seoul')  # '오늘', '지난주' 등 달력 계산 기준
+DB_TIMEZONE = os.getenv('DB_TIMEZONE', 'Asia/Seoul')  # DB 세션 시간대 (created_at 이 기록되는 기준). 일간 집계의 날짜도 이 기준이라 APP_TIMEZONE 과 같아야 함
+
 # --- 모델 설정 ---
-MODEL_NAME = os.getenv('MODEL_NAME')
+MODEL_NAME = os.getenv('MODEL_NAME', 'timhan/llama3korean8b4qkm')
 EMBEDDING_MODEL_NAME = os.getenv('EMBEDDING_MODEL_NAME')
 
 # --- 파일 경로 ---
@@ -6,23 +6,27 @@ from app.core.config import JWT_SECRET_KEY, ALGORITHM
 
 security = HTTPBearer()
 
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+def decode_user_id(token: str):
+    """JWT 를 검증하고 sub 에 담긴 사용자 id 를 반환합니다. 유효하지 않으면 None 을 반환합니다."""
     try:
-        token = credentials.credentials
         decoded_secret_key = base64.b64decode(JWT_SECRET_KEY)
         payload = jwt.decode(token, decoded_secret_key, algorithms=[ALGORITHM])
         
         user_id_str: str = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
+            return None
         
-        user_id = int(user_id_str)
-        return user_id
+        return int(user_id_str)
     except (JWTError, ValueError, AttributeError, base64.binascii.Error) as e:
         print(f"Token validation error: {e}")
-        raise credentials_exception
\ No newline at end of file
+        return None
+
+def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
+    user_id = decode_user_id(credentials.credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
@@ -0,0 +1,61 @@
+"""달력 기준(일/주/월) 조회에 쓰는 반열린 구간 [start, end) 계산 도구.
+
+DB의 created_at 컬럼은 시간대 정보가 없는 TIMESTAMP 이고, DB 세션 시간대(DB_TIMEZONE)의 현지 시각으로 기록됩니다.
+달력의 '오늘', '지난주', '이번 달'은 서비스 시간대(APP_TIMEZONE) 기준으로 계산한 뒤,
+DB_TIMEZONE 의 시간대 없는 시각으로 바꿔서 돌려줍니다.
+
+`DATE(created_at) = ...` 나 `EXTRACT(MONTH FROM created_at) = ...` 대신
+`created_at >= start AND created_at < end` 로 비교해야 created_at 인덱스를 범위 스캔으로 탈 수 있습니다.
+"""
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from app.core.config import APP_TIMEZONE, DB_TIMEZONE
+
+APP_TZ = ZoneInfo(APP_TIMEZONE)
+DB_TZ = ZoneInfo(DB_TIMEZONE)
+
+
+def today() -> date:
+    """서비스 시간대 기준 오늘 날짜."""
+    return datetime.now(APP_TZ).date()
+
+
+def db_now() -> datetime:
+    """지금 시각을 created_at 과 같은 형식(DB_TIMEZONE 의 시간대 없는 시각)으로."""
+    return datetime.now(DB_TZ).replace(tzinfo=None)
+
+
+def _to_db_naive(local_date: date) -> datetime:
+    start_of_day = datetime.combine(local_date, time.min, tzinfo=APP_TZ)
+    return start_of_day.astimezone(DB_TZ).replace(tzinfo=None)
+
+
+def date_span_range(start_date: date, end_date: date) -> tuple:
+    """start_date 0시부터 end_date 0시 직전까지의 반열린 구간. (end_date 는 포함하지 않음)"""
+    return _to_db_naive(start_date), _to_db_naive(end_date)
+
+
+def day_range(target_date: date) -> tuple:
+    return date_span_range(target_date, target_date + timedelta(days=1))
+
+
+def week_start(target_date: date) -> date:
+    """target_date 가 속한 주의 월요일."""
+    return target_date - timedelta(days=target_date.weekday())
+
+
+def last_week_dates(reference: date = None) -> tuple:
+    """지난주 월요일과 이번 주 월요일. (지난주 = [월요일, 이번 주 월요일))"""
+    this_monday = week_start(reference or today())
+    return this_monday - timedelta(days=7), this_monday
+
+
+def month_dates(year: int, month: int) -> tuple:
+    """해당 월 1일과 다음 달 1일."""
+    first_day = date(year, month, 1)
+    next_month_first_day = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first_day, next_month_first_day
+
+
+def month_range(year: int, month: int) -> tuple:
+    return date_span_range(*month_dates(year, month))
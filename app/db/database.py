@@ -1,40 +1,169 @@
-import psycopg2
 import re
-from datetime import date, timedelta
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from psycopg2 import Error
+from psycopg2.extras import execute_values
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.chat_history import InMemoryChatMessageHistory
-from app.core.config import DB_CONFIG
+from app.core.config import (
+    DB_CONFIG,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_POOL_HEALTH_CHECK_INTERVAL,
+    DB_POOL_MAX_LIFETIME,
+    DB_EXECUTOR_MAX_WORKERS,
+    TALK_WRITE_BATCH_SIZE,
+    TALK_WRITE_FLUSH_INTERVAL,
+    PROFILE_CACHE_MAXSIZE,
+    PROFILE_CACHE_TTL,
+    COMBINED_TALK_ANALYSIS,
+    LEXICON_PRECLASSIFY,
+    MEMORY_TOKEN_BUDGET_CONVERSATION,
+    MEMORY_TOKEN_BUDGET_ROLEPLAY,
+    MEMORY_MIN_RECENT_MESSAGES,
+    ROOM_SUMMARY_EVERY_TURNS,
+    ROOM_CLOSE_LEASE_SECONDS,
+    ROOM_CLOSE_RECOVERY_INTERVAL,
+    ROOM_CLOSE_MAX_ATTEMPTS,
+    JOB_QUEUE_ENABLED,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_BASE_SECONDS,
+    JOB_RETRY_MAX_SECONDS,
+    APP_TIMEZONE,
+    DB_TIMEZONE
+)
+from app.db.pool import ConnectionPool
+from app.db.write_behind import TalkWriteBehindQueue
+from app.db.room_closer import RoomCloser
+from app.db.job_queue import JobQueue
+from app.db.pagination import clamp_page_size, keyset_condition, split_page
+from app.db.migrations import pending_versions
+from app.core import time_range
+from app.core.cache import TTLCache
+from app.services.talk_analysis import parse_sentiment_keywords, parse_combined_analysis
+from app.services.sentiment_lexicon import preclassify
+from app.services.korean_text import extract_nouns
+from app.services.conversation_memory import BudgetedChatMessageHistory
+from app.services.room_summary import IncrementalRoomSummary
 from app.prompts.prompts import (
     ANALYSIS_PROMPT_TEMPLATE,
+    COMBINED_TALK_ANALYSIS_PROMPT,
     SUMMARIZATION_PROMPT_TEMPLATE,
+    MEMORY_SUMMARY_PROMPT_TEMPLATE,
     SINGLE_NEGATIVE_TALK_ANALYSIS_PROMPT,
     SINGLE_POSITIVE_TALK_ANALYSIS_PROMPT
 )
 
+# 달력 기준 조회는 created_at 을 함수로 감싸지 않고 반열린 구간으로 비교해야 인덱스 범위 스캔을 탑니다.
+# (app/db/query_plans.py 에서 실행 계획을 점검합니다)
+ANALYSES_IN_RANGE_SQL = """
+    SELECT keyword, is_positive, created_at
+    FROM analysis
+    WHERE profile_id = %s AND created_at >= %s AND created_at < %s
+"""
+
+# 분석 한 건을 일간 집계에 더합니다. keyword 가 없으면 횟수만 올립니다.
+ROLLUP_INCREMENT_SQL = """
+    INSERT INTO daily_sentiment_rollup AS r (profile_id, day, positive, negative, keyword_counts)
+    VALUES (
+        %(profile_id)s, %(day)s, %(positive)s, %(negative)s,
+        '{"positive": {}, "negative": {}}'::jsonb
+            || CASE WHEN %(keyword)s::text IS NULL THEN '{}'::jsonb
+                    ELSE jsonb_build_object(%(bucket)s::text, jsonb_build_object(%(keyword)s::text, 1)) END
+    )
+    ON CONFLICT (profile_id, day) DO UPDATE SET
+        positive = r.positive + EXCLUDED.positive,
+        negative = r.negative + EXCLUDED.negative,
+        keyword_counts = CASE
+            WHEN %(keyword)s::text IS NULL THEN r.keyword_counts
+            ELSE jsonb_set(
+                r.keyword_counts,
+                ARRAY[%(bucket)s::text, %(keyword)s::text],
+                to_jsonb(COALESCE((r.keyword_counts -> %(bucket)s::text ->> %(keyword)s::text)::int, 0) + 1)
+            )
+        END
+"""
+
+# 답변이 정해진 놀이. 이 방의 짧은 답변만 사전 분류기가 '일반'으로 확정할 수 있습니다.
+GAME_ROOM_TYPES = ('quiz', 'chosung_quiz', 'animal_quiz')
+
+CHATROOM_EXISTS_IN_RANGE_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM chatroom
+        WHERE profile_id = %s AND created_at >= %s AND created_at < %s
+    )
+"""
+
 class DatabaseManager:
     def __init__(self, model):
         self.model = model
         self.store = {}
+        self.pool = ConnectionPool(
+            DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE,
+            timeout=DB_POOL_TIMEOUT,
+            health_check_interval=DB_POOL_HEALTH_CHECK_INTERVAL,
+            max_lifetime=DB_POOL_MAX_LIFETIME,
+            **DB_CONFIG
+        )
+        self.executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_MAX_WORKERS, thread_name_prefix="db")
+        self.talk_writer = TalkWriteBehindQueue(self, TALK_WRITE_BATCH_SIZE, TALK_WRITE_FLUSH_INTERVAL)
+        self.room_closer = RoomCloser(self, ROOM_CLOSE_LEASE_SECONDS, ROOM_CLOSE_RECOVERY_INTERVAL, ROOM_CLOSE_MAX_ATTEMPTS)
+        self.job_queue = JobQueue(self, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS, JOB_RETRY_MAX_SECONDS)
+        self._local_jobs = set()  # 큐를 쓰지 않을 때 이 프로세스에서 처리 중인 작업
+        self.profile_cache = TTLCache(PROFILE_CACHE_MAXSIZE, ttl=PROFILE_CACHE_TTL)
         self.summarization_chain = self._create_summarization_chain()
+        self.memory_summary_chain = self._create_memory_summary_chain()
+        self.memory_budgets = {'conversation': MEMORY_TOKEN_BUDGET_CONVERSATION, 'roleplay': MEMORY_TOKEN_BUDGET_ROLEPLAY}
         self.sentiment_keyword_chain = self._create_sentiment_keyword_chain()
+        self.combined_analysis_chain = self._create_combined_analysis_chain() if COMBINED_TALK_ANALYSIS else None
         self.analysis_chains = {
             True: self._create_single_talk_analysis_chain(SINGLE_POSITIVE_TALK_ANALYSIS_PROMPT),
             False: self._create_single_talk_analysis_chain(SINGLE_NEGATIVE_TALK_ANALYSIS_PROMPT)
         }
-        self._ensure_table_exists()
+        self._check_schema()
 
-    def _create_db_connection(self):
+    def _get_db_connection(self):
         try:
-            return psycopg2.connect(**DB_CONFIG)
+            return self.pool.getconn()
         except Error as e:
             print(f"[DB 오류] PostgreSQL 연결 실패: {e}"); return None
 
+    def _release_db_connection(self, conn):
+        self.pool.putconn(conn)
+
+    async def _run_sync(self, func, *args):
+        """동기 DB 작업을 전용 스레드 풀에서 실행하여 이벤트 루프가 멈추지 않도록 합니다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.pool.closeall()
+
     def _get_session_history(self, session_id: str):
         if session_id not in self.store:
-            self.store[session_id] = {'history': InMemoryChatMessageHistory(), 'chatroom_id': None, 'type': 'conversation', 'roleplay_state': None, 'quiz_state': None}
+            self.store[session_id] = {'history': self._new_history('conversation'), 'chatroom_id': None, 'type': 'conversation', 'roleplay_state': None, 'quiz_state': None}
         return self.store[session_id]['history']
+
+    def _new_history(self, room_type: str, on_add=None):
+        """놀이 종류별 토큰 예산 안에서 최근 대화만 프롬프트에 넣는 대화 기록을 만듭니다."""
+        budget = self.memory_budgets.get(room_type, MEMORY_TOKEN_BUDGET_CONVERSATION)
+        return BudgetedChatMessageHistory(budget, summarizer=self._summarize_memory, min_recent=MEMORY_MIN_RECENT_MESSAGES, on_add=on_add)
+
+    async def _summarize_memory(self, summary: str, messages: list) -> str:
+        history_str = "\n".join([f"{msg.type}: {msg.content}" for msg in messages])
+        return await self.memory_summary_chain.ainvoke({"summary": summary or "없음", "history": history_str})
+
+    async def _summarize_room(self, summary: str, messages: list) -> str:
+        """지금까지의 채팅방 요약에 새 턴을 합친 한 문장 요약."""
+        history_str = "\n".join([f"{msg.type}: {msg.content}" for msg in messages])
+        raw_summary_text = await self.summarization_chain.ainvoke({"summary": summary or "없음", "history": history_str})
+        summary_match = re.search(r"\[요약\]:\s*(.*)", raw_summary_text, re.DOTALL)
+        return summary_match.group(1).strip() if summary_match else raw_summary_text.strip()
     
     def _create_sentiment_keyword_chain(self):
         try:
@@ -43,6 +172,13 @@ class DatabaseManager:
         except Exception as e:
             print(f"[오류] 감정/키워드 분석 체인 생성 실패: {e}"); return None
 
+    def _create_combined_analysis_chain(self):
+        try:
+            prompt = ChatPromptTemplate.from_template(COMBINED_TALK_ANALYSIS_PROMPT)
+            return prompt | self.model | StrOutputParser()
+        except Exception as e:
+            print(f"[오류] 통합 분석 체인 생성 실패: {e}"); return None
+
     def _create_summarization_chain(self):
         try:
             prompt = ChatPromptTemplate.from_template(SUMMARIZATION_PROMPT_TEMPLATE)
@@ -50,6 +186,13 @@ class DatabaseManager:
         except Exception as e:
             print(f"[오류] 요약 체인 생성 실패: {e}"); return None
             
+    def _create_memory_summary_chain(self):
+        try:
+            prompt = ChatPromptTemplate.from_template(MEMORY_SUMMARY_PROMPT_TEMPLATE)
+            return prompt | self.model | StrOutputParser()
+        except Exception as e:
+            print(f"[오류] 대화 기억 요약 체인 생성 실패: {e}"); return None
+
     def _create_single_talk_analysis_chain(self, prompt_template):
         try:
             prompt = ChatPromptTemplate.from_template(prompt_template)
@@ -57,91 +200,28 @@ class DatabaseManager:
         except Exception as e:
             print(f"[오류] 단일 대화 분석 체인 생성 실패: {e}"); return None
 
-    def _ensure_table_exists(self):
-        conn = self._create_db_connection()
+    def _check_schema(self):
+        """스키마 버전만 확인합니다. 마이그레이션은 배포 단계(python -m app.db.migrations)에서 적용하고,
+        적용되지 않은 버전이 있으면 절반만 바뀐 스키마로 뜨지 않도록 시작을 멈춥니다.
+        """
+        conn = self._get_db_connection()
         if conn is None: return
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS chatroom (
-                        id BIGSERIAL PRIMARY KEY, 
-                        profile_id BIGINT NOT NULL, 
-                        topic TEXT, 
-                        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                    );""")
-
-                cursor.execute("""
-                    DO $$
-                    BEGIN
-                        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'sentiment_type') THEN
-                            CREATE TYPE sentiment_type AS ENUM ('긍정', '부정', '일반');
-                        END IF;
-                    END$$;
-                """)
-                
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS talk (
-                        id BIGSERIAL PRIMARY KEY,
-                        chatroom_id BIGINT NOT NULL REFERENCES chatroom(id) ON DELETE CASCADE,
-                        profile_id BIGINT NOT NULL,
-                        category VARCHAR(50) NOT NULL,
-                        content TEXT NOT NULL,
-                        session_id VARCHAR(255),
-                        role VARCHAR(255),
-                        created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        "like" BOOLEAN,
-                        sentiment sentiment_type DEFAULT '일반',
-                        keywords TEXT[]
-                    );""")
-                
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS analysis (
-                        id BIGSERIAL PRIMARY KEY,
-                        talk_id BIGINT NOT NULL UNIQUE REFERENCES talk(id),
-                        profile_id BIGINT NOT NULL,
-                        summary TEXT NOT NULL,
-                        keyword TEXT, -- 키워드 저장을 위한 컬럼 추가
-                        is_positive BOOLEAN NOT NULL,
-                        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-                    );""")
-                
-                cursor.execute("""
-                    CREATE OR REPLACE FUNCTION update_updated_at_column() RETURNS TRIGGER AS $$
-                    BEGIN NEW.updated_at = NOW(); RETURN NEW; END;
-                    $$ language 'plpgsql';""")
-                
-                cursor.execute("""
-                    DO $$
-                    BEGIN
-                        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_talk_updated_at') THEN
-                            CREATE TRIGGER update_talk_updated_at 
-                            BEFORE UPDATE ON talk 
-                            FOR EACH ROW 
-                            EXECUTE FUNCTION update_updated_at_column();
-                        END IF;
-                    END$$;
-                """)
-
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS weekly_reports (
-                        id BIGSERIAL PRIMARY KEY,
-                        profile_id BIGINT NOT NULL,
-                        start_date DATE NOT NULL,
-                        end_date DATE NOT NULL,
-                        report_content TEXT NOT NULL,
-                        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE (profile_id, start_date) -- 한 프로필에 대해 해당 주차의 리포트는 하나만 존재
-                    );""")
-
-            conn.commit()
-            print("[DB 정보] 테이블 상태 확인 및 준비 완료.")
+            pending = pending_versions(conn)
         except Error as e:
-            print(f"[DB 오류] 테이블 생성/확인 실패: {e}"); conn.rollback()
+            print(f"[DB 오류] 스키마 버전 확인 실패: {e}"); conn.rollback(); return
         finally:
-            if conn: conn.close()
+            if conn: self._release_db_connection(conn)
+        if pending:
+            raise RuntimeError(
+                f"적용되지 않은 마이그레이션이 있습니다: {pending}. 먼저 'python -m app.db.migrations' 를 실행하세요."
+            )
+        print("[DB 정보] 스키마 버전 확인 완료.")
+        if APP_TIMEZONE != DB_TIMEZONE:
+            print(f"[경고] APP_TIMEZONE({APP_TIMEZONE})과 DB_TIMEZONE({DB_TIMEZONE})이 달라 일간 감정 집계의 날짜 경계가 달력과 어긋납니다.")
 
     async def summarize_and_close_room(self, session_id: str, final_input: str = None):
+        """세션에서 현재 채팅방을 떼어 내고 요약은 room_closer 에 맡깁니다. (LLM 요약을 기다리지 않음)"""
         session_state = self.store.get(session_id)
         if not session_state or not session_state.get('chatroom_id'):
             return
@@ -153,9 +233,10 @@ class DatabaseManager:
             from langchain_core.messages import HumanMessage
             history.add_message(HumanMessage(content=final_input))
 
-        summary = ""
         room_type = session_state.get('type', 'conversation')
         quiz_info = session_state.get('quiz_state')
+        room_summary = session_state.get('room_summary')
+        label, summary = None, ""
 
         if room_type == 'quiz' and quiz_info:
             quiz_topic = quiz_info.get('topic', '안전 퀴즈')
@@ -164,32 +245,10 @@ class DatabaseManager:
              summary = "[초성퀴즈]를 완료했어요."
         elif room_type == 'animal_quiz':
              summary = "[동물퀴즈]를 완료했어요."
-        elif history.messages:
-            full_history_str = "\n".join([f"{msg.type}: {msg.content}" for msg in history.messages])
-            raw_summary_text = await self.summarization_chain.ainvoke({"history": full_history_str})
-            
-            summary_match = re.search(r"\[요약\]:\s*(.*)", raw_summary_text, re.DOTALL)
-            summary_text = summary_match.group(1).strip() if summary_match else raw_summary_text.strip()
-            
-            if room_type == 'roleplay' and session_state.get('roleplay_state'):
-                summary = f"[역할놀이] {summary_text}"
-            else:
-                summary = f"[일상대화] {summary_text}"
-        
-        if summary:
-            conn = self._create_db_connection()
-            if conn is None: return
-            try:
-                with conn.cursor() as cursor:
-                    cursor.execute("UPDATE chatroom SET topic = %s WHERE id = %s", (summary, current_chatroom_id))
-                    conn.commit()
-                print(f"채팅방({current_chatroom_id}) 요약 완료: {summary}")
-            except Error as e:
-                print(f"[DB 오류] 채팅방 요약 실패: {e}"); conn.rollback()
-            finally:
-                if conn: conn.close()
+        elif room_summary:
+            label = "[역할놀이]" if room_type == 'roleplay' and session_state.get('roleplay_state') else "[일상대화]"
         
-        # 세션 초기화
+        # 세션 초기화 (새 채팅방은 요약이 끝나기를 기다리지 않고 바로 만들 수 있음)
         session_state_keys = list(session_state.keys())
         for key in session_state_keys:
             if key not in ['history', 'chatroom_id']:
@@ -198,114 +257,266 @@ class DatabaseManager:
         session_state['chatroom_id'] = None
         print(f"세션({session_id})이 초기화되었습니다.")
 
-    async def create_new_chatroom(self, session_id: str, profile_id: int, room_type: str):
-        await self.summarize_and_close_room(session_id)
-        session_state = self.store.setdefault(session_id, {})
-        session_state['history'] = InMemoryChatMessageHistory()
-        session_state['type'] = room_type
-        conn = self._create_db_connection()
+        await self.room_closer.enqueue(current_chatroom_id, label, summary, room_summary if label else None)
+
+    def _insert_chatroom(self, profile_id: int, topic: str):
+        conn = self._get_db_connection()
         if conn is None: return None
         try:
             with conn.cursor() as cursor:
-                topic_map = {'quiz': "새로운 퀴즈", 'roleplay': "새로운 역할놀이", 'conversation': "새로운 대화"}
-                topic = topic_map.get(room_type, "새로운 대화")
                 cursor.execute("INSERT INTO chatroom (profile_id, topic) VALUES (%s, %s) RETURNING id", (profile_id, topic))
                 new_chatroom_id = cursor.fetchone()[0]
-                session_state['chatroom_id'] = new_chatroom_id
                 conn.commit()
-                print(f"새 채팅방 생성 (타입: {room_type}, ID: {new_chatroom_id})")
                 return new_chatroom_id
         except Error as e:
             print(f"[DB 오류] 새 채팅방 생성 실패: {e}"); conn.rollback(); return None
         finally:
-            if conn: conn.close()
-            
-    async def _analyze_and_save_talk_analysis(self, talk_id: int, profile_id: int, user_input: str, is_positive: bool):
-        analysis_chain = self.analysis_chains.get(is_positive)
-        if not analysis_chain: return
+            if conn: self._release_db_connection(conn)
 
-        try:
-            raw_response = await analysis_chain.ainvoke({"user_talk": user_input})
-            
-            summary_match = re.search(r"\[요약문\]:\s*(.*)", raw_response)
-            keyword_match = re.search(r"\[핵심 단어\]:\s*(.*)", raw_response)
+    async def create_new_chatroom(self, session_id: str, profile_id: int, room_type: str):
+        await self.summarize_and_close_room(session_id)
+        session_state = self.store.setdefault(session_id, {})
+        room_summary = IncrementalRoomSummary(self._summarize_room, ROOM_SUMMARY_EVERY_TURNS)
+        session_state['room_summary'] = room_summary
+        session_state['history'] = self._new_history(room_type, on_add=room_summary.add_messages)
+        session_state['type'] = room_type
+        topic_map = {'quiz': "새로운 퀴즈", 'roleplay': "새로운 역할놀이", 'conversation': "새로운 대화"}
+        topic = topic_map.get(room_type, "새로운 대화")
+        new_chatroom_id = await self._run_sync(self._insert_chatroom, profile_id, topic)
+        if new_chatroom_id is None: return None
+        session_state['chatroom_id'] = new_chatroom_id
+        print(f"새 채팅방 생성 (타입: {room_type}, ID: {new_chatroom_id})")
+        return new_chatroom_id
             
-            clean_summary = summary_match.group(1).strip() if summary_match else "분석 결과를 요약하는 데 실패했어요."
-            clean_keyword = keyword_match.group(1).strip() if keyword_match else None
-            print(clean_keyword)
-            print(clean_summary)
-            conn = self._create_db_connection()
-            if conn is None: return
-            try:
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        "INSERT INTO analysis (talk_id, profile_id, summary, keyword, is_positive) VALUES (%s, %s, %s, %s, %s)",
-                        (talk_id, profile_id, clean_summary, clean_keyword, is_positive)
-                    )
-                conn.commit()
-                print(f"✅ 대화 분석 완료 및 저장 (talk_id: {talk_id}, positive: {is_positive})")
-            except Error as e:
-                print(f"[DB 오류] 분석 결과 저장 실패: {e}"); conn.rollback()
-            finally:
-                if conn: conn.close()
+    async def analyze_talk(self, talk_id: int, profile_id: int, user_input: str, is_positive: bool, created_at: str = None):
+        """발화 하나의 요약문/핵심 단어를 만들어 analysis 에 저장합니다. 실패하면 예외를 그대로 올립니다. (작업 큐가 재시도)
+        created_at: 발화 시각(ISO 형식). 주면 처리 시각 대신 이 시각으로 기록하고 일간 집계에 반영합니다.
+        """
+        if not self.analysis_chains.get(is_positive): return
+        clean_summary, clean_keyword = await self._summarize_talk(user_input, is_positive)
+        print(clean_keyword)
+        print(clean_summary)
+        if not await self._run_sync(self._save_talk_analysis, talk_id, profile_id, clean_summary, clean_keyword, is_positive, created_at):
+            raise RuntimeError(f"분석 결과 저장 실패 (talk_id: {talk_id})")
+
+    async def _summarize_talk(self, user_input: str, is_positive: bool) -> tuple:
+        """(요약문, 핵심 단어). 핵심 단어를 찾지 못하면 None."""
+        raw_response = await self.analysis_chains[is_positive].ainvoke({"user_talk": user_input})
+
+        summary_match = re.search(r"\[요약문\]:\s*(.*)", raw_response)
+        keyword_match = re.search(r"\[핵심 단어\]:\s*(.*)", raw_response)
+
+        clean_summary = summary_match.group(1).strip() if summary_match else "분석 결과를 요약하는 데 실패했어요."
+        clean_keyword = keyword_match.group(1).strip() if keyword_match else None
+        return clean_summary, clean_keyword
+
+    async def _analyze_and_save_talk_analysis(self, talk_id: int, profile_id: int, user_input: str, is_positive: bool, created_at: str = None):
+        try:
+            await self.analyze_talk(talk_id, profile_id, user_input, is_positive, created_at)
         except Exception as e:
             print(f"[오류] 대화 분석 중 문제 발생: {e}")
+
+    def _save_talk_analysis(self, talk_id: int, profile_id: int, summary: str, keyword: str, is_positive: bool, created_at: str = None):
+        """분석 결과를 저장하고 일간 집계를 올립니다. 같은 발화의 분석이 이미 있으면(다시 배달된 작업) 저장한 것으로 봅니다."""
+        conn = self._get_db_connection()
+        if conn is None: return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO analysis (talk_id, profile_id, summary, keyword, is_positive, created_at)
+                    SELECT %s, %s, %s, %s, %s, COALESCE(%s::timestamp, CURRENT_TIMESTAMP)
+                    WHERE NOT EXISTS (SELECT 1 FROM analysis WHERE talk_id = %s)
+                    RETURNING created_at
+                    """,
+                    (talk_id, profile_id, summary, keyword, is_positive, created_at, talk_id)
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    conn.rollback()
+                    print(f"[정보] 이미 분석이 저장된 발화라 건너뜁니다. (talk_id: {talk_id})")
+                    return True
+                created_at = row[0]
+                cursor.execute(ROLLUP_INCREMENT_SQL, {
+                    "profile_id": profile_id,
+                    "day": created_at.date(),
+                    "positive": 1 if is_positive else 0,
+                    "negative": 0 if is_positive else 1,
+                    "bucket": "positive" if is_positive else "negative",
+                    "keyword": keyword or None
+                })
+            conn.commit()
+            print(f"✅ 대화 분석 완료 및 저장 (talk_id: {talk_id}, positive: {is_positive})")
+            return True
+        except Error as e:
+            print(f"[DB 오류] 분석 결과 저장 실패: {e}"); conn.rollback(); return False
+        finally:
+            if conn: self._release_db_connection(conn)
             
 
-    async def save_conversation_to_db(self, session_id: str, user_input: str, bot_response: str, chatroom_id: int, profile_id: int):
-        sentiment = "일반"
-        keywords_list = []
+    async def _analyze_user_input(self, user_input: str, raise_errors: bool = False, game_turn: bool = False) -> dict:
+        """발화의 감정/키워드(와 가능하면 요약문/핵심 단어까지)를 분석합니다.
+        감정이 없는 게 분명한 발화는 로컬 사전 분류기로 끝내고, 나머지는 통합 체인을 먼저 쓰되
+        출력 형식이 깨졌으면 기존 감정/키워드 체인으로 다시 분석합니다.
+        raise_errors: 마지막 체인까지 실패했을 때 '일반'으로 처리하지 않고 예외를 올립니다. (기존 라벨을 덮어쓰는 재분석용)
+        game_turn: 퀴즈·초성·동물 퀴즈의 답변이면 True (사전 분류기가 짧은 답변을 '일반'으로 확정할 수 있음)
+        """
+        if LEXICON_PRECLASSIFY and preclassify(user_input, game_turn) == "일반":
+            return {"sentiment": "일반", "keywords": extract_nouns(user_input), "summary": None, "keyword": None}
+
+        if self.combined_analysis_chain:
+            try:
+                analysis = parse_combined_analysis(await self.combined_analysis_chain.ainvoke({"text": user_input}))
+                if analysis:
+                    return analysis
+                print("[경고] 통합 분석 출력 형식이 올바르지 않아 감정/키워드 분석을 다시 실행합니다.")
+            except Exception as e:
+                print(f"[오류] 통합 분석 중 오류 발생: {e}")
+
         if self.sentiment_keyword_chain:
             try:
-                analysis_result = await self.sentiment_keyword_chain.ainvoke({"text": user_input})
-                
-                if "[판단: 긍정]" in analysis_result:
-                    sentiment = "긍정"
-                elif "[판단: 부정]" in analysis_result:
-                    sentiment = "부정"
-                
-                keywords_match = re.search(r"\[키워드:\s*(.*)\]", analysis_result)
-                keywords_list = [k.strip() for k in keywords_match.group(1).split(',') if k.strip()] if keywords_match else []
+                return parse_sentiment_keywords(await self.sentiment_keyword_chain.ainvoke({"text": user_input}))
             except Exception as e:
+                if raise_errors: raise
                 print(f"[오류] 분석 중 오류 발생: {e}")
+        return {"sentiment": "일반", "keywords": [], "summary": None, "keyword": None}
+
+    def _room_type_for(self, session_id: str) -> str:
+        return self.store.get(session_id, {}).get('type', 'conversation')
+
+    def _category_for(self, session_id: str) -> str:
+        category_map = {'quiz': 'SAFETYSTUDY', 'roleplay': 'ROLEPLAY', 'conversation': 'LIFESTYLEHABIT'}
+        return category_map.get(self._room_type_for(session_id), 'LIFESTYLEHABIT')
+
+    async def enqueue_conversation_save(self, session_id: str, user_input: str, bot_response: str, chatroom_id: int, profile_id: int):
+        """응답을 보낸 뒤의 대화 저장·분석을 작업 큐에 넣고 바로 돌아옵니다. 처리는 워커(app/jobs/worker.py)가 합니다.
+        category 와 room_type 은 세션 상태가 바뀌기 전에, 발화 시각(turn_at)은 큐에서 기다린 시간과 상관없이 지금 정해 둡니다.
+        """
+        payload = {
+            'session_id': session_id,
+            'user_input': user_input,
+            'bot_response': bot_response,
+            'chatroom_id': chatroom_id,
+            'profile_id': profile_id,
+            'category': self._category_for(session_id),
+            'room_type': self._room_type_for(session_id),
+            'turn_at': time_range.db_now().isoformat()
+        }
+        await self._enqueue_or_run("save_conversation", payload, self.save_conversation_to_db)
 
-        conn = self._create_db_connection()
-        if conn is None: return
-        user_talk_id = None
+    async def _enqueue_or_run(self, kind: str, payload: dict, handler):
+        if JOB_QUEUE_ENABLED and await self.job_queue.enqueue(kind, payload) is not None:
+            return
+        # 큐를 쓰지 않거나 넣지 못했으면 이 프로세스에서 처리합니다.
+        task = asyncio.get_running_loop().create_task(handler(**payload))
+        self._local_jobs.add(task)
+        task.add_done_callback(self._local_jobs.discard)
+
+    async def save_conversation_to_db(self, session_id: str, user_input: str, bot_response: str, chatroom_id: int, profile_id: int,
+                                      category: str = None, room_type: str = None, turn_at: str = None, job_id: int = None):
+        """발화를 분석해서 대화 턴을 저장하고, 사용자 발화의 talk id 를 반환합니다. (저장에 실패하면 None)
+        turn_at: 발화 시각(ISO 형식). talk/analysis 의 created_at 으로 씁니다. (없으면 저장 시각)
+        job_id: 작업 큐에서 온 저장이면 그 작업 id. 다시 배달된 작업이면 새로 저장하지 않고 처음 저장한 talk id 를 돌려받습니다.
+        """
+        room_type = room_type or self._room_type_for(session_id)
+        analysis = await self._analyze_user_input(user_input, game_turn=room_type in GAME_ROOM_TYPES)
+        sentiment = analysis["sentiment"]
+        keywords_list = analysis["keywords"]
+
+        user_talk_id = await self.talk_writer.submit({
+            'session_id': session_id,
+            'user_input': user_input,
+            'bot_response': bot_response,
+            'category': category or self._category_for(session_id),
+            'chatroom_id': chatroom_id,
+            'profile_id': profile_id,
+            'sentiment': sentiment,
+            'keywords': keywords_list,
+            'created_at': turn_at,
+            'job_id': job_id
+        })
+
+        if sentiment != "일반" and keywords_list and user_talk_id:
+            is_positive_for_analysis = (sentiment == "긍정")
+            if analysis["summary"]:
+                # 통합 분석에서 요약문까지 받았으면 추가 LLM 호출 없이 바로 저장합니다.
+                await self._run_sync(self._save_talk_analysis, user_talk_id, profile_id, analysis["summary"], analysis["keyword"], is_positive_for_analysis, turn_at)
+            else:
+                # 요약문 생성은 따로 실패·재시도할 수 있도록 별도 작업으로 넘깁니다.
+                payload = {'talk_id': user_talk_id, 'profile_id': profile_id, 'user_input': user_input, 'is_positive': is_positive_for_analysis, 'created_at': turn_at}
+                await self._enqueue_or_run("analyze_talk", payload, self._analyze_and_save_talk_analysis)
+        return user_talk_id
+
+    def _insert_talk_batch(self, turns: list):
+        """여러 턴을 한꺼번에 저장하고, 턴 순서대로 사용자 발화 talk id 를 반환합니다.
+        한 턴 때문에 일괄 저장이 실패하면 한 턴씩 다시 저장해서, 문제가 된 턴만 None 이 되게 합니다.
+        """
+        user_talk_ids = self._insert_talk_rows(turns)
+        if user_talk_ids is None and len(turns) > 1:
+            print(f"[정보] 일괄 저장이 실패해서 {len(turns)}턴을 한 턴씩 다시 저장합니다.")
+            user_talk_ids = [(self._insert_talk_rows([turn]) or [None])[0] for turn in turns]
+        return user_talk_ids
+
+    def _insert_talk_rows(self, turns: list):
+        """여러 턴의 사용자/봇 발화를 한 번의 다중 행 INSERT 로 저장하고, 턴 순서대로 사용자 발화 talk id 를 반환합니다.
+        id 를 시퀀스에서 미리 받아 두어 어떤 행이 어떤 턴인지 정확히 대응시킵니다.
+        job_id 가 같은 턴이 이미 저장돼 있으면(다시 배달된 작업) 새로 넣지 않고 그때의 사용자 발화 talk id 를 돌려줍니다.
+        """
+        conn = self._get_db_connection()
+        if conn is None: return None
         try:
             with conn.cursor() as cursor:
-                category_map = {'quiz': 'SAFETYSTUDY', 'roleplay': 'ROLEPLAY', 'conversation': 'LIFESTYLEHABIT'}
-                category = category_map.get(self.store.get(session_id, {}).get('type', 'conversation'), 'LIFESTYLEHABIT')
-                
                 cursor.execute(
-                    """INSERT INTO talk (session_id, role, content, category, profile_id, sentiment, keywords, "like", chatroom_id) 
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, NULL, %s) RETURNING id""",
-                    (session_id, 'user', user_input, category, profile_id, sentiment, keywords_list, chatroom_id)
+                    "SELECT nextval(pg_get_serial_sequence('talk', 'id')) FROM generate_series(1, %s)",
+                    (len(turns) * 2,)
                 )
-                user_talk_id = cursor.fetchone()[0]
-
-                cursor.execute(
-                    """INSERT INTO talk (session_id, role, content, category, profile_id, "like", chatroom_id) 
-                       VALUES (%s, 'bot', %s, %s, %s, NULL, %s)""",
-                    (session_id, bot_response, category, profile_id, chatroom_id)
+                talk_ids = sorted(row[0] for row in cursor.fetchall())
+                rows = []
+                user_talk_ids = []
+                for index, turn in enumerate(turns):
+                    user_talk_id, bot_talk_id = talk_ids[index * 2], talk_ids[index * 2 + 1]
+                    user_talk_ids.append(user_talk_id)
+                    created_at, job_id = turn.get('created_at'), turn.get('job_id')
+                    rows.append((user_talk_id, turn['session_id'], 'user', turn['user_input'], turn['category'],
+                                 turn['profile_id'], turn['sentiment'], turn['keywords'], turn['chatroom_id'], created_at, job_id))
+                    rows.append((bot_talk_id, turn['session_id'], 'bot', turn['bot_response'], turn['category'],
+                                 turn['profile_id'], '일반', None, turn['chatroom_id'], created_at, job_id))
+                inserted = execute_values(
+                    cursor,
+                    """INSERT INTO talk (id, session_id, role, content, category, profile_id, sentiment, keywords, chatroom_id, created_at, job_id)
+                       VALUES %s
+                       ON CONFLICT (job_id, role) WHERE job_id IS NOT NULL DO NOTHING
+                       RETURNING id""",
+                    rows,
+                    template="(%s, %s, %s, %s, %s, %s, %s::sentiment_type, %s::text[], %s, COALESCE(%s::timestamp, CURRENT_TIMESTAMP), %s)",
+                    page_size=len(rows),
+                    fetch=True
                 )
+                inserted_ids = {row[0] for row in inserted}
+                duplicate_job_ids = [turn['job_id'] for turn, talk_id in zip(turns, user_talk_ids) if talk_id not in inserted_ids]
+                if duplicate_job_ids:
+                    cursor.execute("SELECT job_id, id FROM talk WHERE job_id = ANY(%s) AND role = 'user'", (duplicate_job_ids,))
+                    existing = dict(cursor.fetchall())
+                    user_talk_ids = [talk_id if talk_id in inserted_ids else existing.get(turn['job_id'])
+                                     for turn, talk_id in zip(turns, user_talk_ids)]
+                    print(f"[정보] 이미 저장된 작업의 대화 {len(duplicate_job_ids)}턴은 다시 저장하지 않았습니다.")
             conn.commit()
-            print(f"✅ 채팅방[{chatroom_id}] 대화 저장 완료")
+            print(f"✅ 대화 {len(turns)}턴 일괄 저장 완료")
+            return user_talk_ids
         except Error as e:
-            print(f"[DB 오류] 메시지 저장 실패: {e}"); conn.rollback()
+            print(f"[DB 오류] 메시지 일괄 저장 실패: {e}"); conn.rollback(); return None
         finally:
-            if conn: conn.close()
-
-        if sentiment != "일반" and keywords_list and user_talk_id:
-            is_positive_for_analysis = (sentiment == "긍정")
-            await self._analyze_and_save_talk_analysis(user_talk_id, profile_id, user_input, is_positive_for_analysis)
-
-    def get_analyses_by_profile_id(self, profile_id: int):
-        conn = self._create_db_connection()
-        if conn is None: return []
+            if conn: self._release_db_connection(conn)
+
+    def get_analyses_by_profile_id(self, profile_id: int, limit: int = None, cursor: str = None):
+        """프로필의 분석 기록을 최신순으로 한 페이지 조회합니다. (행 목록, 다음 페이지 커서)를 반환합니다."""
+        limit = clamp_page_size(limit)
+        keyset_sql, keyset_params = keyset_condition(cursor, descending=True, created_at_column="a.created_at", id_column="a.id")
+        conn = self._get_db_connection()
+        if conn is None: return [], None
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
+            with conn.cursor() as db_cursor:
+                db_cursor.execute(f"""
                     SELECT 
                         a.id, 
                         a.talk_id, 
@@ -319,62 +530,71 @@ class DatabaseManager:
                     JOIN 
                         talk AS t ON a.talk_id = t.id
                     WHERE 
-                        a.profile_id = %s
+                        a.profile_id = %s {keyset_sql}
                     ORDER BY 
-                        a.created_at DESC
-                """, (profile_id,))
-                analyses = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in analyses]
+                        a.created_at DESC, a.id DESC
+                    LIMIT %s
+                """, (profile_id, *keyset_params, limit + 1))
+                analyses = db_cursor.fetchall()
+                columns = [desc[0] for desc in db_cursor.description]
+                return split_page([dict(zip(columns, row)) for row in analyses], limit)
         except Error as e:
             print(f"[DB 오류] 분석 목록 조회 실패: {e}")
-            return []
+            return [], None
         finally:
-            if conn: conn.close()
+            if conn: self._release_db_connection(conn)
 
 
-    def get_chatrooms_by_profile_id(self, profile_id: int):
-        conn = self._create_db_connection()
-        if conn is None: return []
+    def get_chatrooms_by_profile_id(self, profile_id: int, limit: int = None, cursor: str = None):
+        """프로필의 채팅방을 최신순으로 한 페이지 조회합니다. (행 목록, 다음 페이지 커서)를 반환합니다."""
+        limit = clamp_page_size(limit)
+        keyset_sql, keyset_params = keyset_condition(cursor, descending=True)
+        conn = self._get_db_connection()
+        if conn is None: return [], None
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
+            with conn.cursor() as db_cursor:
+                db_cursor.execute(f"""
                     SELECT id, topic, created_at
                     FROM chatroom
-                    WHERE profile_id = %s
-                    ORDER BY created_at DESC
-                """, (profile_id,))
-                chatrooms = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in chatrooms]
+                    WHERE profile_id = %s {keyset_sql}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT %s
+                """, (profile_id, *keyset_params, limit + 1))
+                chatrooms = db_cursor.fetchall()
+                columns = [desc[0] for desc in db_cursor.description]
+                return split_page([dict(zip(columns, row)) for row in chatrooms], limit)
         except Error as e:
             print(f"[DB 오류] 채팅방 목록 조회 실패: {e}")
-            return []
+            return [], None
         finally:
-            if conn: conn.close()
-
-    def get_talks_by_chatroom_id(self, chatroom_id: int):
-        conn = self._create_db_connection()
-        if conn is None: return []
+            if conn: self._release_db_connection(conn)
+
+    def get_talks_by_chatroom_id(self, chatroom_id: int, limit: int = None, cursor: str = None):
+        """채팅방의 대화를 시간순으로 한 페이지 조회합니다. (행 목록, 다음 페이지 커서)를 반환합니다."""
+        limit = clamp_page_size(limit)
+        keyset_sql, keyset_params = keyset_condition(cursor, descending=False)
+        conn = self._get_db_connection()
+        if conn is None: return [], None
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
+            with conn.cursor() as db_cursor:
+                db_cursor.execute(f"""
                     SELECT id, role, content, created_at
                     FROM talk
-                    WHERE chatroom_id = %s
-                    ORDER BY created_at ASC
-                """, (chatroom_id,))
-                talks = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in talks]
+                    WHERE chatroom_id = %s {keyset_sql}
+                    ORDER BY created_at ASC, id ASC
+                    LIMIT %s
+                """, (chatroom_id, *keyset_params, limit + 1))
+                talks = db_cursor.fetchall()
+                columns = [desc[0] for desc in db_cursor.description]
+                return split_page([dict(zip(columns, row)) for row in talks], limit)
         except Error as e:
             print(f"[DB 오류] 대화 내용 조회 실패: {e}")
-            return []
+            return [], None
         finally:
-            if conn: conn.close()
+            if conn: self._release_db_connection(conn)
 
     def update_talk_feedback(self, talk_id: int, like_status: bool):
-        conn = self._create_db_connection()
+        conn = self._get_db_connection()
         if conn is None: return False
         try:
             with conn.cursor() as cursor:
@@ -389,141 +609,217 @@ class DatabaseManager:
             conn.rollback()
             return False
         finally:
-            if conn: conn.close()
-
-    def get_negative_talks_by_profile_id(self, profile_id: int):
-        conn = self._create_db_connection()
-        if conn is None: return []
+            if conn: self._release_db_connection(conn)
+
+    def get_negative_talks_by_profile_id(self, profile_id: int, limit: int = None, cursor: str = None):
+        """프로필의 부정 감정 대화를 최신순으로 한 페이지 조회합니다. (행 목록, 다음 페이지 커서)를 반환합니다."""
+        limit = clamp_page_size(limit)
+        keyset_sql, keyset_params = keyset_condition(cursor, descending=True, created_at_column="tk.created_at", id_column="tk.id")
+        conn = self._get_db_connection()
+        if conn is None: return [], None
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
+            with conn.cursor() as db_cursor:
+                db_cursor.execute(f"""
                     SELECT tk.id, tk.content, tk.created_at, cr.topic
                     FROM talk AS tk
                     JOIN chatroom AS cr ON tk.chatroom_id = cr.id
-                    WHERE tk.profile_id = %s AND tk.sentiment = '부정'
-                    ORDER BY tk.created_at DESC
-                """, (profile_id,))
-                talks = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in talks]
+                    WHERE tk.profile_id = %s AND tk.sentiment = '부정' {keyset_sql}
+                    ORDER BY tk.created_at DESC, tk.id DESC
+                    LIMIT %s
+                """, (profile_id, *keyset_params, limit + 1))
+                talks = db_cursor.fetchall()
+                columns = [desc[0] for desc in db_cursor.description]
+                return split_page([dict(zip(columns, row)) for row in talks], limit)
         except Error as e:
             print(f"[DB 오류] 부정 감정 대화 조회 실패: {e}")
-            return []
+            return [], None
         finally:
-            if conn: conn.close()
+            if conn: self._release_db_connection(conn)
 
 
-    def get_today_analyses_by_profile_id(self, profile_id: int):
-        """오늘 날짜의 특정 프로필에 대한 모든 분석 기록을 조회합니다."""
-        conn = self._create_db_connection()
+    def _get_analyses_in_range(self, profile_id: int, range_start, range_end, label: str):
+        """[range_start, range_end) 구간의 분석 기록을 조회합니다. 달력 기준 조회는 모두 이 메서드를 거칩니다."""
+        conn = self._get_db_connection()
         if conn is None: return []
         try:
             with conn.cursor() as cursor:
-                # DATE(created_at) = CURRENT_DATE 를 사용하여 오늘 데이터만 필터링
-                cursor.execute("""
-                    SELECT keyword, is_positive
-                    FROM analysis
-                    WHERE profile_id = %s AND DATE(created_at) = CURRENT_DATE
-                """, (profile_id,))
+                cursor.execute(ANALYSES_IN_RANGE_SQL, (profile_id, range_start, range_end))
                 analyses = cursor.fetchall()
                 columns = [desc[0] for desc in cursor.description]
                 return [dict(zip(columns, row)) for row in analyses]
         except Error as e:
-            print(f"[DB 오류] 오늘의 분석 목록 조회 실패: {e}")
+            print(f"[DB 오류] {label} 분석 목록 조회 실패: {e}")
             return []
         finally:
-            if conn: conn.close()
+            if conn: self._release_db_connection(conn)
 
+    def get_today_analyses_by_profile_id(self, profile_id: int):
+        """오늘 날짜의 특정 프로필에 대한 모든 분석 기록을 조회합니다."""
+        return self._get_analyses_in_range(profile_id, *time_range.day_range(time_range.today()), "오늘의")
 
     def get_analyses_by_date(self, profile_id: int, target_date: date):
         """특정 날짜의 프로필에 대한 모든 분석 기록을 조회합니다."""
-        conn = self._create_db_connection()
+        return self._get_analyses_in_range(profile_id, *time_range.day_range(target_date), "특정일")
+
+    def get_analyses_by_date_range(self, profile_id: int, start_date: date, end_date: date):
+        """특정 기간 [start_date, end_date) 동안의 프로필에 대한 모든 분석 기록을 조회합니다."""
+        return self._get_analyses_in_range(profile_id, *time_range.date_span_range(start_date, end_date), "기간별")
+
+    def get_analyses_by_month(self, profile_id: int, year: int, month: int):
+        """특정 월의 프로필에 대한 모든 분석 기록을 조회합니다."""
+        return self._get_analyses_in_range(profile_id, *time_range.month_range(year, month), "월별")
+
+    def get_daily_rollups(self, profile_id: int, start_date: date, end_date: date):
+        """[start_date, end_date) 기간의 일간 감정 집계(daily_sentiment_rollup)를 날짜순으로 조회합니다.
+        집계의 day 는 DB_TIMEZONE 날짜이므로, APP_TIMEZONE 날짜로 조회하는 이 함수는 두 시간대가 같을 때만 정확합니다.
+        """
+        conn = self._get_db_connection()
         if conn is None: return []
         try:
             with conn.cursor() as cursor:
-                # DATE(created_at)이 target_date와 일치하는 데이터만 필터링
                 cursor.execute("""
-                    SELECT keyword, is_positive
-                    FROM analysis
-                    WHERE profile_id = %s AND DATE(created_at) = %s
-                """, (profile_id, target_date))
-                analyses = cursor.fetchall()
+                    SELECT day, positive, negative, keyword_counts
+                    FROM daily_sentiment_rollup
+                    WHERE profile_id = %s AND day >= %s AND day < %s
+                    ORDER BY day
+                """, (profile_id, start_date, end_date))
+                rollups = cursor.fetchall()
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in analyses]
+                return [dict(zip(columns, row)) for row in rollups]
         except Error as e:
-            print(f"[DB 오류] 특정일 분석 목록 조회 실패: {e}")
+            print(f"[DB 오류] 일간 감정 집계 조회 실패: {e}")
             return []
         finally:
-            if conn: conn.close()
-
+            if conn: self._release_db_connection(conn)
 
-    def get_analyses_by_date_range(self, profile_id: int, start_date, end_date):
-        """특정 기간 동안의 프로필에 대한 모든 분석 기록을 조회합니다."""
-        conn = self._create_db_connection()
+    def get_active_profile_ids(self, start_date: date, end_date: date):
+        """[start_date, end_date) 기간에 분석 기록이 있는 프로필 id 목록을 조회합니다."""
+        conn = self._get_db_connection()
         if conn is None: return []
         try:
             with conn.cursor() as cursor:
-                # created_at이 start_date와 end_date 사이에 있는 데이터만 조회
                 cursor.execute("""
-                    SELECT keyword, is_positive, created_at
-                    FROM analysis
-                    WHERE profile_id = %s AND created_at >= %s AND created_at < %s
+                    SELECT DISTINCT profile_id
+                    FROM daily_sentiment_rollup
+                    WHERE day >= %s AND day < %s AND positive + negative > 0
+                    ORDER BY profile_id
+                """, (start_date, end_date))
+                return [row[0] for row in cursor.fetchall()]
+        except Error as e:
+            print(f"[DB 오류] 활성 프로필 조회 실패: {e}")
+            return []
+        finally:
+            if conn: self._release_db_connection(conn)
+
+    def get_daily_sentiment_counts(self, profile_id: int, start_date: date, end_date: date, keywords_only: bool = False):
+        """[start_date, end_date) 기간의 날짜별 긍정/부정 횟수를 조회합니다.
+        keywords_only=True 이면 핵심 단어가 추출된 분석만 셉니다.
+        """
+        if keywords_only:
+            counts_sql = """
+                (SELECT COALESCE(SUM(value::int), 0) FROM jsonb_each_text(keyword_counts -> 'positive')) AS positive,
+                (SELECT COALESCE(SUM(value::int), 0) FROM jsonb_each_text(keyword_counts -> 'negative')) AS negative
+            """
+        else:
+            counts_sql = "positive, negative"
+        conn = self._get_db_connection()
+        if conn is None: return []
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT day, {counts_sql}
+                    FROM daily_sentiment_rollup
+                    WHERE profile_id = %s AND day >= %s AND day < %s
+                    ORDER BY day
                 """, (profile_id, start_date, end_date))
-                analyses = cursor.fetchall()
+                rows = cursor.fetchall()
                 columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in analyses]
+                return [dict(zip(columns, row)) for row in rows]
         except Error as e:
-            print(f"[DB 오류] 기간별 분석 목록 조회 실패: {e}")
+            print(f"[DB 오류] 날짜별 감정 횟수 조회 실패: {e}")
             return []
         finally:
-            if conn: conn.close()
+            if conn: self._release_db_connection(conn)
 
-
-    def check_chatroom_created_today(self, profile_id: int) -> bool:
-        """오늘 날짜에 특정 프로필로 생성된 채팅방이 있는지 확인합니다."""
-        conn = self._create_db_connection()
-        if conn is None: return False
+    def get_top_keywords(self, profile_id: int, start_date: date, end_date: date, limit: int = 5):
+        """[start_date, end_date) 기간의 긍정/부정별 상위 키워드와 횟수를 조회합니다."""
+        top_keywords = {'positive': [], 'negative': []}
+        conn = self._get_db_connection()
+        if conn is None: return top_keywords
         try:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM chatroom 
-                    WHERE profile_id = %s AND DATE(created_at) = CURRENT_DATE
-                """, (profile_id,))
-                
-                return cursor.fetchone()[0] > 0
+                    SELECT bucket, keyword, count
+                    FROM (
+                        SELECT b.bucket, kw.key AS keyword, SUM(kw.value::int) AS count,
+                               ROW_NUMBER() OVER (PARTITION BY b.bucket ORDER BY SUM(kw.value::int) DESC, kw.key) AS rank
+                        FROM daily_sentiment_rollup AS r
+                        CROSS JOIN (VALUES ('positive'), ('negative')) AS b(bucket)
+                        CROSS JOIN LATERAL jsonb_each_text(r.keyword_counts -> b.bucket) AS kw
+                        WHERE r.profile_id = %s AND r.day >= %s AND r.day < %s
+                        GROUP BY b.bucket, kw.key
+                    ) AS ranked
+                    WHERE rank <= %s
+                    ORDER BY bucket, rank
+                """, (profile_id, start_date, end_date, limit))
+                for bucket, keyword, count in cursor.fetchall():
+                    top_keywords[bucket].append({"keyword": keyword, "count": count})
+                return top_keywords
         except Error as e:
-            print(f"[DB 오류] 오늘 생성된 채팅방 확인 실패: {e}")
-            return False
+            print(f"[DB 오류] 상위 키워드 조회 실패: {e}")
+            return top_keywords
         finally:
-            if conn: conn.close()
+            if conn: self._release_db_connection(conn)
 
-              
-    def get_analyses_by_month(self, profile_id: int, year: int, month: int):
-        """특정 월의 프로필에 대한 모든 분석 기록을 조회합니다."""
-        conn = self._create_db_connection()
-        if conn is None: return []
+    def get_time_of_day_sentiment_counts(self, profile_id: int, start_date: date, end_date: date):
+        """[start_date, end_date) 기간의 시간대(오전/오후/저녁)별 긍정/부정 횟수를 조회합니다."""
+        time_summary = {"오전": {"긍정": 0, "부정": 0}, "오후": {"긍정": 0, "부정": 0}, "저녁": {"긍정": 0, "부정": 0}}
+        conn = self._get_db_connection()
+        if conn is None: return time_summary
         try:
             with conn.cursor() as cursor:
-                # EXTRACT를 사용하여 년(YEAR)과 월(MONTH)을 기준으로 데이터 필터링
                 cursor.execute("""
-                    SELECT is_positive, created_at
+                    SELECT
+                        CASE
+                            WHEN EXTRACT(HOUR FROM created_at) >= 6 AND EXTRACT(HOUR FROM created_at) < 12 THEN '오전'
+                            WHEN EXTRACT(HOUR FROM created_at) >= 12 AND EXTRACT(HOUR FROM created_at) < 18 THEN '오후'
+                            ELSE '저녁'
+                        END AS time_period,
+                        COUNT(*) FILTER (WHERE is_positive) AS positive,
+                        COUNT(*) FILTER (WHERE NOT is_positive) AS negative
                     FROM analysis
-                    WHERE profile_id = %s 
-                    AND EXTRACT(YEAR FROM created_at) = %s 
-                    AND EXTRACT(MONTH FROM created_at) = %s
-                """, (profile_id, year, month))
-                analyses = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in analyses]
+                    WHERE profile_id = %s AND created_at >= %s AND created_at < %s
+                    GROUP BY time_period
+                """, (profile_id, *time_range.date_span_range(start_date, end_date)))
+                for time_period, positive, negative in cursor.fetchall():
+                    time_summary[time_period] = {"긍정": positive, "부정": negative}
+                return time_summary
         except Error as e:
-            print(f"[DB 오류] 월별 분석 목록 조회 실패: {e}")
-            return []
+            print(f"[DB 오류] 시간대별 감정 횟수 조회 실패: {e}")
+            return time_summary
+        finally:
+            if conn: self._release_db_connection(conn)
 
+    def check_chatroom_created_today(self, profile_id: int) -> bool:
+        """오늘 날짜에 특정 프로필로 생성된 채팅방이 있는지 확인합니다."""
+        conn = self._get_db_connection()
+        if conn is None: return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(CHATROOM_EXISTS_IN_RANGE_SQL, (profile_id, *time_range.day_range(time_range.today())))
+                return cursor.fetchone()[0]
+        except Error as e:
+            print(f"[DB 오류] 오늘 생성된 채팅방 확인 실패: {e}")
+            return False
+        finally:
+            if conn: self._release_db_connection(conn)
 
     def get_profile_name(self, profile_id: int):
-        """PostgreSQL의 profile 테이블에서 profile_last_name을 조회합니다."""
-        conn = self._create_db_connection()
+        """PostgreSQL의 profile 테이블에서 profile_first_name을 조회합니다. 조회한 이름은 PROFILE_CACHE_TTL 초 동안 캐시됩니다."""
+        cached_name = self.profile_cache.get(profile_id)
+        if cached_name is not None:
+            return cached_name
+        conn = self._get_db_connection()
         if conn is None: return None
         try:
             with conn.cursor() as cursor:
@@ -531,6 +827,7 @@ class DatabaseManager:
                 profile = cursor.fetchone()
                 # fetchone()은 튜플을 반환하므로, 첫 번째 요소를 가져옵니다.
                 if profile:
+                    self.profile_cache.set(profile_id, profile[0])
                     return profile[0]
                 return None
         except Error as e:
@@ -538,4 +835,58 @@ class DatabaseManager:
             return None
 
         finally:
-            if conn: conn.close()
\ No newline at end of file
+            if conn: self._release_db_connection(conn)
+
+    def invalidate_profile(self, profile_id: int):
+        """프로필 정보가 바뀌었을 때 캐시된 이름을 지웁니다."""
+        self.profile_cache.invalidate(profile_id)
+
+    # --- 비동기 조회 메서드 (async 엔드포인트/서비스에서 사용) ---
+    async def aget_analyses_by_profile_id(self, profile_id: int, limit: int = None, cursor: str = None):
+        return await self._run_sync(self.get_analyses_by_profile_id, profile_id, limit, cursor)
+
+    async def aget_chatrooms_by_profile_id(self, profile_id: int, limit: int = None, cursor: str = None):
+        return await self._run_sync(self.get_chatrooms_by_profile_id, profile_id, limit, cursor)
+
+    async def aget_talks_by_chatroom_id(self, chatroom_id: int, limit: int = None, cursor: str = None):
+        return await self._run_sync(self.get_talks_by_chatroom_id, chatroom_id, limit, cursor)
+
+    async def aupdate_talk_feedback(self, talk_id: int, like_status: bool):
+        return await self._run_sync(self.update_talk_feedback, talk_id, like_status)
+
+    async def aget_negative_talks_by_profile_id(self, profile_id: int, limit: int = None, cursor: str = None):
+        return await self._run_sync(self.get_negative_talks_by_profile_id, profile_id, limit, cursor)
+
+    async def aget_today_analyses_by_profile_id(self, profile_id: int):
+        return await self._run_sync(self.get_today_analyses_by_profile_id, profile_id)
+
+    async def aget_analyses_by_date(self, profile_id: int, target_date: date):
+        return await self._run_sync(self.get_analyses_by_date, profile_id, target_date)
+
+    async def aget_analyses_by_date_range(self, profile_id: int, start_date, end_date):
+        return await self._run_sync(self.get_analyses_by_date_range, profile_id, start_date, end_date)
+
+    async def acheck_chatroom_created_today(self, profile_id: int) -> bool:
+        return await self._run_sync(self.check_chatroom_created_today, profile_id)
+
+    async def aget_analyses_by_month(self, profile_id: int, year: int, month: int):
+        return await self._run_sync(self.get_analyses_by_month, profile_id, year, month)
+
+    async def aget_profile_name(self, profile_id: int):
+        # 캐시에 있으면 스레드 풀을 거치지 않고 바로 반환합니다.
+        cached_name = self.profile_cache.get(profile_id)
+        if cached_name is not None:
+            return cached_name
+        return await self._run_sync(self.get_profile_name, profile_id)
+
+    async def aget_daily_rollups(self, profile_id: int, start_date: date, end_date: date):
+        return await self._run_sync(self.get_daily_rollups, profile_id, start_date, end_date)
+
+    async def aget_daily_sentiment_counts(self, profile_id: int, start_date: date, end_date: date, keywords_only: bool = False):
+        return await self._run_sync(self.get_daily_sentiment_counts, profile_id, start_date, end_date, keywords_only)
+
+    async def aget_top_keywords(self, profile_id: int, start_date: date, end_date: date, limit: int = 5):
+        return await self._run_sync(self.get_top_keywords, profile_id, start_date, end_date, limit)
+
+    async def aget_time_of_day_sentiment_counts(self, profile_id: int, start_date: date, end_date: date):
+        return await self._run_sync(self.get_time_of_day_sentiment_counts, profile_id, start_date, end_date)
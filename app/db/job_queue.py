@@ -0,0 +1,173 @@
+from psycopg2 import Error
+from psycopg2.extras import Json
+
+
+class JobQueue:
+    """Postgres jobs 테이블 기반의 작업 큐입니다.
+
+    API 프로세스는 enqueue() 로 작업을 넣기만 하고, 별도 워커(app/jobs/worker.py)가 claim() 으로
+    FOR UPDATE SKIP LOCKED 선점해서 처리합니다. 여러 워커가 동시에 가져가도 같은 작업을 두 번 받지 않고,
+    선점 시간(lease_seconds) 안에 끝내지 못한 작업(워커가 죽은 경우)은 다른 워커가 다시 가져갑니다.
+    실패한 작업은 점점 길게 기다렸다가 다시 시도하고, max_attempts 번 실패하면 dead 로 남깁니다.
+    """
+
+    def __init__(self, db_manager, lease_seconds: int, max_attempts: int, retry_base_seconds: float, retry_max_seconds: float):
+        self.db_manager = db_manager
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+    def _insert(self, kind: str, payload: dict):
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return None
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO jobs (kind, payload, max_attempts) VALUES (%s, %s, %s) RETURNING id",
+                    (kind, Json(payload), self.max_attempts)
+                )
+                job_id = cursor.fetchone()[0]
+            conn.commit()
+            return job_id
+        except Error as e:
+            print(f"[DB 오류] 작업 등록 실패 ({kind}): {e}"); conn.rollback(); return None
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    async def enqueue(self, kind: str, payload: dict):
+        """작업을 등록하고 id 를 반환합니다. 등록하지 못하면 None."""
+        return await self.db_manager._run_sync(self._insert, kind, payload)
+
+    def claim(self, limit: int, kinds: list) -> list:
+        """처리할 작업을 최대 limit 개 선점합니다. 선점이 만료된 처리 중 작업도 다시 가져옵니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return []
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE jobs
+                    SET status = 'running', attempts = attempts + 1,
+                        locked_until = CURRENT_TIMESTAMP + %s * INTERVAL '1 second', updated_at = CURRENT_TIMESTAMP
+                    WHERE id IN (
+                        SELECT id FROM jobs
+                        WHERE kind = ANY(%s)
+                          AND ((status = 'queued' AND run_after <= CURRENT_TIMESTAMP)
+                               OR (status = 'running' AND locked_until < CURRENT_TIMESTAMP))
+                        ORDER BY run_after, id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, kind, payload, attempts, max_attempts
+                    """,
+                    (self.lease_seconds, list(kinds), limit)
+                )
+                columns = [desc[0] for desc in cursor.description]
+                jobs = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            conn.commit()
+            return jobs
+        except Error as e:
+            print(f"[DB 오류] 작업 선점 실패: {e}"); conn.rollback(); return []
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def complete(self, job_id: int):
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
+            conn.commit()
+        except Error as e:
+            print(f"[DB 오류] 작업 완료 처리 실패 ({job_id}): {e}"); conn.rollback()
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def fail(self, job_id: int, error: str):
+        """다시 시도할 수 있으면 backoff 뒤로 미루고, 시도 횟수를 다 썼으면 dead 로 남깁니다. 바뀐 status 를 반환합니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return None
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE jobs
+                    SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+                        run_after = CURRENT_TIMESTAMP + LEAST(%s * power(2, attempts - 1), %s) * INTERVAL '1 second',
+                        locked_until = NULL, last_error = %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                    RETURNING status
+                    """,
+                    (self.retry_base_seconds, self.retry_max_seconds, error[:1000], job_id)
+                )
+                row = cursor.fetchone()
+            conn.commit()
+            return row[0] if row else None
+        except Error as e:
+            print(f"[DB 오류] 작업 실패 기록 실패 ({job_id}): {e}"); conn.rollback(); return None
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def release(self, job_ids: list):
+        """종료할 때 끝내지 못한 작업을 시도 횟수를 되돌려 다른 워커가 바로 가져가게 합니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE jobs SET status = 'queued', attempts = GREATEST(attempts - 1, 0), locked_until = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ANY(%s) AND status = 'running'
+                    """,
+                    (job_ids,)
+                )
+            conn.commit()
+        except Error as e:
+            print(f"[DB 오류] 작업 선점 해제 실패: {e}"); conn.rollback()
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def requeue_dead(self, kind: str = None) -> int:
+        """dead 작업을 시도 횟수를 초기화해서 다시 대기열에 넣습니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return 0
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE jobs SET status = 'queued', attempts = 0, run_after = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE status = 'dead' AND (%s::text IS NULL OR kind = %s)
+                    """,
+                    (kind, kind)
+                )
+                count = cursor.rowcount
+            conn.commit()
+            return count
+        except Error as e:
+            print(f"[DB 오류] dead 작업 재등록 실패: {e}"); conn.rollback(); return 0
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def stats(self) -> dict:
+        """작업 종류·상태별 개수와 가장 오래 기다린 대기 작업의 대기 시간(초)."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return {}
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT kind, status, COUNT(*),
+                           COALESCE(EXTRACT(EPOCH FROM CURRENT_TIMESTAMP - MIN(created_at)), 0)
+                    FROM jobs GROUP BY kind, status
+                """)
+                result = {}
+                for kind, status, count, oldest_seconds in cursor.fetchall():
+                    result.setdefault(kind, {})[status] = count
+                    if status == 'queued':
+                        result[kind]["oldest_queued_seconds"] = round(float(oldest_seconds), 1)
+            conn.rollback()
+            return result
+        except Error as e:
+            print(f"[DB 오류] 작업 현황 조회 실패: {e}"); conn.rollback(); return {}
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
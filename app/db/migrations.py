@@ -0,0 +1,407 @@
+"""버전별 스키마 마이그레이션.
+
+새 스키마 변경은 MIGRATIONS 끝에 다음 버전 번호로 추가합니다. 이미 배포된 마이그레이션은 수정하지 않습니다.
+- transactional=True(기본): 모든 문장을 하나의 트랜잭션에서 실행합니다. 긴 락 대기를 막기 위해 lock_timeout 을 겁니다.
+- transactional=False: `CREATE INDEX CONCURRENTLY` 처럼 트랜잭션 밖에서만 실행되는 문장용입니다.
+  서비스 중에도 쓰기를 막지 않고 인덱스를 만들 수 있으며, 중간에 실패해 남은 INVALID 인덱스는 다음 실행 때 지우고 다시 만듭니다.
+
+배포 단계에서 직접 실행합니다. 서버·워커·CLI 는 시작할 때 적용되지 않은 버전이 있는지만 확인하고,
+있으면 시작하지 않습니다. (큰 테이블의 인덱스 생성이나 백필을 앱 프로세스 안에서 돌리지 않기 위함)
+
+실행: python -m app.db.migrations [--status]
+"""
+import re
+import sys
+import psycopg2
+
+MIGRATION_LOCK_KEY = 7_342_001  # 여러 워커가 동시에 마이그레이션하지 않도록 잡는 advisory lock 키
+LOCK_TIMEOUT = '5s'
+
+MIGRATIONS = [
+    {
+        "version": 1,
+        "name": "initial_schema",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS chatroom (
+                id BIGSERIAL PRIMARY KEY,
+                profile_id BIGINT NOT NULL,
+                topic TEXT,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );""",
+            """
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'sentiment_type') THEN
+                    CREATE TYPE sentiment_type AS ENUM ('긍정', '부정', '일반');
+                END IF;
+            END$$;""",
+            """
+            CREATE TABLE IF NOT EXISTS talk (
+                id BIGSERIAL PRIMARY KEY,
+                chatroom_id BIGINT NOT NULL REFERENCES chatroom(id) ON DELETE CASCADE,
+                profile_id BIGINT NOT NULL,
+                category VARCHAR(50) NOT NULL,
+                content TEXT NOT NULL,
+                session_id VARCHAR(255),
+                role VARCHAR(255),
+                created_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                "like" BOOLEAN,
+                sentiment sentiment_type DEFAULT '일반',
+                keywords TEXT[]
+            );""",
+            """
+            CREATE TABLE IF NOT EXISTS analysis (
+                id BIGSERIAL PRIMARY KEY,
+                talk_id BIGINT NOT NULL UNIQUE REFERENCES talk(id),
+                profile_id BIGINT NOT NULL,
+                summary TEXT NOT NULL,
+                keyword TEXT, -- 키워드 저장을 위한 컬럼 추가
+                is_positive BOOLEAN NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );""",
+            """
+            CREATE OR REPLACE FUNCTION update_updated_at_column() RETURNS TRIGGER AS $$
+            BEGIN NEW.updated_at = NOW(); RETURN NEW; END;
+            $$ language 'plpgsql';""",
+            """
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_talk_updated_at') THEN
+                    CREATE TRIGGER update_talk_updated_at
+                    BEFORE UPDATE ON talk
+                    FOR EACH ROW
+                    EXECUTE FUNCTION update_updated_at_column();
+                END IF;
+            END$$;""",
+            """
+            CREATE TABLE IF NOT EXISTS weekly_reports (
+                id BIGSERIAL PRIMARY KEY,
+                profile_id BIGINT NOT NULL,
+                start_date DATE NOT NULL,
+                end_date DATE NOT NULL,
+                report_content TEXT NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (profile_id, start_date) -- 한 프로필에 대해 해당 주차의 리포트는 하나만 존재
+            );""",
+        ],
+    },
+    {
+        # 자주 쓰는 조회(채팅방별 대화, 프로필별 부정 대화/분석/채팅방 목록)용 복합 인덱스.
+        # 정렬 기준인 created_at 과 동률 처리를 위한 id 까지 포함합니다.
+        "version": 2,
+        "name": "hot_query_indexes",
+        "transactional": False,
+        "statements": [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_talk_chatroom_created ON talk (chatroom_id, created_at, id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_talk_profile_sentiment_created ON talk (profile_id, sentiment, created_at, id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_analysis_profile_created ON analysis (profile_id, created_at, id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chatroom_profile_created ON chatroom (profile_id, created_at, id)",
+        ],
+    },
+    {
+        # 프로필별 일간 긍정/부정 집계. analysis 에 행이 추가될 때마다 같은 트랜잭션에서 증분 갱신됩니다.
+        # day 는 created_at 의 날짜(DB_TIMEZONE 기준, 조회는 APP_TIMEZONE 날짜로 하므로 두 시간대가 같아야 함)이고, keyword_counts 는 {"positive": {키워드: 횟수}, "negative": {...}} 형태입니다.
+        # 기존 analysis 데이터로 채우는 동안 새 분석이 끼어들지 않도록 analysis 테이블에 SHARE 락을 겁니다.
+        "version": 3,
+        "name": "daily_sentiment_rollup",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS daily_sentiment_rollup (
+                profile_id BIGINT NOT NULL,
+                day DATE NOT NULL,
+                positive INTEGER NOT NULL DEFAULT 0,
+                negative INTEGER NOT NULL DEFAULT 0,
+                keyword_counts JSONB NOT NULL DEFAULT '{"positive": {}, "negative": {}}'::jsonb,
+                PRIMARY KEY (profile_id, day)
+            );""",
+            "LOCK TABLE analysis IN SHARE MODE",
+            """
+            INSERT INTO daily_sentiment_rollup (profile_id, day, positive, negative, keyword_counts)
+            SELECT
+                totals.profile_id,
+                totals.day,
+                totals.positive,
+                totals.negative,
+                jsonb_build_object(
+                    'positive', COALESCE(keywords.positive, '{}'::jsonb),
+                    'negative', COALESCE(keywords.negative, '{}'::jsonb)
+                )
+            FROM (
+                SELECT profile_id, created_at::date AS day,
+                       COUNT(*) FILTER (WHERE is_positive) AS positive,
+                       COUNT(*) FILTER (WHERE NOT is_positive) AS negative
+                FROM analysis
+                GROUP BY profile_id, created_at::date
+            ) AS totals
+            LEFT JOIN (
+                SELECT profile_id, day,
+                       jsonb_object_agg(keyword, cnt) FILTER (WHERE is_positive) AS positive,
+                       jsonb_object_agg(keyword, cnt) FILTER (WHERE NOT is_positive) AS negative
+                FROM (
+                    SELECT profile_id, created_at::date AS day, is_positive, keyword, COUNT(*) AS cnt
+                    FROM analysis
+                    WHERE NULLIF(keyword, '') IS NOT NULL
+                    GROUP BY profile_id, created_at::date, is_positive, keyword
+                ) AS keyword_totals
+                GROUP BY profile_id, day
+            ) AS keywords USING (profile_id, day)
+            ON CONFLICT (profile_id, day) DO NOTHING;""",
+        ],
+    },
+    {
+        # 주간 리포트 일괄 생성 작업의 프로필별 진행 상황. 중단된 작업은 done/skipped 가 아닌 프로필부터 이어서 실행합니다.
+        # status: running(생성 중), done(저장 완료), skipped(지난주 분석 기록 없음), failed(생성 실패)
+        "version": 4,
+        "name": "weekly_report_runs",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS weekly_report_runs (
+                profile_id BIGINT NOT NULL,
+                start_date DATE NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (profile_id, start_date)
+            );""",
+        ],
+    },
+    {
+        # 퀴즈 LLM 채점 결과 캐시. 여러 워커가 함께 씁니다.
+        # question_key 는 질문+정답 문자열의 해시, version 은 채점 프롬프트 해시라서 둘 중 하나가 바뀌면 자연히 새 키가 됩니다.
+        "version": 5,
+        "name": "grading_cache",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS grading_cache (
+                quiz_type VARCHAR(20) NOT NULL,
+                question_key VARCHAR(64) NOT NULL,
+                answer_key TEXT NOT NULL,
+                version VARCHAR(64) NOT NULL,
+                is_correct BOOLEAN NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (quiz_type, question_key, answer_key, version)
+            );""",
+        ],
+    },
+    {
+        # 닫는 중인 채팅방의 요약 작업. 요약이 chatroom.topic 에 기록되면 행을 지웁니다.
+        # summary 는 닫을 때까지 미리 갱신해 둔 요약, messages 는 아직 요약에 합치지 못한 메시지(JSON)이고,
+        # claimed_until 이 지난 행은 작업하던 프로세스가 죽은 것으로 보고 다른 프로세스(또는 재시작 후)가 이어받습니다.
+        "version": 6,
+        "name": "chatroom_close_jobs",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS chatroom_close_jobs (
+                chatroom_id BIGINT PRIMARY KEY REFERENCES chatroom(id) ON DELETE CASCADE,
+                label VARCHAR(20),
+                summary TEXT NOT NULL DEFAULT '',
+                messages JSONB NOT NULL DEFAULT '[]'::jsonb,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                last_error TEXT,
+                claimed_until TIMESTAMP NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );""",
+            "CREATE INDEX IF NOT EXISTS idx_chatroom_close_jobs_claimed_until ON chatroom_close_jobs (claimed_until);",
+        ],
+    },
+    {
+        # 응답 뒤에 처리하는 작업(대화 저장·분석 등)의 큐. app/jobs/worker.py 가 FOR UPDATE SKIP LOCKED 로 나눠 가져갑니다.
+        # status: queued(대기), running(처리 중, locked_until 까지 선점), dead(max_attempts 번 실패, 수동 확인용)
+        # 처리가 끝난 작업은 행을 지웁니다.
+        "version": 7,
+        "name": "jobs",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id BIGSERIAL PRIMARY KEY,
+                kind VARCHAR(40) NOT NULL,
+                payload JSONB NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                run_after TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                locked_until TIMESTAMP,
+                last_error TEXT,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );""",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (run_after, id) WHERE status = 'queued';",
+            "CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (locked_until) WHERE status = 'running';",
+        ],
+    },
+    {
+        # 과거 발화 재분석(app/jobs/sentiment_backfill.py)의 진행 상황. 배치를 기록하는 트랜잭션에서 last_talk_id 를 함께 올리므로,
+        # 중단된 실행은 같은 name 으로 다시 실행하면 last_talk_id 다음 발화부터 이어서 처리합니다.
+        "version": 8,
+        "name": "backfill_runs",
+        "statements": [
+            """
+            CREATE TABLE IF NOT EXISTS backfill_runs (
+                name VARCHAR(100) PRIMARY KEY,
+                last_talk_id BIGINT NOT NULL DEFAULT 0,
+                max_talk_id BIGINT NOT NULL,
+                processed BIGINT NOT NULL DEFAULT 0,
+                changed BIGINT NOT NULL DEFAULT 0,
+                failed BIGINT NOT NULL DEFAULT 0,
+                started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP
+            );""",
+        ],
+    },
+    {
+        # 작업 큐의 save_conversation 은 최소 한 번 처리라서 같은 작업이 다시 배달될 수 있습니다.
+        # 그 작업 id 를 talk 행에 남겨 두고 (job_id, role) 로 중복 저장을 막습니다. (큐를 거치지 않은 저장은 NULL)
+        "version": 9,
+        "name": "talk_job_id",
+        "statements": [
+            "ALTER TABLE talk ADD COLUMN IF NOT EXISTS job_id BIGINT;",
+        ],
+    },
+    {
+        # 9 의 중복 방지용 유니크 인덱스. talk 는 크므로 쓰기를 막지 않도록 CONCURRENTLY 로 만듭니다.
+        "version": 10,
+        "name": "talk_job_id_index",
+        "transactional": False,
+        "statements": [
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_talk_job_role ON talk (job_id, role) WHERE job_id IS NOT NULL",
+        ],
+    },
+    {
+        # 3 의 초기 집계가 빈 문자열 keyword 까지 세어 넣은 "" 항목을 지웁니다. (실시간 증분 갱신은 빈 keyword 를 세지 않음)
+        "version": 11,
+        "name": "rollup_drop_empty_keyword",
+        "statements": [
+            """
+            UPDATE daily_sentiment_rollup
+            SET keyword_counts = jsonb_build_object(
+                'positive', COALESCE(keyword_counts -> 'positive', '{}'::jsonb) - '',
+                'negative', COALESCE(keyword_counts -> 'negative', '{}'::jsonb) - ''
+            )
+            WHERE keyword_counts -> 'positive' ? '' OR keyword_counts -> 'negative' ? '';""",
+        ],
+    },
+]
+
+_CONCURRENT_INDEX_PATTERN = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE)
+
+
+def _ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );""")
+
+
+def _applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _drop_invalid_index(cursor, index_name: str):
+    """이전 CONCURRENTLY 생성이 실패해 남은 INVALID 인덱스를 지웁니다."""
+    cursor.execute("""
+        SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid
+        WHERE c.relname = %s AND NOT i.indisvalid
+    """, (index_name,))
+    if cursor.fetchone():
+        print(f"[DB 정보] INVALID 인덱스 {index_name} 를 지우고 다시 만듭니다.")
+        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+
+def _apply(conn, migration: dict):
+    version, name = migration["version"], migration["name"]
+    if migration.get("transactional", True):
+        conn.autocommit = False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+                for statement in migration["statements"]:
+                    cursor.execute(statement)
+                cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+        except psycopg2.Error:
+            conn.rollback()
+            raise
+    else:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            for statement in migration["statements"]:
+                index_match = _CONCURRENT_INDEX_PATTERN.search(statement)
+                if index_match:
+                    _drop_invalid_index(cursor, index_match.group(1))
+                cursor.execute(statement)
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+    print(f"[DB 정보] 마이그레이션 {version:03d}_{name} 적용 완료")
+
+
+def run_migrations(conn, wait_for_lock: bool = True) -> list:
+    """아직 적용되지 않은 마이그레이션을 버전 순서대로 적용하고, 적용한 버전 목록을 반환합니다.
+
+    wait_for_lock=False 이면 다른 프로세스가 이미 마이그레이션 중일 때 기다리지 않고 바로 돌아갑니다.
+    """
+    previous_autocommit = conn.autocommit
+    conn.autocommit = True
+    applied_now = []
+    try:
+        with conn.cursor() as cursor:
+            if wait_for_lock:
+                cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+            else:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+                if not cursor.fetchone()[0]:
+                    print("[DB 정보] 다른 프로세스가 마이그레이션 중이라 건너뜁니다.")
+                    return applied_now
+        try:
+            with conn.cursor() as cursor:
+                _ensure_migrations_table(cursor)
+                applied = _applied_versions(cursor)
+            for migration in sorted(MIGRATIONS, key=lambda m: m["version"]):
+                if migration["version"] in applied:
+                    continue
+                _apply(conn, migration)
+                applied_now.append(migration["version"])
+        finally:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+    finally:
+        conn.autocommit = previous_autocommit
+    return applied_now
+
+
+def pending_versions(conn) -> list:
+    """적용되지 않은 마이그레이션 버전 목록. 테이블을 만들거나 락을 잡지 않고 조회만 합니다."""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+        applied = _applied_versions(cursor) if cursor.fetchone()[0] else set()
+    conn.rollback()
+    return [m["version"] for m in sorted(MIGRATIONS, key=lambda m: m["version"]) if m["version"] not in applied]
+
+
+def migration_status(conn) -> list:
+    with conn.cursor() as cursor:
+        _ensure_migrations_table(cursor)
+        applied = _applied_versions(cursor)
+    conn.commit()
+    return [(m["version"], m["name"], m["version"] in applied) for m in MIGRATIONS]
+
+
+if __name__ == "__main__":
+    from app.core.config import DB_CONFIG
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        if "--status" in sys.argv[1:]:
+            for version, name, is_applied in migration_status(conn):
+                print(f"{version:03d}_{name}: {'적용됨' if is_applied else '대기 중'}")
+        else:
+            applied = run_migrations(conn)
+            print(f"적용된 마이그레이션: {applied or '없음'}")
+    finally:
+        conn.close()
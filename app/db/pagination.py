@@ -0,0 +1,51 @@
+"""(created_at, id) 기준 키셋 페이지네이션 도구.
+
+다음 페이지 커서는 마지막 행의 (created_at, id)를 base64 로 감싼 문자열이며,
+다음 요청에서 `(created_at, id) < (커서)` (오름차순이면 `>`) 조건으로 이어서 조회합니다.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from app.core.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+
+
+class InvalidCursorError(ValueError):
+    """커서 문자열을 해석할 수 없을 때 발생합니다."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps({"t": created_at.isoformat(), "i": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(data["t"]), int(data["i"])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"잘못된 페이지 커서입니다: {cursor}") from e
+
+
+def clamp_page_size(limit: int = None) -> int:
+    if not limit:
+        return PAGE_SIZE_DEFAULT
+    return max(1, min(limit, PAGE_SIZE_MAX))
+
+
+def keyset_condition(cursor: str, descending: bool, created_at_column: str = "created_at", id_column: str = "id") -> tuple:
+    """커서가 있으면 WHERE 절에 붙일 `AND (...) < (%s, %s)` 조건과 파라미터를 반환합니다."""
+    if not cursor:
+        return "", ()
+    operator = "<" if descending else ">"
+    return f"AND ({created_at_column}, {id_column}) {operator} (%s, %s)", decode_cursor(cursor)
+
+
+def split_page(rows: list, limit: int, created_at_key: str = "created_at", id_key: str = "id") -> tuple:
+    """limit + 1 개까지 조회한 행을 (이번 페이지, 다음 커서)로 나눕니다. 다음 페이지가 없으면 커서는 None 입니다."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last[created_at_key], last[id_key])
@@ -0,0 +1,162 @@
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class PoolTimeoutError(PoolError):
+    """정해진 시간 안에 빌려줄 커넥션을 찾지 못했을 때 발생합니다."""
+
+
+class ConnectionPool:
+    """psycopg2 커넥션을 재사용하는 스레드 안전 커넥션 풀입니다.
+
+    - 시작 시 min_size 개의 커넥션을 미리 열어두고, 필요하면 max_size 개까지 늘립니다.
+    - 모든 커넥션이 사용 중이면 timeout 초 동안 반납을 기다린 뒤 PoolTimeoutError 를 발생시킵니다.
+    - health_check_interval 초 이상 쉬었던 커넥션은 빌려주기 전에 `SELECT 1` 로 상태를 확인하고,
+      max_lifetime 초가 지난 커넥션은 닫고 새로 엽니다.
+    """
+
+    def __init__(self, min_size: int, max_size: int, timeout: float,
+                 health_check_interval: float, max_lifetime: float, **conn_kwargs):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"잘못된 커넥션 풀 크기입니다. (min={min_size}, max={max_size})")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+        self._conn_kwargs = conn_kwargs
+        self._cond = threading.Condition()
+        self._idle = []          # (conn, 반납 시각) - 가장 최근에 반납된 커넥션부터 재사용
+        self._created_at = {}    # id(conn) -> 생성 시각
+        self._size = 0           # 열려 있는(사용 중 + 유휴) 커넥션 수
+        self._closed = False
+        self._timeouts = 0
+        self._prefill()
+
+    def _prefill(self):
+        for _ in range(self.min_size):
+            with self._cond:
+                self._size += 1
+            try:
+                conn = self._connect()
+            except psycopg2.Error as e:
+                self._release_slot()
+                print(f"[DB 오류] 커넥션 풀 초기화 중 연결 실패: {e}")
+                return
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+
+    def _connect(self):
+        conn = psycopg2.connect(**self._conn_kwargs)
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _discard(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except psycopg2.Error:
+            pass
+        self._created_at.pop(id(conn), None)
+        self._release_slot()
+
+    def _is_usable(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        now = time.monotonic()
+        if now - self._created_at.get(id(conn), now) > self.max_lifetime:
+            return False
+        if now - idle_since < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self, timeout: float = None):
+        """커넥션을 빌려줍니다. 사용 후에는 반드시 putconn()으로 반납해야 합니다."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolError("커넥션 풀이 이미 닫혔습니다.")
+                    if self._idle:
+                        conn, idle_since = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        conn, idle_since = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(f"{timeout}초 안에 사용할 수 있는 DB 커넥션이 없습니다.")
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+            if self._is_usable(conn, idle_since):
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn, close: bool = False):
+        """빌려간 커넥션을 반납합니다. 진행 중인 트랜잭션은 롤백됩니다."""
+        if not close and not conn.closed:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                close = True
+            elif status != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    close = True
+        if close or conn.closed or self._closed:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkout_timeouts": self._timeouts,
+            }
@@ -0,0 +1,72 @@
+"""달력 기준 조회가 순차 스캔(Seq Scan) 없이 인덱스 범위 스캔으로 실행되는지 점검합니다.
+
+데이터가 적은 개발 DB에서는 플래너가 일부러 순차 스캔을 고를 수 있으므로,
+트랜잭션 안에서 enable_seqscan 을 끈 뒤 EXPLAIN 결과에 Seq Scan 이 남아 있는지 확인합니다.
+(인덱스로 풀 수 없는 조건이면 enable_seqscan 을 꺼도 Seq Scan 이 선택됩니다)
+
+실행: python -m app.db.query_plans   # 실패한 쿼리가 있으면 종료 코드 1
+"""
+import sys
+import json
+import psycopg2
+from app.core import time_range
+from app.db.database import ANALYSES_IN_RANGE_SQL, CHATROOM_EXISTS_IN_RANGE_SQL
+
+SAMPLE_PROFILE_ID = 1
+
+
+def _calendar_queries():
+    today = time_range.today()
+    last_monday, this_monday = time_range.last_week_dates(today)
+    return [
+        ("analysis: 특정일", ANALYSES_IN_RANGE_SQL, (SAMPLE_PROFILE_ID, *time_range.day_range(today))),
+        ("analysis: 지난주", ANALYSES_IN_RANGE_SQL, (SAMPLE_PROFILE_ID, *time_range.date_span_range(last_monday, this_monday))),
+        ("analysis: 이번 달", ANALYSES_IN_RANGE_SQL, (SAMPLE_PROFILE_ID, *time_range.month_range(today.year, today.month))),
+        ("chatroom: 오늘 생성 여부", CHATROOM_EXISTS_IN_RANGE_SQL, (SAMPLE_PROFILE_ID, *time_range.day_range(today))),
+    ]
+
+
+def _seq_scans(plan_node: dict) -> list:
+    found = []
+    if plan_node.get("Node Type") == "Seq Scan":
+        found.append(plan_node.get("Relation Name"))
+    for child in plan_node.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def explain_without_seqscan(conn, sql: str, params: tuple) -> list:
+    """enable_seqscan=off 상태의 실행 계획에서 순차 스캔되는 테이블 목록을 반환합니다."""
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return _seq_scans(plan[0]["Plan"])
+    finally:
+        conn.rollback()
+
+
+def check_calendar_queries(conn) -> bool:
+    all_ok = True
+    for label, sql, params in _calendar_queries():
+        seq_scanned = explain_without_seqscan(conn, sql, params)
+        if seq_scanned:
+            all_ok = False
+            print(f"❌ {label}: 순차 스캔 발생 ({', '.join(seq_scanned)})")
+        else:
+            print(f"✅ {label}: 인덱스 스캔")
+    return all_ok
+
+
+if __name__ == "__main__":
+    from app.core.config import DB_CONFIG
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        ok = check_calendar_queries(conn)
+    finally:
+        conn.close()
+    sys.exit(0 if ok else 1)
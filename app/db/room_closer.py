@@ -0,0 +1,212 @@
+import asyncio
+from psycopg2 import Error
+from psycopg2.extras import Json
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+
+class RoomCloser:
+    """채팅방 요약을 요청 처리와 분리해서 백그라운드에서 chatroom.topic 에 기록합니다.
+
+    enqueue() 는 닫을 방의 요약 상태(미리 갱신해 둔 요약 + 아직 합치지 못한 메시지)를 chatroom_close_jobs 에
+    저장한 뒤 바로 돌아오고, 요약은 같은 프로세스의 백그라운드 태스크가 마칩니다.
+    프로세스가 죽어 claimed_until 이 지난 행은 주기적인 복구(recover)가 이어받아, 재시작 뒤에도 요약이 기록됩니다.
+    요약에 실패하면 점점 길게 기다렸다가 다시 시도하고, max_attempts 번 실패한 행은 확인할 수 있도록 남겨 둡니다.
+    """
+
+    def __init__(self, db_manager, lease_seconds: int, recovery_interval: float, max_attempts: int):
+        self.db_manager = db_manager
+        self.lease_seconds = lease_seconds
+        self.recovery_interval = recovery_interval
+        self.max_attempts = max_attempts
+        self._tasks = {}          # chatroom_id -> 요약 태스크
+        self._recovery = None
+
+    # --- DB 작업 (전용 스레드 풀에서 실행) ---
+
+    def _insert_job(self, chatroom_id: int, label, summary: str, messages: list):
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO chatroom_close_jobs (chatroom_id, label, summary, messages, claimed_until)
+                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP + %s * INTERVAL '1 second')
+                    ON CONFLICT (chatroom_id) DO UPDATE SET
+                        label = EXCLUDED.label, summary = EXCLUDED.summary, messages = EXCLUDED.messages,
+                        claimed_until = EXCLUDED.claimed_until
+                    """,
+                    (chatroom_id, label, summary, Json(messages_to_dict(messages)), self.lease_seconds)
+                )
+            conn.commit()
+            return True
+        except Error as e:
+            print(f"[DB 오류] 채팅방 닫기 작업 저장 실패: {e}"); conn.rollback(); return False
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def _complete_job(self, chatroom_id: int, topic: str):
+        """요약 기록과 작업 삭제를 한 트랜잭션으로 처리합니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return False
+        try:
+            with conn.cursor() as cursor:
+                if topic:
+                    cursor.execute("UPDATE chatroom SET topic = %s WHERE id = %s", (topic, chatroom_id))
+                cursor.execute("DELETE FROM chatroom_close_jobs WHERE chatroom_id = %s", (chatroom_id,))
+            conn.commit()
+            print(f"채팅방({chatroom_id}) 요약 완료: {topic}")
+            return True
+        except Error as e:
+            print(f"[DB 오류] 채팅방 요약 기록 실패: {e}"); conn.rollback(); return False
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def _fail_job(self, chatroom_id: int, error: str):
+        # 시도할수록 오래 기다렸다가 복구 작업이 다시 시도합니다.
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE chatroom_close_jobs
+                    SET last_error = %s, claimed_until = CURRENT_TIMESTAMP + (30 * power(2, attempts - 1)) * INTERVAL '1 second'
+                    WHERE chatroom_id = %s
+                    """,
+                    (error[:500], chatroom_id)
+                )
+            conn.commit()
+        except Error as e:
+            print(f"[DB 오류] 채팅방 닫기 작업 실패 기록 실패: {e}"); conn.rollback()
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def _claim_stale_jobs(self, limit: int = 20) -> list:
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return []
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE chatroom_close_jobs
+                    SET claimed_until = CURRENT_TIMESTAMP + %s * INTERVAL '1 second', attempts = attempts + 1
+                    WHERE chatroom_id IN (
+                        SELECT chatroom_id FROM chatroom_close_jobs
+                        WHERE claimed_until < CURRENT_TIMESTAMP AND attempts < %s
+                        ORDER BY created_at
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING chatroom_id, label, summary, messages
+                    """,
+                    (self.lease_seconds, self.max_attempts, limit)
+                )
+                rows = cursor.fetchall()
+            conn.commit()
+            return rows
+        except Error as e:
+            print(f"[DB 오류] 채팅방 닫기 작업 복구 조회 실패: {e}"); conn.rollback(); return []
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def _release_claims(self, chatroom_ids: list):
+        """종료할 때 끝내지 못한 작업을 다음 프로세스가 바로 이어받도록 선점을 풉니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE chatroom_close_jobs SET claimed_until = CURRENT_TIMESTAMP WHERE chatroom_id = ANY(%s)",
+                    (chatroom_ids,)
+                )
+            conn.commit()
+        except Error as e:
+            print(f"[DB 오류] 채팅방 닫기 작업 선점 해제 실패: {e}"); conn.rollback()
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    # --- 비동기 작업 ---
+
+    @staticmethod
+    def _topic(label, summary: str) -> str:
+        if not summary:
+            return ""
+        return f"{label} {summary}" if label else summary
+
+    async def enqueue(self, chatroom_id: int, label=None, summary: str = "", room_summary=None):
+        """
+        label: '[일상대화]' 같은 요약 앞머리. 없으면 summary 를 그대로 기록 (퀴즈 완료 문구 등)
+        room_summary: 대화 도중 갱신해 온 IncrementalRoomSummary. 있으면 진행 중인 갱신 결과를 이어서 씁니다.
+        """
+        messages = []
+        if room_summary is not None:
+            summary, messages = room_summary.snapshot()
+        if not summary and not messages:
+            return
+        # 요약이 끝나기 전에 프로세스가 죽어도 이어서 할 수 있도록 먼저 저장합니다. (저장에 실패해도 요약은 시도)
+        await self.db_manager._run_sync(self._insert_job, chatroom_id, label, summary, messages)
+        self._spawn(chatroom_id, self._run_job(chatroom_id, label, summary, messages, room_summary))
+
+    def _spawn(self, chatroom_id: int, coro):
+        self._ensure_recovery()
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks[chatroom_id] = task
+
+        def _forget(_):
+            if self._tasks.get(chatroom_id) is task:
+                del self._tasks[chatroom_id]
+        task.add_done_callback(_forget)
+
+    async def _run_job(self, chatroom_id: int, label, summary: str, messages: list, room_summary=None):
+        try:
+            if room_summary is not None:
+                summary = await room_summary.finalize()
+            elif messages:
+                summary = await self.db_manager._summarize_room(summary, messages)
+            if messages and not summary:
+                raise RuntimeError("요약 결과가 비어 있음")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[오류] 채팅방({chatroom_id}) 요약 실패, 나중에 다시 시도: {e}")
+            await self.db_manager._run_sync(self._fail_job, chatroom_id, str(e))
+            return
+        await self.db_manager._run_sync(self._complete_job, chatroom_id, self._topic(label, summary))
+
+    async def recover(self):
+        """선점이 만료된(작업하던 프로세스가 죽었거나 실패한) 닫기 작업을 이어받습니다."""
+        for chatroom_id, label, summary, messages in await self.db_manager._run_sync(self._claim_stale_jobs):
+            if chatroom_id in self._tasks:
+                continue
+            print(f"[정보] 채팅방({chatroom_id}) 요약 작업 복구")
+            self._spawn(chatroom_id, self._run_job(chatroom_id, label, summary, messages_from_dict(messages)))
+
+    def _ensure_recovery(self):
+        if self._recovery is None or self._recovery.done():
+            self._recovery = asyncio.get_running_loop().create_task(self._recovery_loop())
+
+    def start(self):
+        """서버 시작 시 호출. 재시작 전에 남은 작업을 바로 복구하고 주기적인 복구를 시작합니다."""
+        self._ensure_recovery()
+
+    async def _recovery_loop(self):
+        while True:
+            try:
+                await self.recover()
+            except Exception as e:
+                print(f"[오류] 채팅방 닫기 작업 복구 중 문제 발생: {e}")
+            await asyncio.sleep(self.recovery_interval)
+
+    async def stop(self, timeout: float = 10.0):
+        """진행 중인 요약을 timeout 초까지 기다리고, 끝나지 않은 작업은 다음 프로세스가 이어받게 합니다."""
+        if self._recovery is not None:
+            self._recovery.cancel()
+        pending = list(self._tasks.items())
+        if pending:
+            await asyncio.wait([task for _, task in pending], timeout=timeout)
+        unfinished = [chatroom_id for chatroom_id, task in pending if not task.done()]
+        for _, task in pending:
+            task.cancel()
+        if unfinished:
+            await self.db_manager._run_sync(self._release_claims, unfinished)
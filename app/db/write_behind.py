@@ -0,0 +1,61 @@
+import asyncio
+
+
+class TalkWriteBehindQueue:
+    """여러 세션의 대화 턴을 모아서 한 번의 다중 행 INSERT 로 저장하는 write-behind 큐입니다.
+
+    submit() 으로 넘긴 턴은 max_batch_size 개가 모이거나 flush_interval 초가 지나면 한꺼번에 저장되고,
+    각 호출자는 자기 턴의 사용자 발화 talk id 를 돌려받습니다. (저장에 실패하면 None)
+    """
+
+    def __init__(self, db_manager, max_batch_size: int, flush_interval: float):
+        self.db_manager = db_manager
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._pending = []       # (turn, future)
+        self._wake = None
+        self._flusher = None
+        self._flush_lock = None
+
+    async def submit(self, turn: dict):
+        """turn: session_id, user_input, bot_response, category, chatroom_id, profile_id, sentiment, keywords"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((turn, future))
+        self._ensure_flusher()
+        if len(self._pending) >= self.max_batch_size:
+            self._wake.set()
+        return await future
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._wake = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._flusher = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """대기 중인 턴을 max_batch_size 개씩 저장합니다."""
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.max_batch_size]
+                self._pending = self._pending[self.max_batch_size:]
+                try:
+                    talk_ids = await self.db_manager._run_sync(
+                        self.db_manager._insert_talk_batch, [turn for turn, _ in batch]
+                    )
+                except Exception as e:
+                    print(f"[DB 오류] 대화 일괄 저장 중 문제 발생: {e}")
+                    talk_ids = None
+                for index, (_, future) in enumerate(batch):
+                    if not future.done():
+                        future.set_result(talk_ids[index] if talk_ids else None)
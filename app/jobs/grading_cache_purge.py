@@ -0,0 +1,35 @@
+"""오래된 퀴즈 채점 캐시(grading_cache) 정리.
+
+채점 기준이 바뀐 지난 버전의 행은 더는 조회되지 않지만, 롤링 배포 중에는 이전 버전 프로세스가 아직 쓰고 있으므로
+서버가 시작할 때 지우지 않고 이 작업이 만든 지 GRADING_CACHE_RETENTION_DAYS 일이 지난 행을 버전과 상관없이 지웁니다.
+모델이나 커넥션 풀을 띄우지 않고 DB 에 바로 연결합니다.
+
+실행: python -m app.jobs.grading_cache_purge [--days N]
+예) 매일 새벽 4시 cron: 0 4 * * * cd /srv/gguro && python -m app.jobs.grading_cache_purge
+"""
+import sys
+import argparse
+import psycopg2
+from app.core.config import DB_CONFIG, GRADING_CACHE_RETENTION_DAYS
+from app.services.grading_cache import purge_expired
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오래된 퀴즈 채점 캐시 정리")
+    parser.add_argument("--days", type=int, default=GRADING_CACHE_RETENTION_DAYS, help="이 기간(일)이 지난 채점 결과를 지움")
+    args = parser.parse_args(argv)
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        count = purge_expired(conn, args.days)
+    except psycopg2.Error as e:
+        print(f"[DB 오류] 채점 캐시 정리 실패: {e}"); conn.rollback()
+        return 1
+    finally:
+        conn.close()
+    print(f"[채점 캐시] {args.days}일이 지난 채점 결과 {count}건 삭제")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
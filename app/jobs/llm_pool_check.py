@@ -0,0 +1,193 @@
+"""LLM 백엔드 풀(app.services.llm_pool) 점검.
+
+기본 모드는 이 프로세스 안에 Ollama API 를 흉내 내는 가짜 서버(/api/tags, /api/chat)를 띄워
+- 가장 한가한 서버로 나눠 보내는지, 서버별 동시 처리 한도를 넘지 않는지
+- 꺼진 서버 / 5xx 를 돌려주는 서버가 섞여도 다른 서버로 넘겨 모든 요청이 성공하는지
+- 스트리밍이 풀을 거쳐도 그대로 나오는지
+- 꺼졌던 서버가 살아나면 헬스 체크가 다시 넣는지
+를 실제 ChatOllama 체인으로 확인합니다. 실제 Ollama 나 DB 는 필요 없습니다.
+
+--configured 를 주면 OLLAMA_BACKENDS 에 적힌 실제 서버들의 헬스 체크와 짧은 요청 하나를 확인합니다.
+
+실행: python -m app.jobs.llm_pool_check [--configured]
+      확인 항목 중 하나라도 실패하면 종료 코드 1
+"""
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from app.services.llm_pool import LLMBackendPool, parse_backends
+
+STUB_MODEL = "stub-model"
+
+
+class StubOllama:
+    """요청마다 delay 초 뒤에 '{name} 응답' 을 두 조각으로 스트리밍하는 가짜 Ollama 서버."""
+
+    def __init__(self, name: str, delay: float = 0.05, fail_status: int = None, port: int = 0):
+        self.name = name
+        self.delay = delay
+        self.fail_status = fail_status
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, body: dict):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": f"{STUB_MODEL}:latest"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if stub.fail_status:
+                    self._send_json(stub.fail_status, {"error": f"{stub.name} 과부하"})
+                    return
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.end_headers()
+                    for content, done in ((stub.name, False), (" 응답", False), ("", True)):
+                        line = {"model": STUB_MODEL, "created_at": "2024-01-01T00:00:00Z",
+                                "message": {"role": "assistant", "content": content}, "done": done}
+                        if done:
+                            line.update({"done_reason": "stop", "prompt_eval_count": 1, "eval_count": 2})
+                        self.wfile.write((json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8"))
+                        self.wfile.flush()
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _closed_port_url() -> str:
+    """아무도 듣고 있지 않은 포트 (꺼진 서버 흉내)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def _chain(pool):
+    prompt = ChatPromptTemplate.from_template("{input}")
+    return prompt | pool | StrOutputParser()
+
+
+def _pool(backends: list) -> LLMBackendPool:
+    # 헬스 체크 루프 없이, 점검 코드가 check_all() 을 직접 부릅니다.
+    return LLMBackendPool(STUB_MODEL, backends, health_interval=0)
+
+
+async def check_routing(results: list):
+    fast, slow = StubOllama("A", delay=0.05), StubOllama("B", delay=0.05)
+    try:
+        pool = _pool([(fast.url, 3), (slow.url, 1)])
+        chain = _chain(pool)
+        answers = await asyncio.gather(*(chain.ainvoke({"input": f"질문 {i}"}) for i in range(12)))
+        results.append(("12개 요청 모두 응답", all(answer.endswith("응답") for answer in answers)))
+        results.append(("서버별 동시 처리 한도 준수 (A<=3, B<=1)", fast.max_in_flight <= 3 and slow.max_in_flight <= 1))
+        results.append((f"한도 비율대로 분산 (A {fast.requests}건, B {slow.requests}건)", fast.requests > slow.requests > 0))
+    finally:
+        fast.close(); slow.close()
+
+
+async def check_failover(results: list):
+    healthy, overloaded = StubOllama("정상"), StubOllama("과부하", fail_status=503)
+    try:
+        pool = _pool([(_closed_port_url(), 2), (overloaded.url, 2), (healthy.url, 2)])
+        chain = _chain(pool)
+        answers = await asyncio.gather(*(chain.ainvoke({"input": f"질문 {i}"}) for i in range(6)))
+        results.append(("꺼진 서버·503 서버가 섞여도 모두 성공", all(answer.startswith("정상") for answer in answers)))
+        snapshot = pool.snapshot()
+        results.append((f"실패한 서버를 제외로 표시 (failover {snapshot['failovers']}회)",
+                        [backend["healthy"] for backend in snapshot["backends"]] == [False, False, True]))
+
+        streamed = [chunk async for chunk in chain.astream({"input": "스트리밍"})]
+        results.append((f"스트리밍 전달 ({len(streamed)}조각)", "".join(streamed) == "정상 응답" and len(streamed) >= 2))
+    finally:
+        healthy.close(); overloaded.close()
+
+
+async def check_recovery(results: list):
+    down_url = _closed_port_url()
+    alive = StubOllama("살아 있음")
+    try:
+        pool = _pool([(down_url, 1), (alive.url, 1)])
+        await pool.check_all()
+        results.append(("헬스 체크가 꺼진 서버를 제외", not pool.backends[0]["healthy"] and pool.backends[1]["healthy"]))
+
+        # 같은 포트로 서버가 다시 뜨면 다음 헬스 체크에서 복구
+        revived = StubOllama("복구", port=int(down_url.rsplit(":", 1)[1]))
+        try:
+            await pool.check_all()
+            results.append(("다시 뜬 서버를 헬스 체크가 복구", pool.backends[0]["healthy"]))
+        finally:
+            revived.close()
+    finally:
+        alive.close()
+
+
+async def check_configured(results: list):
+    from app.core.config import MODEL_NAME, OLLAMA_BACKENDS, OLLAMA_BACKEND_CONCURRENCY
+    pool = LLMBackendPool(MODEL_NAME, parse_backends(OLLAMA_BACKENDS, OLLAMA_BACKEND_CONCURRENCY), health_interval=0)
+    for url, ok in (await pool.check_all()).items():
+        results.append((f"{url} 헬스 체크 ({MODEL_NAME})", ok))
+    started = time.monotonic()
+    try:
+        answer = await _chain(pool).ainvoke({"input": "한 단어로 인사해 줘."})
+        results.append((f"풀을 거친 요청 ({time.monotonic() - started:.1f}초): {answer[:30]!r}", bool(answer)))
+    except Exception as e:
+        results.append((f"풀을 거친 요청 실패: {e}", False))
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM 백엔드 풀 점검")
+    parser.add_argument("--configured", action="store_true", help="가짜 서버 대신 OLLAMA_BACKENDS 의 실제 서버 점검")
+    args = parser.parse_args(argv)
+
+    results = []
+    if args.configured:
+        await check_configured(results)
+    else:
+        for check in (check_routing, check_failover, check_recovery):
+            await check(results)
+
+    for name, ok in results:
+        print(f"[{'통과' if ok else '실패'}] {name}")
+    return 0 if all(ok for _, ok in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
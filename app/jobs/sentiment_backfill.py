@@ -0,0 +1,376 @@
+"""과거 사용자 발화의 감정/키워드(talk.sentiment, talk.keywords)와 분석(analysis)을 지금의 프롬프트로 다시 매기는 일괄 작업.
+
+- talk 를 서버 측 커서로 batch-size 건씩 id 순서대로 읽으므로, 수백만 건이어도 메모리에는 배치 두 개만 올라갑니다.
+- 분석은 실시간 저장과 같은 경로(사전 분류기 → 통합 분석 → 필요하면 단일 대화 분석)를 쓰며, LLM 에는 동시에 --concurrency 건까지만 보냅니다.
+- 배치마다 talk 갱신, analysis upsert/삭제, 바뀐 날짜의 일간 집계(daily_sentiment_rollup) 재계산, 체크포인트(backfill_runs)를
+  한 트랜잭션으로 기록합니다. 중단돼도 같은 --run 으로 다시 실행하면 마지막으로 기록한 배치 다음부터 이어서 처리합니다.
+- --run 을 생략하면 분석 프롬프트·모델·분석 설정의 해시로 이름을 정하므로, 프롬프트를 바꾸면 처음부터, 그대로면 이어서 실행됩니다.
+- 분석에 실패한 발화는 기존 라벨을 그대로 두고 건너뜁니다. (건수는 backfill_runs.failed) 한 배치에서 실패가 --max-failure-rate 를
+  넘으면(LLM 서버 장애 등) 그 배치는 기록하지 않고 멈춥니다.
+실행 시작 시점의 마지막 talk id 까지만 처리합니다. 그 뒤에 저장된 발화는 이미 지금의 프롬프트로 분석되어 있습니다.
+
+실행: python -m app.jobs.sentiment_backfill [--run NAME] [--batch-size 500] [--concurrency 4] [--limit N] [--dry-run] [--restart]
+  --limit: 이번 실행에서 처리할 최대 발화 수 (시험 실행용, 체크포인트는 남음)
+  --dry-run: 분석만 하고 기록하지 않음 (처리량과 라벨이 바뀌는 비율 확인용)
+  --restart: 같은 이름의 진행 상황을 지우고 처음부터
+"""
+import sys
+import time
+import asyncio
+import hashlib
+import argparse
+from collections import deque
+import psycopg2
+from psycopg2 import Error
+from psycopg2.extras import execute_values
+from langchain_core.callbacks import get_usage_metadata_callback
+from app.core.config import (
+    DB_CONFIG,
+    MODEL_NAME,
+    COMBINED_TALK_ANALYSIS,
+    LEXICON_PRECLASSIFY,
+    BACKFILL_BATCH_SIZE,
+    BACKFILL_CONCURRENCY
+)
+from app.prompts.prompts import (
+    ANALYSIS_PROMPT_TEMPLATE,
+    COMBINED_TALK_ANALYSIS_PROMPT,
+    SINGLE_NEGATIVE_TALK_ANALYSIS_PROMPT,
+    SINGLE_POSITIVE_TALK_ANALYSIS_PROMPT
+)
+
+QUIZ_CATEGORY = 'SAFETYSTUDY'
+
+TALK_SELECT_SQL = """
+    SELECT id, content, sentiment::text, keywords, category
+    FROM talk
+    WHERE role = 'user' AND id > %s AND id <= %s
+    ORDER BY id
+"""
+
+TALK_UPDATE_SQL = """
+    UPDATE talk AS t SET sentiment = v.sentiment, keywords = v.keywords
+    FROM (VALUES %s) AS v(id, sentiment, keywords)
+    WHERE t.id = v.id
+"""
+
+# 새 분석 행의 created_at 은 발화 시각으로 둬서 날짜별 조회·집계가 원래 날짜에 잡히게 합니다.
+ANALYSIS_UPSERT_SQL = """
+    INSERT INTO analysis (talk_id, profile_id, summary, keyword, is_positive, created_at)
+    SELECT v.talk_id, t.profile_id, v.summary, v.keyword, v.is_positive, t.created_at
+    FROM (VALUES %s) AS v(talk_id, summary, keyword, is_positive), talk t
+    WHERE t.id = v.talk_id
+    ON CONFLICT (talk_id) DO UPDATE SET
+        summary = EXCLUDED.summary, keyword = EXCLUDED.keyword, is_positive = EXCLUDED.is_positive
+    RETURNING profile_id, created_at::date
+"""
+
+ROLLUP_DELETE_SQL = """
+    DELETE FROM daily_sentiment_rollup AS r
+    USING (VALUES %s) AS k(profile_id, day)
+    WHERE r.profile_id = k.profile_id AND r.day = k.day
+"""
+
+# 분석이 바뀐 (프로필, 날짜)의 일간 집계를 analysis 에서 다시 계산합니다. (마이그레이션 3 의 초기 집계와 같은 형태)
+# DELETE 와 INSERT 사이에 실시간 분석 저장이 같은 (프로필, 날짜) 행을 새로 만들 수 있으므로, 충돌하면 다시 계산한 값으로 덮어씁니다.
+ROLLUP_REBUILD_SQL = """
+    WITH keys (profile_id, day) AS (VALUES %s),
+    keyword_totals AS (
+        SELECT a.profile_id, k.day, a.is_positive, a.keyword, COUNT(*) AS cnt
+        FROM keys k
+        JOIN analysis a ON a.profile_id = k.profile_id AND a.created_at >= k.day AND a.created_at < k.day + 1
+        GROUP BY a.profile_id, k.day, a.is_positive, a.keyword
+    )
+    INSERT INTO daily_sentiment_rollup (profile_id, day, positive, negative, keyword_counts)
+    SELECT
+        profile_id,
+        day,
+        COALESCE(SUM(cnt) FILTER (WHERE is_positive), 0),
+        COALESCE(SUM(cnt) FILTER (WHERE NOT is_positive), 0),
+        jsonb_build_object(
+            'positive', COALESCE(jsonb_object_agg(keyword, cnt) FILTER (WHERE is_positive AND NULLIF(keyword, '') IS NOT NULL), '{}'::jsonb),
+            'negative', COALESCE(jsonb_object_agg(keyword, cnt) FILTER (WHERE NOT is_positive AND NULLIF(keyword, '') IS NOT NULL), '{}'::jsonb)
+        )
+    FROM keyword_totals
+    GROUP BY profile_id, day
+    ON CONFLICT (profile_id, day) DO UPDATE SET
+        positive = EXCLUDED.positive,
+        negative = EXCLUDED.negative,
+        keyword_counts = EXCLUDED.keyword_counts
+"""
+
+
+def default_run_name() -> str:
+    parts = [
+        ANALYSIS_PROMPT_TEMPLATE, COMBINED_TALK_ANALYSIS_PROMPT,
+        SINGLE_POSITIVE_TALK_ANALYSIS_PROMPT, SINGLE_NEGATIVE_TALK_ANALYSIS_PROMPT,
+        MODEL_NAME, str(COMBINED_TALK_ANALYSIS), str(LEXICON_PRECLASSIFY)
+    ]
+    return "sentiment-" + hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+# --- 진행 상황 / 기록 (DB 스레드 풀에서 실행) ---
+
+def start_run(db_manager, run_name: str, restart: bool):
+    """진행 상황 행을 만들거나 불러옵니다. (last_talk_id, max_talk_id, processed, changed, failed, finished_at)"""
+    conn = db_manager._get_db_connection()
+    if conn is None: return None
+    try:
+        with conn.cursor() as cursor:
+            if restart:
+                cursor.execute("DELETE FROM backfill_runs WHERE name = %s", (run_name,))
+            cursor.execute(
+                """
+                INSERT INTO backfill_runs (name, max_talk_id)
+                VALUES (%s, (SELECT COALESCE(MAX(id), 0) FROM talk))
+                ON CONFLICT (name) DO NOTHING
+                """,
+                (run_name,)
+            )
+            cursor.execute(
+                "SELECT last_talk_id, max_talk_id, processed, changed, failed, finished_at FROM backfill_runs WHERE name = %s",
+                (run_name,)
+            )
+            state = cursor.fetchone()
+        conn.commit()
+        return state
+    except Error as e:
+        print(f"[DB 오류] 재분석 진행 상황 조회 실패: {e}"); conn.rollback(); return None
+    finally:
+        if conn: db_manager._release_db_connection(conn)
+
+
+def write_batch(db_manager, run_name: str, results: list, last_talk_id: int, processed: int, changed: int, failed: int) -> bool:
+    """results: 다시 써야 하는 발화(라벨이 바뀌었거나 분석 행이 있어야 하는 발화)의 분석 결과.
+    기록과 체크포인트를 한 트랜잭션으로 처리합니다.
+    """
+    conn = db_manager._get_db_connection()
+    if conn is None: return False
+    try:
+        with conn.cursor() as cursor:
+            touched_days = set()
+            relabeled = [(r["talk_id"], r["sentiment"], r["keywords"]) for r in results if r["label_changed"]]
+            if relabeled:
+                execute_values(
+                    cursor, TALK_UPDATE_SQL, relabeled,
+                    template="(%s::bigint, %s::sentiment_type, %s::text[])", page_size=len(relabeled)
+                )
+            if results:
+                stale_ids = [r["talk_id"] for r in results if r["summary"] is None]
+                if stale_ids:
+                    cursor.execute(
+                        "DELETE FROM analysis WHERE talk_id = ANY(%s) RETURNING profile_id, created_at::date",
+                        (stale_ids,)
+                    )
+                    touched_days.update(cursor.fetchall())
+                upserts = [(r["talk_id"], r["summary"], r["keyword"], r["is_positive"]) for r in results if r["summary"] is not None]
+                if upserts:
+                    touched_days.update(execute_values(
+                        cursor, ANALYSIS_UPSERT_SQL, upserts,
+                        template="(%s::bigint, %s, %s, %s::boolean)", page_size=len(upserts), fetch=True
+                    ))
+            if touched_days:
+                keys = sorted(touched_days)
+                execute_values(cursor, ROLLUP_DELETE_SQL, keys, template="(%s::bigint, %s::date)", page_size=len(keys))
+                execute_values(cursor, ROLLUP_REBUILD_SQL, keys, template="(%s::bigint, %s::date)", page_size=len(keys))
+            cursor.execute(
+                """
+                UPDATE backfill_runs
+                SET last_talk_id = %s, processed = processed + %s, changed = changed + %s, failed = failed + %s,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE name = %s
+                """,
+                (last_talk_id, processed, changed, failed, run_name)
+            )
+        conn.commit()
+        return True
+    except Error as e:
+        print(f"[DB 오류] 재분석 결과 기록 실패: {e}"); conn.rollback(); return False
+    finally:
+        if conn: db_manager._release_db_connection(conn)
+
+
+def finish_run(db_manager, run_name: str):
+    conn = db_manager._get_db_connection()
+    if conn is None: return
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("UPDATE backfill_runs SET finished_at = CURRENT_TIMESTAMP WHERE name = %s", (run_name,))
+        conn.commit()
+    except Error as e:
+        print(f"[DB 오류] 재분석 완료 기록 실패: {e}"); conn.rollback()
+    finally:
+        if conn: db_manager._release_db_connection(conn)
+
+
+# --- 분석 ---
+
+async def analyze_row(db_manager, row, semaphore: asyncio.Semaphore) -> dict:
+    """실시간 저장(save_conversation_to_db)과 같은 기준으로 분석합니다. summary 가 None 이면 analysis 행이 없어야 하는 발화입니다."""
+    talk_id, content, old_sentiment, old_keywords, category = row
+    async with semaphore:
+        # 지난 발화는 어느 놀이였는지 category 로만 알 수 있어서, 퀴즈(SAFETYSTUDY) 답변만 게임 답변으로 봅니다.
+        analysis = await db_manager._analyze_user_input(content, raise_errors=True, game_turn=category == QUIZ_CATEGORY)
+        sentiment, keywords = analysis["sentiment"], analysis["keywords"]
+        summary, keyword = None, None
+        if sentiment != "일반" and keywords:
+            summary, keyword = analysis["summary"], analysis["keyword"]
+            if not summary:
+                summary, keyword = await db_manager._summarize_talk(content, sentiment == "긍정")
+    return {
+        "talk_id": talk_id,
+        "sentiment": sentiment,
+        "keywords": keywords,
+        "summary": summary,
+        "keyword": keyword,
+        "is_positive": sentiment == "긍정",
+        "label_changed": sentiment != old_sentiment or list(keywords) != list(old_keywords or []),
+    }
+
+
+class Progress:
+    def __init__(self, processed: int, changed: int, failed: int):
+        self.processed, self.changed, self.failed = processed, changed, failed
+        self.session_rows = 0
+        self.started = time.monotonic()
+
+    def line(self, last_talk_id: int, max_talk_id: int, tokens: int) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (f"[재분석] talk #{last_talk_id}/{max_talk_id}: 누적 {self.processed}건 (라벨 바뀜 {self.changed}, 실패 {self.failed}) | "
+                f"이번 실행 {self.session_rows}건, {self.session_rows / elapsed:.1f}건/s, {tokens / elapsed:.0f}토큰/s")
+
+
+async def run_backfill(db_manager, run_name: str, batch_size: int, concurrency: int,
+                       limit: int = None, dry_run: bool = False, restart: bool = False, max_failure_rate: float = 0.5) -> dict:
+    state = await db_manager._run_sync(start_run, db_manager, run_name, restart)
+    if state is None:
+        raise RuntimeError("진행 상황을 불러오지 못했습니다.")
+    last_talk_id, max_talk_id, processed, changed, failed, finished_at = state
+    progress = Progress(processed, changed, failed)
+    if finished_at is not None:
+        print(f"[재분석] '{run_name}' 은 이미 완료되었습니다. ({finished_at}, 다시 하려면 --restart)")
+        return {"status": "finished", "progress": progress, "tokens": 0}
+    print(f"[재분석] '{run_name}': talk #{last_talk_id} 다음부터 #{max_talk_id} 까지 (배치 {batch_size}건, 동시 분석 {concurrency}건{', 기록 안 함' if dry_run else ''})")
+
+    # 커서를 여는 동안 트랜잭션이 유지되므로, 기록에 쓰는 커넥션 풀과 분리된 읽기 전용 커넥션을 씁니다.
+    reader = psycopg2.connect(**DB_CONFIG)
+    reader.set_session(readonly=True)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    in_flight = deque()      # (배치의 행, 분석 태스크) — 앞 배치의 마지막 분석을 기다리는 동안 다음 배치가 LLM 자리를 채웁니다.
+    status = "finished"
+    remaining = limit
+
+    async def commit_oldest():
+        nonlocal last_talk_id
+        rows, tasks = in_flight.popleft()
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        results, batch_failed = [], 0
+        for row, outcome in zip(rows, outcomes):
+            if isinstance(outcome, Exception):
+                batch_failed += 1
+                print(f"[오류] talk #{row[0]} 분석 실패, 기존 라벨 유지: {outcome}")
+            elif outcome["label_changed"] or outcome["summary"] is not None:
+                # 감정/키워드가 그대로여도 분석 행(요약문)은 새 프롬프트로 다시 씁니다.
+                results.append(outcome)
+        if batch_failed > len(rows) * max_failure_rate:
+            raise RuntimeError(f"배치 {len(rows)}건 중 {batch_failed}건 분석 실패 — LLM 서버 상태를 확인한 뒤 다시 실행하세요.")
+        batch_last_id = rows[-1][0]
+        batch_changed = sum(1 for result in results if result["label_changed"])
+        if not dry_run:
+            ok = await db_manager._run_sync(write_batch, db_manager, run_name, results, batch_last_id, len(rows), batch_changed, batch_failed)
+            if not ok:
+                raise RuntimeError("재분석 결과를 기록하지 못했습니다.")
+        last_talk_id = batch_last_id
+        progress.processed += len(rows)
+        progress.changed += batch_changed
+        progress.failed += batch_failed
+        progress.session_rows += len(rows)
+        print(progress.line(last_talk_id, max_talk_id, _total_tokens(usage)))
+
+    try:
+        with get_usage_metadata_callback() as usage:
+            with reader.cursor(name="sentiment_backfill") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(TALK_SELECT_SQL, (last_talk_id, max_talk_id))
+                exhausted = False
+                while not exhausted or in_flight:
+                    if not exhausted:
+                        size = batch_size if remaining is None else min(batch_size, remaining)
+                        rows = await db_manager._run_sync(cursor.fetchmany, size) if size > 0 else []
+                        if rows:
+                            in_flight.append((rows, [asyncio.create_task(analyze_row(db_manager, row, semaphore)) for row in rows]))
+                            if remaining is not None:
+                                remaining -= len(rows)
+                        else:
+                            exhausted = True
+                            if remaining == 0:
+                                status = "limited"
+                    if in_flight and (exhausted or len(in_flight) > 1):
+                        await commit_oldest()
+            tokens = _total_tokens(usage)
+    except BaseException:
+        for _, tasks in in_flight:
+            for task in tasks:
+                task.cancel()
+        raise
+    finally:
+        reader.close()
+
+    if status == "finished" and not dry_run:
+        await db_manager._run_sync(finish_run, db_manager, run_name)
+    return {"status": status, "progress": progress, "tokens": tokens}
+
+
+def _total_tokens(usage) -> int:
+    return sum(metadata.get("total_tokens", 0) for metadata in usage.usage_metadata.values())
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="과거 발화 감정/키워드·분석 재분석")
+    parser.add_argument("--run", default=None, help="진행 상황 이름 (기본: 분석 프롬프트·모델 해시)")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="한 번에 읽고 기록하는 발화 수")
+    parser.add_argument("--concurrency", type=int, default=BACKFILL_CONCURRENCY, help="동시 분석 수")
+    parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 처리할 최대 발화 수")
+    parser.add_argument("--dry-run", action="store_true", help="분석만 하고 기록하지 않음")
+    parser.add_argument("--restart", action="store_true", help="진행 상황을 지우고 처음부터")
+    parser.add_argument("--max-failure-rate", type=float, default=0.5, help="한 배치의 분석 실패 비율이 이보다 높으면 중단")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size 는 1 이상이어야 합니다.")
+    if args.dry_run and args.restart:
+        parser.error("--dry-run 과 --restart 는 함께 쓸 수 없습니다.")
+
+    # 모델과 DB 커넥션 풀을 띄우므로 인자 확인 뒤에 불러옵니다.
+    from app.services.chatbot_system import chatbot_system
+    from app.services.llm_dispatcher import BACKGROUND
+    db_manager = chatbot_system.db_manager
+    # 이 프로세스에는 실시간 요청이 없으므로 분석 등급의 동시 호출 한도 대신 --concurrency 로 제한합니다.
+    dispatcher = chatbot_system.llm_dispatcher
+    dispatcher.class_limits[BACKGROUND] = dispatcher.max_concurrency
+    dispatcher.interactive_reserved = 0
+
+    run_name = args.run or default_run_name()
+    started = time.monotonic()
+    try:
+        result = await run_backfill(
+            db_manager, run_name, args.batch_size, args.concurrency,
+            limit=args.limit, dry_run=args.dry_run, restart=args.restart, max_failure_rate=args.max_failure_rate
+        )
+    except RuntimeError as e:
+        print(f"❌ 재분석 중단: {e} (다시 실행하면 마지막으로 기록한 배치 다음부터 이어서 처리합니다)")
+        return 1
+    finally:
+        await db_manager.talk_writer.flush()
+        db_manager.close()
+        await chatbot_system.llm_pool.close()
+
+    progress, elapsed = result["progress"], time.monotonic() - started
+    if result["status"] != "finished" or progress.session_rows:
+        print(f"[재분석] {'완료' if result['status'] == 'finished' else '이번 실행 분량 처리'}: {progress.session_rows}건, "
+              f"{elapsed:.1f}초 ({progress.session_rows / max(elapsed, 1e-9):.1f}건/s, LLM {result['tokens']}토큰, "
+              f"{result['tokens'] / max(elapsed, 1e-9):.0f}토큰/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
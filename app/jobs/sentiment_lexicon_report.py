@@ -0,0 +1,133 @@
+"""로컬 사전 분류기(app.services.sentiment_lexicon)를 과거 talk.sentiment 라벨과 비교하는 오프라인 점검.
+
+- 처리율: 분류기가 LLM 없이 '일반'으로 확정한 사용자 발화의 비율 (그만큼 LLM 호출이 줄어듭니다)
+- 일치율: 확정한 발화 중 과거 라벨도 '일반'이었던 비율
+- 놓친 감정 발화: 분류기는 '일반'으로 확정했지만 과거 라벨은 긍정/부정인 발화 (사전 보강 후보)
+
+과거 라벨도 LLM 이 붙인 것이므로 '정답률'이 아니라 LLM 과의 일치율입니다.
+DB 를 보기 전에 반드시 LLM 에 넘겨야 하는 문장(REGRESSION_CASES)이 그대로 넘어가는지 먼저 확인합니다.
+
+실행: python -m app.jobs.sentiment_lexicon_report [--limit 50000] [--show-misses 20] [--min-agreement 0.95]
+      python -m app.jobs.sentiment_lexicon_report --regressions-only   # DB 없이 회귀 문장만 확인
+      회귀 문장이 틀리거나 일치율이 --min-agreement 보다 낮으면 종료 코드 1
+"""
+import sys
+import time
+import argparse
+from collections import Counter
+import psycopg2
+from app.services.sentiment_lexicon import preclassify
+
+
+# (발화, 게임 답변 여부, 기대 결과). None 은 'LLM 이 판단해야 함'.
+REGRESSION_CASES = [
+    # 학대·위험·그리움 표현은 짧고 사전 어휘가 없어도 '일반'으로 확정하면 안 됩니다.
+    ("아빠가 때렸어", False, None),
+    ("엄마가 나를 혼냈어", False, None),
+    ("동생이 내 장난감 부쉈어", False, None),
+    ("엄마 보고싶어", False, None),
+    ("아빠가 때렸어", True, None),
+    ("엄마가 나를 혼냈어", True, None),
+    ("동생이 내 장난감 부쉈어", True, None),
+    ("엄마 보고싶어", True, None),
+    ("친구가 내 거 뺏어갔어", False, None),
+    ("오늘 학교 갔어", False, None),
+    # 감정이 없다는 근거가 있는 발화
+    ("역할놀이 시작: 사용자(아이), 봇(선생님)", False, "일반"),
+    ("응", False, "일반"),
+    ("알겠어.", False, "일반"),
+    ("횡단보도에서 기다려요", True, "일반"),
+    ("토끼", True, "일반"),
+    ("무서워요", True, None),
+]
+
+
+def check_regressions() -> list:
+    """기대와 다르게 분류된 (발화, 게임 답변 여부, 기대, 실제) 목록."""
+    failures = []
+    for text, game_turn, expected in REGRESSION_CASES:
+        predicted = preclassify(text, game_turn=game_turn)
+        if predicted != expected:
+            failures.append((text, game_turn, expected, predicted))
+    return failures
+
+
+def build_report(conn, limit: int, show_misses: int) -> dict:
+    counts = Counter()           # 과거 라벨별 전체 발화 수
+    confirmed = Counter()        # 분류기가 '일반'으로 확정한 발화의 과거 라벨별 수
+    misses = []
+    elapsed = 0.0
+
+    # 대량 조회라 서버 측 커서로 나눠 가져옵니다.
+    with conn.cursor(name="lexicon_report") as cursor:
+        cursor.itersize = 2000
+        cursor.execute(
+            "SELECT content, sentiment::text, category FROM talk WHERE role = 'user' ORDER BY id DESC LIMIT %s",
+            (limit,)
+        )
+        for content, label, category in cursor:
+            started = time.perf_counter()
+            # 지난 발화는 category 로만 놀이를 알 수 있어서 퀴즈(SAFETYSTUDY) 답변만 게임 답변으로 봅니다.
+            predicted = preclassify(content, game_turn=category == 'SAFETYSTUDY')
+            elapsed += time.perf_counter() - started
+
+            counts[label] += 1
+            if predicted == "일반":
+                confirmed[label] += 1
+                if label != "일반" and len(misses) < show_misses:
+                    misses.append((label, content))
+    conn.rollback()
+
+    total = sum(counts.values())
+    confirmed_total = sum(confirmed.values())
+    return {
+        "total": total,
+        "label_counts": dict(counts),
+        "confirmed": confirmed_total,
+        "coverage": confirmed_total / total if total else 0.0,
+        "agreement": confirmed["일반"] / confirmed_total if confirmed_total else 1.0,
+        # 과거에 '일반'이었던 발화 중 분류기가 잡아낸 비율
+        "neutral_recall": confirmed["일반"] / counts["일반"] if counts["일반"] else 0.0,
+        "missed_emotional": confirmed["긍정"] + confirmed["부정"],
+        "misses": misses,
+        "avg_us": elapsed / total * 1_000_000 if total else 0.0,
+    }
+
+
+def print_report(report: dict):
+    print(f"사용자 발화 {report['total']}건 (과거 라벨: {report['label_counts']})")
+    print(f"- 처리율: {report['coverage']:.1%} ({report['confirmed']}건을 LLM 없이 '일반'으로 확정)")
+    print(f"- 일치율: {report['agreement']:.2%}")
+    print(f"- '일반' 발화 재현율: {report['neutral_recall']:.1%}")
+    print(f"- 놓친 감정 발화: {report['missed_emotional']}건")
+    print(f"- 평균 처리 시간: {report['avg_us']:.1f}µs/건")
+    for label, content in report["misses"]:
+        print(f"  [{label}] {content}")
+
+
+if __name__ == "__main__":
+    from app.core.config import DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="로컬 감정 사전 분류기 일치율 점검")
+    parser.add_argument("--limit", type=int, default=50000, help="최근 사용자 발화 몇 건을 볼지")
+    parser.add_argument("--show-misses", type=int, default=20, help="놓친 감정 발화 예시 개수")
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="이보다 일치율이 낮으면 실패")
+    parser.add_argument("--regressions-only", action="store_true", help="DB 없이 회귀 문장만 확인")
+    args = parser.parse_args()
+
+    failures = check_regressions()
+    print(f"회귀 문장 {len(REGRESSION_CASES)}개 중 {len(REGRESSION_CASES) - len(failures)}개 통과")
+    for text, game_turn, expected, predicted in failures:
+        print(f"  [실패] {text!r} (게임 답변: {game_turn}) 기대 {expected}, 실제 {predicted}")
+    if failures:
+        sys.exit(1)
+    if args.regressions_only:
+        sys.exit(0)
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        report = build_report(conn, args.limit, args.show_misses)
+    finally:
+        conn.close()
+    print_report(report)
+    sys.exit(0 if report["agreement"] >= args.min_agreement else 1)
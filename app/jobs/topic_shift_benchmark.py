@@ -0,0 +1,119 @@
+"""로컬 주제 전환 판단(app.services.topic_shift)을 LLM 판단(TOPIC_CHECK_PROMPT_TEMPLATE)과 비교합니다.
+
+과거 일상 대화(talk)에서 세션별로 (최근 메시지들, 다음 사용자 입력) 쌍을 뽑아 두 방식으로 판단하고
+- 로컬 판단 비율 (나머지는 LLM 으로 넘어감)
+- 로컬이 판단한 쌍에서 LLM 과의 일치율, 혼동 행렬
+- 지연 시간 (로컬 평균/최대, LLM p50/p95)
+을 출력합니다. 임계값을 바꿔 보며 조정할 때 씁니다.
+
+실행: python -m app.jobs.topic_shift_benchmark [--pairs 200] [--new-below 0.02] [--same-above 0.2]
+"""
+import time
+import asyncio
+import argparse
+import statistics
+from collections import Counter
+import psycopg2
+from app.core.config import DB_CONFIG, TOPIC_NEW_BELOW, TOPIC_SAME_ABOVE, TOPIC_HISTORY_TURNS
+from app.services.topic_shift import TopicShiftScorer, NEW_TOPIC, SAME_TOPIC
+
+
+def load_pairs(conn, pair_count: int, history_turns: int) -> list:
+    """세션 안에서 앞선 메시지가 있는 사용자 발화마다 (최근 메시지 목록, 발화) 쌍을 만듭니다."""
+    pairs = []
+    with conn.cursor(name="topic_shift_pairs") as cursor:
+        cursor.itersize = 2000
+        cursor.execute("""
+            SELECT session_id, role, content
+            FROM talk
+            WHERE category = 'LIFESTYLEHABIT' AND session_id IS NOT NULL
+            ORDER BY session_id, created_at, id
+        """)
+        current_session, recent = None, []
+        for session_id, role, content in cursor:
+            if session_id != current_session:
+                current_session, recent = session_id, []
+            if role == 'user' and recent:
+                pairs.append(([(msg_role, msg) for msg_role, msg in recent[-history_turns:]], content))
+                if len(pairs) >= pair_count:
+                    break
+            recent.append(('human' if role == 'user' else 'ai', content))
+    conn.rollback()
+    return pairs
+
+
+def _percentile(values: list, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+async def run_benchmark(topic_check_chain, pairs: list, scorer: TopicShiftScorer) -> dict:
+    confusion = Counter()   # (로컬 판단, LLM 판단) -> 횟수
+    local_us, llm_ms = [], []
+
+    for recent, user_input in pairs:
+        started = time.perf_counter()
+        decision, _ = scorer.decide([content for _, content in recent], user_input)
+        local_us.append((time.perf_counter() - started) * 1_000_000)
+
+        history_str = "\n".join([f"{msg_type}: {content}" for msg_type, content in recent])
+        started = time.perf_counter()
+        llm_result = await topic_check_chain.ainvoke({"history": history_str, "input": user_input})
+        llm_ms.append((time.perf_counter() - started) * 1000)
+        llm_decision = NEW_TOPIC if NEW_TOPIC in llm_result else SAME_TOPIC
+
+        confusion[(decision or "LLM", llm_decision)] += 1
+
+    decided = sum(count for (local, _), count in confusion.items() if local != "LLM")
+    agreed = confusion[(SAME_TOPIC, SAME_TOPIC)] + confusion[(NEW_TOPIC, NEW_TOPIC)]
+    return {
+        "pairs": len(pairs),
+        "decided": decided,
+        "agreement": agreed / decided if decided else 0.0,
+        "confusion": confusion,
+        "local_avg_us": statistics.mean(local_us) if local_us else 0.0,
+        "local_max_us": max(local_us) if local_us else 0.0,
+        "llm_p50_ms": _percentile(llm_ms, 0.5),
+        "llm_p95_ms": _percentile(llm_ms, 0.95),
+    }
+
+
+def print_report(report: dict):
+    total = report["pairs"]
+    print(f"비교한 쌍: {total}")
+    print(f"- 로컬 판단: {report['decided']}건 ({report['decided'] / total:.1%}), 나머지는 LLM 으로 넘어감" if total else "- 비교할 쌍이 없습니다.")
+    print(f"- LLM 과의 일치율(로컬 판단분): {report['agreement']:.1%}")
+    print("- 혼동 행렬 (로컬 -> LLM):")
+    for local in (SAME_TOPIC, NEW_TOPIC, "LLM"):
+        row = ", ".join(f"{llm}={report['confusion'][(local, llm)]}" for llm in (SAME_TOPIC, NEW_TOPIC))
+        print(f"    {local:<10} {row}")
+    print(f"- 지연 시간: 로컬 평균 {report['local_avg_us']:.0f}µs / 최대 {report['local_max_us']:.0f}µs, "
+          f"LLM p50 {report['llm_p50_ms']:.0f}ms / p95 {report['llm_p95_ms']:.0f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="로컬 주제 전환 판단과 LLM 판단 비교")
+    parser.add_argument("--pairs", type=int, default=200, help="비교할 (대화, 입력) 쌍 수")
+    parser.add_argument("--new-below", type=float, default=TOPIC_NEW_BELOW)
+    parser.add_argument("--same-above", type=float, default=TOPIC_SAME_ABOVE)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        pairs = load_pairs(conn, args.pairs, TOPIC_HISTORY_TURNS)
+    finally:
+        conn.close()
+
+    # 모델과 DB 커넥션 풀을 띄우므로 데이터를 읽은 뒤에 불러옵니다.
+    from app.services.chatbot_system import chatbot_system
+
+    scorer = TopicShiftScorer(new_below=args.new_below, same_above=args.same_above)
+    try:
+        report = await run_benchmark(chatbot_system.conversation_logic.topic_check_chain, pairs, scorer)
+    finally:
+        chatbot_system.db_manager.close()
+    print_report(report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
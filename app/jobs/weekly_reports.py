@@ -0,0 +1,91 @@
+"""지난주 관계 조언 리포트(weekly_reports)를 한가한 시간대에 미리 만들어 두는 일괄 작업.
+
+지난주 분석 기록이 있는 프로필마다 리포트를 생성하며, LLM 에는 동시에 WEEKLY_REPORT_CONCURRENCY 개까지만 요청합니다.
+프로필별 진행 상황은 weekly_report_runs 에 남기므로, 중간에 멈춰도 다시 실행하면 끝나지 않은 프로필부터 이어서 생성합니다.
+
+실행: python -m app.jobs.weekly_reports [--week YYYY-MM-DD] [--concurrency N]
+  --week 를 생략하면 지난주(월요일 시작)를 대상으로 합니다.
+예) 매주 월요일 새벽 3시 cron: 0 3 * * 1 cd /srv/gguro && python -m app.jobs.weekly_reports
+"""
+import sys
+import time
+import asyncio
+import argparse
+from datetime import date, timedelta
+from app.core import time_range
+from app.core.config import WEEKLY_REPORT_CONCURRENCY
+
+
+async def _generate_one(advisor, profile_id: int, start_date: date, end_date: date, semaphore: asyncio.Semaphore):
+    db_manager = advisor.db_manager
+    async with semaphore:
+        existing_report = await db_manager._run_sync(advisor.get_weekly_report_from_db, profile_id, start_date)
+        if existing_report:
+            await db_manager._run_sync(advisor.record_report_run, profile_id, start_date, 'done')
+            return 'done'
+
+        # API 요청이나 다른 작업이 이미 생성 중이면 건너뛰고, 다음 실행 때 결과를 확인합니다.
+        claimed = await db_manager._run_sync(advisor.claim_report_generation, profile_id, start_date)
+        if not claimed:
+            return 'in_progress'
+        try:
+            advice = await advisor.generate_weekly_report(profile_id, start_date, end_date)
+        except Exception as e:
+            print(f"❌ 주간 리포트 생성 실패 (profile_id: {profile_id}): {e}")
+            await db_manager._run_sync(advisor.record_report_run, profile_id, start_date, 'failed', str(e))
+            return 'failed'
+
+        status = 'done' if advice is not None else 'skipped'
+        await db_manager._run_sync(advisor.record_report_run, profile_id, start_date, status)
+        return status
+
+
+async def generate_weekly_reports(advisor, start_date: date, concurrency: int = WEEKLY_REPORT_CONCURRENCY) -> dict:
+    """start_date 로 시작하는 주의 리포트를 아직 끝나지 않은 프로필에 대해 생성하고, 상태별 프로필 수를 반환합니다."""
+    db_manager = advisor.db_manager
+    end_date = start_date + timedelta(days=7)
+
+    profile_ids = await db_manager._run_sync(db_manager.get_active_profile_ids, start_date, end_date)
+    finished = await db_manager._run_sync(advisor.get_finished_profile_ids, start_date)
+    pending = [profile_id for profile_id in profile_ids if profile_id not in finished]
+    print(f"[주간 리포트] {start_date} 주차: 대상 {len(profile_ids)}명, 이미 완료 {len(profile_ids) - len(pending)}명, 생성 {len(pending)}명")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results = await asyncio.gather(*[
+        _generate_one(advisor, profile_id, start_date, end_date, semaphore) for profile_id in pending
+    ])
+
+    summary = {"done": 0, "skipped": 0, "failed": 0, "in_progress": 0}
+    for status in results:
+        summary[status] += 1
+    return summary
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="지난주 관계 조언 리포트 일괄 생성")
+    parser.add_argument("--week", type=date.fromisoformat, help="대상 주의 시작일 (YYYY-MM-DD, 기본: 지난주 월요일)")
+    parser.add_argument("--concurrency", type=int, default=WEEKLY_REPORT_CONCURRENCY, help="동시 생성 수")
+    args = parser.parse_args(argv)
+
+    # 모델과 DB 커넥션 풀을 띄우므로 인자 확인 뒤에 불러옵니다.
+    from app.services.chatbot_system import chatbot_system
+    from app.services.relationship_advisor import RelationshipAdvisor
+
+    start_date = time_range.week_start(args.week) if args.week else time_range.last_week_dates()[0]
+    started = time.monotonic()
+    try:
+        # 일괄 생성은 batch 등급으로 호출해서, 같은 프로세스의 다른 LLM 호출보다 뒤로 미룹니다.
+        # 이 프로세스에는 실시간 요청이 없으므로 실시간 응답용 자리를 남겨 두지 않습니다.
+        chatbot_system.llm_dispatcher.interactive_reserved = 0
+        advisor = RelationshipAdvisor(chatbot_system.batch_model, chatbot_system.db_manager)
+        summary = await generate_weekly_reports(advisor, start_date, args.concurrency)
+    finally:
+        await chatbot_system.db_manager.talk_writer.flush()
+        chatbot_system.db_manager.close()
+        await chatbot_system.llm_pool.close()
+    print(f"[주간 리포트] 완료 {summary['done']}명, 기록 없음 {summary['skipped']}명, 실패 {summary['failed']}명, 다른 곳에서 생성 중 {summary['in_progress']}명 ({time.monotonic() - started:.1f}초)")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,146 @@
+"""작업 큐(jobs 테이블) 워커.
+
+API 는 응답을 보낸 뒤의 대화 저장·발화 분석을 jobs 에 넣기만 하고, 이 워커가 가져가서 처리합니다.
+- save_conversation: 발화 감정/키워드 분석 후 talk 저장 (요약문이 더 필요하면 analyze_talk 를 다시 등록)
+- analyze_talk: 발화 하나의 요약문/핵심 단어를 만들어 analysis 와 일간 집계에 저장
+워커는 여러 개 띄워도 되고(FOR UPDATE SKIP LOCKED 로 나눠 가져감), 실패한 작업은 점점 길게 기다렸다가
+JOB_MAX_ATTEMPTS 번까지 다시 시도한 뒤 dead 로 남깁니다. 처리가 끝난 뒤 완료 기록 전에 워커가 죽으면
+그 작업은 한 번 더 처리될 수 있습니다. (최소 한 번 처리) 대화 저장은 작업 id 로, 분석 저장은 talk id 로 중복을 막습니다.
+
+실행: python -m app.jobs.worker [--concurrency N] [--kinds save_conversation,analyze_talk]
+      python -m app.jobs.worker --requeue-dead [--kinds ...]   # dead 작업을 다시 대기열에 넣고 종료
+  SIGINT/SIGTERM 을 받으면 새 작업을 가져오지 않고, 처리 중인 작업을 마친 뒤 종료합니다.
+"""
+import sys
+import signal
+import asyncio
+import argparse
+from app.core.config import JOB_WORKER_CONCURRENCY, JOB_POLL_INTERVAL, JOB_LEASE_SECONDS
+
+
+def build_handlers(db_manager) -> dict:
+    """작업 종류 -> async (payload, job_id) 처리 함수. 예외를 올리면 실패로 기록되어 재시도됩니다."""
+    async def save_conversation(payload: dict, job_id: int):
+        # 다시 배달돼도 같은 턴을 두 번 저장하지 않도록 작업 id 를 talk 행에 남깁니다.
+        if await db_manager.save_conversation_to_db(**payload, job_id=job_id) is None:
+            raise RuntimeError("대화 저장 실패")
+
+    async def analyze_talk(payload: dict, job_id: int):
+        await db_manager.analyze_talk(**payload)
+
+    return {"save_conversation": save_conversation, "analyze_talk": analyze_talk}
+
+
+class JobWorker:
+    def __init__(self, job_queue, handlers: dict, concurrency: int, poll_interval: float):
+        self.job_queue = job_queue
+        self.handlers = handlers
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.counts = {"done": 0, "retry": 0, "dead": 0}
+        self._tasks = {}          # 처리 태스크 -> job id
+
+    async def _process(self, job: dict):
+        run_sync = self.job_queue.db_manager._run_sync
+        job_id, kind = job["id"], job["kind"]
+        try:
+            if job["attempts"] > job["max_attempts"]:
+                # 처리하던 워커가 매번 죽어 선점이 만료된 작업은 더 실행하지 않습니다.
+                raise RuntimeError("처리 중 선점이 만료되어 최대 시도 횟수를 넘김")
+            await self.handlers[kind](job["payload"], job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status = await run_sync(self.job_queue.fail, job_id, f"{type(e).__name__}: {e}")
+            if status == 'dead':
+                self.counts["dead"] += 1
+                print(f"❌ 작업 포기 ({kind} #{job_id}, {job['attempts']}회 실패): {e}")
+            else:
+                self.counts["retry"] += 1
+                print(f"[오류] 작업 실패, 나중에 다시 시도 ({kind} #{job_id}, {job['attempts']}/{job['max_attempts']}): {e}")
+            return
+        await run_sync(self.job_queue.complete, job_id)
+        self.counts["done"] += 1
+
+    async def run(self, stop: asyncio.Event):
+        run_sync = self.job_queue.db_manager._run_sync
+        while not stop.is_set():
+            free = self.concurrency - len(self._tasks)
+            jobs = await run_sync(self.job_queue.claim, free, list(self.handlers)) if free > 0 else []
+            for job in jobs:
+                task = asyncio.create_task(self._process(job))
+                self._tasks[task] = job["id"]
+                task.add_done_callback(lambda done: self._tasks.pop(done, None))
+            if jobs and len(jobs) == free:
+                continue  # 큐에 더 있을 수 있으니, 자리가 나는 대로 바로 가져옵니다.
+
+            # 자리가 없으면 작업이 끝날 때까지, 큐가 비었으면 poll_interval 만큼 기다립니다.
+            stop_wait = asyncio.ensure_future(stop.wait())
+            if free > 0:
+                await asyncio.wait({stop_wait}, timeout=self.poll_interval)
+            else:
+                await asyncio.wait({stop_wait, *self._tasks}, return_when=asyncio.FIRST_COMPLETED)
+            stop_wait.cancel()
+
+    async def drain(self, timeout: float):
+        """처리 중인 작업을 timeout 초까지 기다리고, 끝나지 않은 작업은 다른 워커가 바로 가져가게 합니다."""
+        pending = dict(self._tasks)
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        unfinished = [job_id for task, job_id in pending.items() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if unfinished:
+            print(f"[정보] 끝내지 못한 작업 {len(unfinished)}개를 대기열로 되돌립니다.")
+            await self.job_queue.db_manager._run_sync(self.job_queue.release, unfinished)
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="작업 큐 워커")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY, help="동시에 처리하는 작업 수")
+    parser.add_argument("--kinds", help="처리할 작업 종류 (쉼표로 구분, 기본: 전부)")
+    parser.add_argument("--requeue-dead", action="store_true", help="dead 작업을 다시 대기열에 넣고 종료")
+    parser.add_argument("--shutdown-timeout", type=float, default=min(JOB_LEASE_SECONDS, 30), help="종료할 때 처리 중인 작업을 기다리는 시간(초)")
+    args = parser.parse_args(argv)
+
+    # 모델과 DB 커넥션 풀을 띄우므로 인자 확인 뒤에 불러옵니다.
+    from app.services.chatbot_system import chatbot_system
+    db_manager = chatbot_system.db_manager
+    # 워커 프로세스에는 실시간 요청이 없으므로 실시간 응답용 자리를 남겨 두지 않습니다.
+    chatbot_system.llm_dispatcher.interactive_reserved = 0
+
+    handlers = build_handlers(db_manager)
+    if args.kinds:
+        kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in handlers]
+        if unknown:
+            parser.error(f"알 수 없는 작업 종류: {', '.join(unknown)} (가능: {', '.join(handlers)})")
+        handlers = {kind: handlers[kind] for kind in kinds}
+
+    try:
+        if args.requeue_dead:
+            kinds = list(handlers) if args.kinds else [None]
+            count = sum([await db_manager._run_sync(db_manager.job_queue.requeue_dead, kind) for kind in kinds])
+            print(f"[작업 큐] dead 작업 {count}개를 다시 대기열에 넣었습니다.")
+            return 0
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        worker = JobWorker(db_manager.job_queue, handlers, args.concurrency, JOB_POLL_INTERVAL)
+        print(f"[작업 큐] 워커 시작: {', '.join(handlers)} (동시 처리 {worker.concurrency}개)")
+        await worker.run(stop)
+        print("[작업 큐] 종료 요청을 받아 처리 중인 작업을 마무리합니다.")
+        await worker.drain(args.shutdown_timeout)
+        print(f"[작업 큐] 완료 {worker.counts['done']}개, 재시도 예정 {worker.counts['retry']}개, 포기 {worker.counts['dead']}개")
+    finally:
+        await db_manager.talk_writer.flush()
+        db_manager.close()
+        await chatbot_system.llm_pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
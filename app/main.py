@@ -1,4 +1,3 @@
-
 from fastapi import FastAPI
 from app.api.router import api_router
 from app.services.chatbot_system import chatbot_system # This will initialize the system
@@ -7,6 +6,18 @@ app = FastAPI(title="꾸로 API (모듈 분리 버전)")
 
 app.include_router(api_router)
 
+@app.on_event("startup")
+async def start_background_workers():
+    # 이전 프로세스가 끝내지 못한 채팅방 요약을 이어서 처리합니다.
+    chatbot_system.db_manager.room_closer.start()
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    await chatbot_system.db_manager.talk_writer.flush()
+    await chatbot_system.db_manager.room_closer.stop()
+    chatbot_system.db_manager.close()
+    await chatbot_system.llm_pool.close()
+
 @app.get("/", summary="루트 경로 확인")
 def read_root():
     return {"Hello": "Welcome to Gguro Chatbot API"}
\ No newline at end of file
@@ -18,6 +18,7 @@ SUMMARIZATION_PROMPT_TEMPLATE = """
 1. '안녕하세요', '안녕' 같은 단순 인삿말이나, 같은 말을 반복하는 부분은 반드시 제외해야 합니다.
 2. 대화의 흐름을 단순히 순서대로 나열하는 것이 아니라, 대화의 핵심 주제나 목적을 파악해야 합니다.
 3. 요약 결과 외에 다른 설명은 절대로 붙이지 마세요.
+4. [지금까지의 요약]이 있으면 그 내용과 [실제 대화 내용]을 합쳐, 대화 전체의 핵심 주제를 다시 한 문장으로 요약하세요.
 
 ---
 [예시 1 - 좋은 요약]
@@ -34,14 +35,41 @@ human: 안녕
 bot: 안녕! 만나서 반가워.
 user: 오늘 기분이 어때?
 [요약]: 안녕하세요 라고 인사하고 기분을 물어봄 (X - 핵심이 없음)
+
+[예시 3 - 이어서 요약]
+[지금까지의 요약]: 엄마에게 청소를 안 해서 혼난 일에 대해 이야기함
+[대화 내용]:
+human: 그래서 내일은 방 청소 먼저 하기로 했어
+ai: 멋진 생각이야! 엄마도 기뻐하실 거야.
+[요약]: 청소를 안 해서 엄마에게 혼난 뒤 내일은 청소를 먼저 하기로 다짐함
 ---
 
+[지금까지의 요약]: {summary}
 [실제 대화 내용]:
 {history}
 ---
 [요약]:
 """
 
+# --- 대화 기억(지난 대화 요약) 갱신 프롬프트 ---
+MEMORY_SUMMARY_PROMPT_TEMPLATE = """당신은 아이와 AI 의 긴 대화를 다음 대화에 이어 쓸 수 있도록 정리하는 도우미입니다.
+[지금까지의 요약]에 [이어진 대화]의 내용을 합쳐 새 요약을 만드세요.
+
+[규칙]
+1. 대화를 이어가는 데 필요한 것(아이가 말한 일과 감정, 아이와 한 약속, 역할놀이 속 설정과 사건)만 남기세요.
+2. '안녕' 같은 인삿말이나 같은 말을 반복하는 부분은 빼고, 5문장 이내로 쓰세요.
+3. 아이가 한 말과 AI 가 한 말을 구분해서 쓰세요.
+4. 요약 외에 다른 설명은 절대로 붙이지 마세요.
+
+[지금까지의 요약]:
+{summary}
+
+[이어진 대화]:
+{history}
+---
+[새 요약]:
+"""
+
 
 # --- 퀴즈 채점 프롬프트 ---
 QUIZ_EVAL_SYSTEM_PROMPT = """당신은 아이의 답변을 채점하는, 감정이 배제된 극도로 정교하고 논리적인 AI 시스템입니다.
@@ -258,4 +286,36 @@ ANALYSIS_PROMPT_TEMPLATE = """당신은 주어진 텍스트에서 사용자의 
 ---
 분석할 텍스트:
 {text}
----"""
\ No newline at end of file
+---"""
+
+# --- 감정/키워드 판단과 단일 대화 분석을 한 번에 하는 프롬프트 ---
+COMBINED_TALK_ANALYSIS_PROMPT = """당신은 아동의 대화 내용을 분석하는 전문가입니다.
+주어진 텍스트의 감정을 [긍정], [부정], [일반] 세 가지로 판단하고 키워드를 추출하세요.
+긍정이나 부정이면, 아이가 어떤 핵심 단어 때문에 그렇게 반응했는지 요약문과 핵심 단어도 함께 출력하세요. 일반이면 요약문과 핵심 단어는 '없음'으로 출력하세요.
+**핵심 단어는 반드시 명사 형태로 추출해야 합니다.** (예: "양치하기 싫어" -> "양치")
+반드시 아래 예시와 같은 네 줄 형식으로만 출력하고, 다른 말은 덧붙이지 마세요.
+
+[예시 1]
+분석할 텍스트: 오늘 강아지랑 산책해서 너무 신나!
+[판단: 긍정]
+[키워드: 강아지, 산책, 신나]
+[요약문]: 아이는 '산책'에 대해 긍정적인 반응을 보였어요.
+[핵심 단어]: 산책
+---
+[예시 2]
+분석할 텍스트: 양치하기 싫어
+[판단: 부정]
+[키워드: 양치, 싫어]
+[요약문]: 아이는 '양치'에 대해 부정적인 반응을 보였어요.
+[핵심 단어]: 양치
+---
+[예시 3]
+분석할 텍스트: 오늘 날씨는 어때?
+[판단: 일반]
+[키워드: 오늘, 날씨]
+[요약문]: 없음
+[핵심 단어]: 없음
+---
+분석할 텍스트:
+{text}
+---"""
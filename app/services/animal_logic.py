@@ -3,6 +3,8 @@ import asyncio
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from app.db.database import DatabaseManager
+from app.services.answer_matcher import match_answer, grading_metrics
+from app.services.grading_cache import GradingCache, grading_version, parse_verdict
 from app.prompts.prompts import ANIMAL_QUIZ_EVAL_SYSTEM_PROMPT, ANIMAL_QUIZ_EVAL_FEW_SHOTS # 안전 퀴즈의 평가 프롬프트 재사용
 
 class AnimalQuizLogic:
@@ -11,6 +13,9 @@ class AnimalQuizLogic:
         self.db_manager = db_manager
         self.quizzes_by_animal = self._load_quiz_data("rag_data/animal_quiz_data.txt")
         self.quiz_eval_chain = self._create_quiz_eval_chain()
+        self.grading_cache = GradingCache(
+            db_manager, 'animal', grading_version(ANIMAL_QUIZ_EVAL_SYSTEM_PROMPT, ANIMAL_QUIZ_EVAL_FEW_SHOTS, getattr(model, 'model', ''))
+        )
 
     def _load_quiz_data(self, file_path):
         quizzes_by_animal = {}
@@ -44,6 +49,26 @@ class AnimalQuizLogic:
         except Exception as e: 
             print(f"[오류] 동물 퀴즈 채점 체인 생성 실패: {e}"); return None
 
+    async def _grade(self, question: str, answer: str, user_input: str) -> bool:
+        # 정답과 확실히 같거나 다른 답변은 규칙으로 바로 채점하고, 이미 채점한 답변은 캐시에서 꺼내고, 나머지만 LLM 에 맡깁니다.
+        verdict = match_answer(answer, user_input)
+        if verdict is not None:
+            grading_metrics.record('animal', 'fast_correct' if verdict else 'fast_incorrect')
+            return verdict
+        verdict = await self.grading_cache.get(question, answer, user_input)
+        if verdict is not None:
+            grading_metrics.record('animal', 'cache_hit')
+            return verdict
+        grading_metrics.record('animal', 'llm')
+        eval_result_text = await self.quiz_eval_chain.ainvoke({"answer": answer, "user_input": user_input})
+        verdict = parse_verdict(eval_result_text)
+        if verdict is None:
+            # 판단이 없는 출력은 이번 턴만 오답으로 처리하고, 캐시에는 남기지 않습니다.
+            print(f"[경고] 동물 퀴즈 채점 출력에서 판단을 찾지 못했습니다: {eval_result_text[-80:]!r}")
+            return False
+        await self.grading_cache.set(question, answer, user_input, verdict)
+        return verdict
+
     async def talk(self, req: dict, user_id: int, profile_id: int):
         user_input = req['user_input']
         session_id = req['session_id']
@@ -77,8 +102,7 @@ class AnimalQuizLogic:
 
         # 퀴즈 진행 (답변 처리)
         current_q = quiz_state['questions'][quiz_state['current_step']]
-        eval_result_text = await self.quiz_eval_chain.ainvoke({"answer": current_q['정답'], "user_input": user_input})
-        is_correct = "[판단: 참]" in eval_result_text
+        is_correct = await self._grade(current_q['질문'], current_q['정답'], user_input)
 
         if is_correct:
             quiz_state['score'] += 1
@@ -0,0 +1,157 @@
+"""퀴즈 답변을 LLM 없이 바로 채점하는 규칙 기반 채점기.
+
+정답 문자열과 비교해 확실한 경우에만 참/거짓을 돌려주고, 애매하면 None 을 돌려 LLM 채점(quiz_eval_chain)에 맡깁니다.
+- 참: 정답(괄호 속 다른 표현 포함)과 같거나, 답변이 정답에 '정답은', '그거' 같은 군말만 붙인 것이거나,
+      오타 수준의 자모 차이만 있거나, 문장형 정답의 핵심 단어를 거의 다 말한 경우
+      (정답을 포함해도 부정 표현("고기 아니야")이나 다른 내용("고양이 아니고 사자")이 있으면 LLM 에 맡깁니다)
+- 거짓: "몰라" 같은 포기 답변, 또는 짧은 정답에 대해 짧게 답했는데 전혀 다른 말인 경우
+"""
+import re
+import functools
+import threading
+from collections import Counter
+from app.services.korean_text import normalize, tokenize, strip_particle, strip_ending, jamo_distance_ratio
+
+# 문장형 정답에서 핵심 단어로 보지 않는 말
+STOPWORDS = {"해야", "한다", "하다", "해", "있다", "있", "것", "수", "때문", "더", "잘", "가장", "아주", "이다", "되", "하", "그", "이"}
+# '안전', '말하다' 같은 말을 부정으로 잘못 보지 않도록 단어 단위/활용형으로만 찾습니다.
+NEGATION_TOKENS = {"안", "못"}
+NEGATION_PREFIXES = ("안되", "안돼", "안된", "못하", "못해")
+NEGATION_PARTS = ("않", "없", "말아", "말고", "마세", "아니", "아냐", "아닌", "아님")
+GIVE_UP_ANSWERS = {"몰라", "모르겠어", "모르겠어요", "몰라요", "모름", "글쎄", "패스", "다음"}
+# 정답 앞뒤에 붙어도 내용이 달라지지 않는 군말 (조사·어미를 뗀 형태)
+FILLER_STEMS = {"정답", "답", "그거", "그건", "이거", "이건", "저거", "음", "어", "아마", "내", "생각", "같"}
+
+FUZZY_MIN_SYLLABLES = 3       # 이보다 짧은 정답은 오타 허용 없이 정확히 맞아야 정답
+FUZZY_MAX_RATIO = 0.15        # 자모 편집 거리 비율이 이 이하면 오타로 보고 정답
+COVERAGE_CORRECT = 0.75       # 문장형 정답의 핵심 단어를 이 비율 이상 말하면 정답
+SHORT_ANSWER_MAX_TOKENS = 2   # 정답과 답변이 모두 이 이하 단어면 '짧은 정답'으로 봄
+SHORT_WRONG_MIN_RATIO = 0.7   # 짧은 정답인데 자모 편집 거리 비율이 이 이상이면 오답
+
+_PAREN_PATTERN = re.compile(r"\(([^)]*)\)")
+
+
+def _compact(text: str) -> str:
+    return "".join(strip_particle(token) for token in tokenize(text))
+
+
+def answer_variants(answer: str) -> list:
+    """'푹신한 젤리 (발바닥 패드)' -> ['푹신한 젤리', '발바닥 패드']"""
+    variants = [_PAREN_PATTERN.sub(" ", answer)] + _PAREN_PATTERN.findall(answer)
+    return [variant.strip() for variant in variants if tokenize(variant)]
+
+
+@functools.lru_cache(maxsize=4096)
+def _prepared_answer(answer: str) -> tuple:
+    """정답 문자열은 퀴즈 데이터에 고정되어 있으므로 표현별 (압축형, 핵심 단어, 부정 여부, 단어 수) 를 한 번만 계산합니다."""
+    return tuple(
+        (_compact(variant), content_stems(variant), _has_negation(variant), len(tokenize(variant)))
+        for variant in answer_variants(answer)
+    )
+
+
+def content_stems(text: str) -> list:
+    stems = []
+    for token in tokenize(text):
+        stem = strip_ending(strip_particle(token))
+        if stem and stem not in STOPWORDS and stem not in stems:
+            stems.append(stem)
+    return stems
+
+
+def _stem_matches(answer_stem: str, input_stems: list) -> bool:
+    # 어미가 달라도 앞 두 글자가 같으면 같은 말로 봅니다. ('기다려야' / '기다릴게' -> '기다')
+    prefix = answer_stem[:2]
+    return any(stem.startswith(prefix) for stem in input_stems)
+
+
+def _has_negation(text: str) -> bool:
+    return any(
+        token in NEGATION_TOKENS or token.startswith(NEGATION_PREFIXES) or any(part in token for part in NEGATION_PARTS)
+        for token in tokenize(text)
+    )
+
+
+def _has_extra_content(compact_variant: str, normalized_input: str) -> bool:
+    """답변에 정답 표현과 군말 말고 다른 단어가 있는지 확인합니다. ('소고기', '고양이 아니고 사자')"""
+    for token in tokenize(normalized_input):
+        # 정답 쪽 압축형도 조사처럼 보이는 끝 글자를 뗀 것이라('고양이' -> '고양'), 한 번 더 뗀 형태까지 봅니다.
+        once = strip_particle(token)
+        twice = strip_particle(once)
+        forms = {token, once, twice, strip_ending(once), strip_ending(twice)}
+        if not any(form in compact_variant or form in FILLER_STEMS for form in forms):
+            return True
+    return False
+
+
+def match_answer(answer: str, user_input: str):
+    """True(정답) / False(오답) / None(애매해서 LLM 채점 필요)"""
+    normalized_input = normalize(user_input)
+    compact_input = _compact(normalized_input)
+    if not compact_input or normalized_input.replace(" ", "") in GIVE_UP_ANSWERS:
+        return False
+
+    variants = _prepared_answer(answer)
+    input_negated = _has_negation(normalized_input)
+    for compact_variant, _, variant_negated, _ in variants:
+        if not compact_variant:
+            continue
+        if input_negated != variant_negated:
+            # 정답을 말하면서 부정했거나("고기 아니야") 부정형 정답을 긍정으로 말한 경우는 LLM 이 판단합니다.
+            continue
+        if compact_variant in compact_input:
+            if _has_extra_content(compact_variant, normalized_input):
+                continue
+            return True
+        # 길이 차이만으로도 허용 거리를 넘으면 편집 거리를 계산하지 않습니다.
+        longest = max(len(compact_variant), len(compact_input))
+        if (len(compact_variant) >= FUZZY_MIN_SYLLABLES and abs(len(compact_variant) - len(compact_input)) <= FUZZY_MAX_RATIO * longest
+                and jamo_distance_ratio(compact_variant, compact_input) <= FUZZY_MAX_RATIO):
+            return True
+
+    # 문장형 정답: 핵심 단어를 대부분 말했고 부정 표현 여부가 같으면 정답
+    input_stems = content_stems(normalized_input)
+    for _, answer_stems, answer_negated, _ in variants:
+        if len(answer_stems) < 2:
+            continue
+        covered = sum(1 for stem in answer_stems if _stem_matches(stem, input_stems))
+        if covered / len(answer_stems) >= COVERAGE_CORRECT and answer_negated == input_negated:
+            return True
+
+    # 짧은 정답(동물 퀴즈 등)에 짧게 답했는데 어느 표현과도 전혀 비슷하지 않으면 오답
+    if len(tokenize(normalized_input)) <= SHORT_ANSWER_MAX_TOKENS and all(
+        token_count <= SHORT_ANSWER_MAX_TOKENS for _, _, _, token_count in variants
+    ):
+        if all(jamo_distance_ratio(compact_variant, compact_input) >= SHORT_WRONG_MIN_RATIO for compact_variant, _, _, _ in variants):
+            return False
+    return None
+
+
+class GradingMetrics:
+    """퀴즈 종류별로 규칙 채점(fast path)으로 끝난 비율을 셉니다."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, quiz_type: str, outcome: str):
+        """outcome: fast_correct / fast_incorrect / cache_hit / llm"""
+        with self._lock:
+            self._counts[(quiz_type, outcome)] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+        result = {}
+        for (quiz_type, outcome), count in counts.items():
+            result.setdefault(quiz_type, {})[outcome] = count
+        for stats in result.values():
+            total = sum(stats.values())
+            fast = stats.get("fast_correct", 0) + stats.get("fast_incorrect", 0)
+            stats["total"] = total
+            stats["fast_path_hit_rate"] = round(fast / total, 4) if total else 0.0
+            stats["llm_avoided_rate"] = round((fast + stats.get("cache_hit", 0)) / total, 4) if total else 0.0
+        return result
+
+
+grading_metrics = GradingMetrics()
@@ -1,5 +1,9 @@
-from langchain_ollama import ChatOllama
-from app.core.config import MODEL_NAME
+from app.core.config import (
+    MODEL_NAME, LLM_MAX_CONCURRENCY, LLM_INTERACTIVE_CONCURRENCY, LLM_BACKGROUND_CONCURRENCY, LLM_BATCH_CONCURRENCY, LLM_INTERACTIVE_RESERVED,
+    OLLAMA_BACKENDS, OLLAMA_BACKEND_CONCURRENCY, OLLAMA_HEALTH_INTERVAL, OLLAMA_FAILURE_COOLDOWN
+)
+from app.services.llm_dispatcher import LLMDispatcher, INTERACTIVE, BACKGROUND, BATCH
+from app.services.llm_pool import LLMBackendPool, parse_backends
 from app.db.database import DatabaseManager
 from app.services.conversation_logic import ConversationLogic
 from app.services.roleplay_logic import RolePlayLogic
@@ -21,8 +25,21 @@ class ChatbotSystem:
             return
         
         print("챗봇 시스템 로딩 시작")
-        self.model = ChatOllama(model="timhan/llama3korean8b4qkm")
-        self.db_manager = DatabaseManager(self.model)
+        # OLLAMA_BACKENDS 의 여러 Ollama 서버 중 가장 한가한 곳으로 보내고, 실패하면 다른 서버로 넘깁니다.
+        self.llm_pool = LLMBackendPool(
+            MODEL_NAME, parse_backends(OLLAMA_BACKENDS, OLLAMA_BACKEND_CONCURRENCY),
+            health_interval=OLLAMA_HEALTH_INTERVAL, failure_cooldown=OLLAMA_FAILURE_COOLDOWN,
+        )
+        # 아이에게 바로 보여 줄 응답이 백그라운드 분석 뒤에 줄 서지 않도록 호출마다 우선순위를 붙입니다.
+        self.llm_dispatcher = LLMDispatcher(LLM_MAX_CONCURRENCY or self.llm_pool.max_concurrency, {
+            INTERACTIVE: LLM_INTERACTIVE_CONCURRENCY,
+            BACKGROUND: LLM_BACKGROUND_CONCURRENCY,
+            BATCH: LLM_BATCH_CONCURRENCY,
+        }, LLM_INTERACTIVE_RESERVED)
+        self.model = self.llm_dispatcher.bind(self.llm_pool, INTERACTIVE)
+        self.background_model = self.llm_dispatcher.bind(self.llm_pool, BACKGROUND)
+        self.batch_model = self.llm_dispatcher.bind(self.llm_pool, BATCH)
+        self.db_manager = DatabaseManager(self.background_model)
         self.conversation_logic = ConversationLogic(self.model, self.db_manager)
         self.roleplay_logic = RolePlayLogic(self.model, self.db_manager)
         self.quiz_logic = QuizLogic(self.model, self.db_manager)
@@ -2,6 +2,9 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from app.db.database import DatabaseManager
+from app.core.cache import TTLCache
+from app.core.config import PROFILE_CACHE_MAXSIZE, LOCAL_TOPIC_CHECK, TOPIC_HISTORY_TURNS
+from app.services.topic_shift import TopicShiftScorer, NEW_TOPIC
 from app.prompts.prompts import CONVERSATION_INSTRUCTION, TOPIC_CHECK_PROMPT_TEMPLATE
 # from app.db.profile_manager import get_profile_name -> 이 줄은 필요 없습니다.
 
@@ -12,9 +15,31 @@ class ConversationLogic:
         self.model = model
         self.db_manager = db_manager
         self.instruct_template = CONVERSATION_INSTRUCTION
+        self.system_prompt_cache = TTLCache(PROFILE_CACHE_MAXSIZE)
         self.topic_check_chain = self._create_topic_check_chain()
+        self.topic_scorer = TopicShiftScorer() if LOCAL_TOPIC_CHECK else None
         self.conversational_chain = self._setup_conversational_chain()
 
+    def _get_system_prompt(self, profile_name: str):
+        # 같은 이름에 대해서는 매 턴 포맷하지 않고 만들어 둔 프롬프트를 재사용합니다.
+        system_prompt_text = self.system_prompt_cache.get(profile_name)
+        if system_prompt_text is None:
+            system_prompt_text = self.instruct_template.format(profile_name=profile_name)
+            self.system_prompt_cache.set(profile_name, system_prompt_text)
+        return system_prompt_text
+
+    async def _is_new_topic(self, recent_messages: list, user_input: str) -> bool:
+        # 로컬 유사도로 확실히 판단되면 LLM 을 부르지 않습니다.
+        if self.topic_scorer:
+            decision, _ = self.topic_scorer.decide([msg.content for msg in recent_messages], user_input)
+            if decision is not None:
+                return decision == NEW_TOPIC
+        if not self.topic_check_chain:
+            return False
+        history_str = "\n".join([f"{msg.type}: {msg.content}" for msg in recent_messages])
+        topic_check_result = await self.topic_check_chain.ainvoke({"history": history_str, "input": user_input})
+        return NEW_TOPIC in topic_check_result
+
     def _create_topic_check_chain(self):
         try:
             prompt = ChatPromptTemplate.from_template(TOPIC_CHECK_PROMPT_TEMPLATE)
@@ -42,25 +67,24 @@ class ConversationLogic:
             print(f"[오류] 대화 체인 설정 중 문제 발생: {e}")
             return None
 
-    async def talk(self, req: dict, user_id: int, profile_id: int):
+    async def _prepare_turn(self, req: dict, profile_id: int):
+        """LLM 호출 직전까지의 준비를 합니다. (바로 끝낼 응답, 체인 호출 정보) 중 하나만 채워서 반환합니다."""
         user_input = req['user_input']
         session_id = req['session_id']
 
         # --- 여기가 수정된 핵심 부분입니다 ---
         # self.db_manager를 통해 프로필 이름을 조회합니다.
-        profile_name = self.db_manager.get_profile_name(profile_id)
-
-        print(profile_name)
+        profile_name = await self.db_manager.aget_profile_name(profile_id)
         
         if not profile_name:
             profile_name = "친구" # 조회 실패 시 기본값
 
-        system_prompt_text = self.instruct_template.format(profile_name=profile_name)
+        system_prompt_text = self._get_system_prompt(profile_name)
 
         if any(keyword in user_input for keyword in STOP_KEYWORDS):
             end_message = f"알겠어, {profile_name}! 대화를 종료할게. 다음에 또 이야기하자!"
             await self.db_manager.summarize_and_close_room(session_id)
-            return {"type": "end", "response": end_message}
+            return {"type": "end", "response": end_message}, None
 
         session_state = self.db_manager.store.setdefault(session_id, {})
         current_chatroom_id = session_state.get('chatroom_id')
@@ -68,29 +92,60 @@ class ConversationLogic:
 
         if not current_chatroom_id:
             current_chatroom_id = await self.db_manager.create_new_chatroom(session_id, profile_id, 'conversation')
-        elif history and history.messages:
-            history_str = "\n".join([f"{msg.type}: {msg.content}" for msg in history.messages[-4:]])
-            topic_check_result = await self.topic_check_chain.ainvoke({"history": history_str, "input": user_input})
-            if "NEW_TOPIC" in topic_check_result:
-                await self.db_manager.summarize_and_close_room(session_id)
-                current_chatroom_id = await self.db_manager.create_new_chatroom(session_id, user_id, profile_id, 'conversation')
+        elif history and history.window:
+            if await self._is_new_topic(history.window[-TOPIC_HISTORY_TURNS:], user_input):
+                # 이전 방은 create_new_chatroom 이 닫고, 요약은 백그라운드에서 기록됩니다.
+                current_chatroom_id = await self.db_manager.create_new_chatroom(session_id, profile_id, 'conversation')
         
         if not current_chatroom_id:
-            return {"type": "error", "response": "채팅방을 만들거나 찾는 데 문제가 발생했어요."}
+            return {"type": "error", "response": "채팅방을 만들거나 찾는 데 문제가 발생했어요."}, None
 
         if not self.conversational_chain:
-            return {"type": "error", "response": "챗봇 로직 초기화에 실패했습니다."}
+            return {"type": "error", "response": "챗봇 로직 초기화에 실패했습니다."}, None
+
+        turn = {
+            "chain_input": {"input": user_input, "system_prompt": system_prompt_text},
+            "config": {'configurable': {'session_id': session_id}},
+            "chatroom_id": current_chatroom_id,
+        }
+        return None, turn
+
+    async def talk(self, req: dict, user_id: int, profile_id: int):
+        early_result, turn = await self._prepare_turn(req, profile_id)
+        if early_result:
+            return early_result
             
         try:
-            response_text = await self.conversational_chain.ainvoke(
-                {"input": user_input, "system_prompt": system_prompt_text},
-                config={'configurable': {'session_id': session_id}}
-            )
+            response_text = await self.conversational_chain.ainvoke(turn["chain_input"], config=turn["config"])
             return {
                 "type": "continue",
                 "response": response_text,
-                "chatroom_id": current_chatroom_id
+                "chatroom_id": turn["chatroom_id"]
             }
         except Exception as e:
             print(f"[오류] 일상 대화 생성 중 문제 발생: {e}")
-            return {"type": "error", "response": "미안, 지금은 대답하기가 좀 힘들어."}
\ No newline at end of file
+            return {"type": "error", "response": "미안, 지금은 대답하기가 좀 힘들어."}
+
+    async def stream_talk(self, req: dict, user_id: int, profile_id: int):
+        """talk 의 스트리밍 버전. ("token", 조각) 을 생성되는 대로 내보내고, 마지막에 ("done", talk 와 같은 결과) 를 내보냅니다.
+        대화 기록은 스트림이 끝날 때 전체 응답으로 저장됩니다.
+        """
+        early_result, turn = await self._prepare_turn(req, profile_id)
+        if early_result:
+            yield "done", early_result
+            return
+
+        chunks = []
+        try:
+            async for chunk in self.conversational_chain.astream(turn["chain_input"], config=turn["config"]):
+                chunks.append(chunk)
+                yield "token", chunk
+        except Exception as e:
+            print(f"[오류] 일상 대화 스트리밍 중 문제 발생: {e}")
+            yield "done", {"type": "error", "response": "미안, 지금은 대답하기가 좀 힘들어."}
+            return
+        yield "done", {
+            "type": "continue",
+            "response": "".join(chunks),
+            "chatroom_id": turn["chatroom_id"]
+        }
@@ -0,0 +1,124 @@
+"""토큰 예산 안에서만 대화 기록을 프롬프트에 넣는 세션 기억.
+
+RunnableWithMessageHistory 는 history.messages 를 통째로 프롬프트에 넣으므로, 기록이 길어질수록
+프롬프트·Ollama prefill 시간·메모리가 함께 늘어납니다. BudgetedChatMessageHistory 는
+- 최근 메시지를 토큰 예산(token_budget) 안에서만 창(window)에 남기고
+- 창에서 밀려난 메시지는 백그라운드에서 '지난 대화 요약' 한 단락으로 접어 넣어
+프롬프트에는 항상 [지난 대화 요약 + 최근 메시지] 만 들어가게 합니다.
+전체 대화는 talk 테이블에 따로 저장되므로 메모리에는 창과 요약만 남깁니다.
+"""
+import asyncio
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import SystemMessage
+
+MESSAGE_OVERHEAD_TOKENS = 4   # 역할 헤더 등 메시지마다 붙는 토큰
+SUMMARY_PREFIX = "지난 대화 요약: "
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 어림한 토큰 수. 한글은 음절마다 1토큰, 나머지는 4글자마다 1토큰으로 셉니다."""
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def message_tokens(message) -> int:
+    return estimate_tokens(message.content if isinstance(message.content, str) else str(message.content)) + MESSAGE_OVERHEAD_TOKENS
+
+
+class BudgetedChatMessageHistory(BaseChatMessageHistory):
+    def __init__(self, token_budget: int, summarizer=None, min_recent: int = 2, on_add=None):
+        """
+        token_budget: 요약과 최근 메시지를 합쳐 프롬프트에 넣을 최대 토큰 수
+        summarizer: async (지금까지의 요약, 밀려난 메시지 목록) -> 새 요약. 없으면 밀려난 메시지는 버립니다.
+        min_recent: 예산을 넘더라도 남겨 둘 최근 메시지 수 (직전 질문과 답)
+        on_add: 메시지가 추가될 때마다 (메시지 목록) 으로 불림 (채팅방 요약 갱신 등)
+        """
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        self.min_recent = min_recent
+        self.on_add = on_add
+        self.window = []
+        self.summary = ""
+        self._window_tokens = 0
+        self._pending = []        # 창에서 밀려났지만 아직 요약에 합치지 못한 메시지
+        self._fold_task = None
+
+    @property
+    def messages(self) -> list:
+        if self.summary:
+            return [SystemMessage(content=SUMMARY_PREFIX + self.summary)] + self.window
+        return list(self.window)
+
+    async def aget_messages(self) -> list:
+        return self.messages
+
+    def add_messages(self, messages) -> None:
+        messages = list(messages)
+        for message in messages:
+            self.window.append(message)
+            self._window_tokens += message_tokens(message)
+        if self.on_add is not None:
+            self.on_add(messages)
+        self._trim()
+
+    async def aadd_messages(self, messages) -> None:
+        # 기본 구현은 스레드 풀에서 add_messages 를 부르므로, 이벤트 루프 안에서 바로 처리합니다.
+        self.add_messages(messages)
+
+    def clear(self) -> None:
+        if self._fold_task is not None and not self._fold_task.done():
+            self._fold_task.cancel()
+        self._fold_task = None
+        self.window = []
+        self.summary = ""
+        self._window_tokens = 0
+        self._pending = []
+
+    async def aclear(self) -> None:
+        self.clear()
+
+    def _summary_tokens(self) -> int:
+        return message_tokens(SystemMessage(content=SUMMARY_PREFIX + self.summary)) if self.summary else 0
+
+    def _trim(self):
+        # 요약이 차지하는 만큼 창의 예산이 줄어듭니다. 요약이 지나치게 길면 창 몫을 남기도록 잘라 냅니다.
+        summary_limit = self.token_budget // 2
+        if self._summary_tokens() > summary_limit:
+            self.summary = self.summary[:summary_limit - len(SUMMARY_PREFIX) - MESSAGE_OVERHEAD_TOKENS]
+        window_budget = self.token_budget - self._summary_tokens()
+        while len(self.window) > self.min_recent and self._window_tokens > window_budget:
+            message = self.window.pop(0)
+            self._window_tokens -= message_tokens(message)
+            self._pending.append(message)
+        if self._pending:
+            self._schedule_fold()
+
+    def _schedule_fold(self):
+        if self.summarizer is None:
+            self._pending = []
+            return
+        if self._fold_task is not None and not self._fold_task.done():
+            return  # 진행 중인 요약이 끝나면 남은 메시지까지 이어서 접습니다.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 이벤트 루프 밖에서 추가된 경우 다음 추가 때 접습니다.
+        self._fold_task = loop.create_task(self._fold())
+
+    async def _fold(self):
+        while self._pending:
+            # 요약 요청의 프롬프트도 예산 크기를 넘지 않도록 나눠서 접습니다.
+            size, tokens = 0, 0
+            while size < len(self._pending) and (size == 0 or tokens + message_tokens(self._pending[size]) <= self.token_budget):
+                tokens += message_tokens(self._pending[size])
+                size += 1
+            batch, self._pending = self._pending[:size], self._pending[size:]
+            try:
+                self.summary = (await self.summarizer(self.summary, batch)).strip()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 요약에 실패한 메시지는 버립니다. (프롬프트 크기 한도를 지키는 것이 우선)
+                print(f"[오류] 지난 대화 요약 실패: {e}")
+            self._trim()
+
@@ -0,0 +1,110 @@
+"""퀴즈 LLM 채점 결과 캐시.
+
+(질문, 정규화한 답변) 이 같으면 채점 결과도 같으므로, 한 번 LLM 으로 채점한 결과를
+프로세스 안 LRU(TTLCache) 와 여러 워커가 공유하는 Postgres(grading_cache) 두 단계에 저장합니다.
+
+- question_key: 질문과 정답 문자열의 해시 → 퀴즈 데이터가 바뀌면 자연히 새 키
+- version: 채점 프롬프트·few-shot·모델 이름·GRADING_CACHE_VERSION 의 해시 → 채점 기준이 바뀌면 예전 결과는 쓰지 않습니다.
+  배포 중에는 이전 버전 프로세스가 아직 자기 버전의 행을 쓰므로 시작할 때 지우지 않고,
+  GRADING_CACHE_RETENTION_DAYS 가 지난 행을 app/jobs/grading_cache_purge.py 로 주기적으로 지웁니다.
+"""
+import re
+import json
+import hashlib
+from app.core.cache import TTLCache
+from app.core.config import GRADING_CACHE_MAXSIZE, GRADING_CACHE_VERSION
+from app.services.korean_text import normalize, tokenize
+
+
+def _digest(*parts) -> str:
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def question_key(question: str, answer: str) -> str:
+    return _digest(question, answer)
+
+
+def answer_key(user_input: str) -> str:
+    """띄어쓰기·문장부호·대소문자 차이는 같은 답변으로 봅니다."""
+    return "".join(tokenize(normalize(user_input)))
+
+
+def parse_verdict(eval_result_text: str):
+    """채점 체인 출력의 마지막 `[판단: 참/거짓]` 을 True/False 로. 출력이 깨졌거나 잘려서 판단이 없으면 None."""
+    verdicts = re.findall(r"\[판단:\s*(참|거짓)\]", eval_result_text or "")
+    return verdicts[-1] == "참" if verdicts else None
+
+
+def grading_version(system_prompt: str, few_shots: list, model_name: str) -> str:
+    return _digest(system_prompt, json.dumps(few_shots, ensure_ascii=False, sort_keys=True), model_name or "", GRADING_CACHE_VERSION)
+
+
+def purge_expired(conn, retention_days: int) -> int:
+    """retention_days 일이 지난 채점 결과를 버전과 상관없이 지우고 지운 행 수를 반환합니다.
+    지난 버전의 행은 더는 조회되지 않으므로 이렇게 나이가 차서 사라집니다. (현재 버전은 다시 채점해서 채워짐)
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM grading_cache WHERE created_at < CURRENT_TIMESTAMP - make_interval(days => %s)",
+            (retention_days,)
+        )
+        count = cursor.rowcount
+    conn.commit()
+    return count
+
+
+class GradingCache:
+    def __init__(self, db_manager, quiz_type: str, version: str, maxsize: int = GRADING_CACHE_MAXSIZE):
+        self.db_manager = db_manager
+        self.quiz_type = quiz_type
+        self.version = version
+        self.local = TTLCache(maxsize)
+
+    def _fetch(self, question_hash: str, normalized_answer: str):
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return None
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT is_correct FROM grading_cache WHERE quiz_type = %s AND question_key = %s AND answer_key = %s AND version = %s",
+                    (self.quiz_type, question_hash, normalized_answer, self.version)
+                )
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            print(f"[DB 오류] 채점 캐시 조회 실패: {e}")
+            return None
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    def _store(self, question_hash: str, normalized_answer: str, is_correct: bool):
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """INSERT INTO grading_cache (quiz_type, question_key, answer_key, version, is_correct)
+                       VALUES (%s, %s, %s, %s, %s) ON CONFLICT DO NOTHING""",
+                    (self.quiz_type, question_hash, normalized_answer, self.version, is_correct)
+                )
+            conn.commit()
+        except Exception as e:
+            print(f"[DB 오류] 채점 캐시 저장 실패: {e}"); conn.rollback()
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
+
+    async def get(self, question: str, answer: str, user_input: str):
+        """캐시된 채점 결과(True/False)를 반환합니다. 없으면 None."""
+        key = (question_key(question, answer), answer_key(user_input))
+        verdict = self.local.get(key)
+        if verdict is not None:
+            return verdict
+        verdict = await self.db_manager._run_sync(self._fetch, *key)
+        if verdict is not None:
+            self.local.set(key, verdict)
+        return verdict
+
+    async def set(self, question: str, answer: str, user_input: str, is_correct: bool):
+        key = (question_key(question, answer), answer_key(user_input))
+        self.local.set(key, is_correct)
+        await self.db_manager._run_sync(self._store, *key, is_correct)
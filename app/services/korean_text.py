@@ -0,0 +1,120 @@
+"""외부 형태소 분석기 없이 쓰는 가벼운 한국어 텍스트 처리 도구.
+
+정확한 형태소 분석 대신 조사/어미를 뒤에서부터 떼어 내는 규칙만 쓰므로, 메시지 하나를 수 마이크로초 안에 처리합니다.
+"""
+import re
+import unicodedata
+
+_TOKEN_PATTERN = re.compile(r"[가-힣a-zA-Z0-9]+")
+_EMOTIVE_PATTERN = re.compile(r"[ㅠㅜㅋㅎ!♥❤♡]|\^\^|;;|ㅡㅡ|[\U0001F300-\U0001FAFF]")
+
+# 명사 뒤에 붙는 조사. 긴 것부터 떼어 내야 '에서' 가 '서' 로 잘리지 않습니다.
+PARTICLES = sorted([
+    "이랑", "한테", "에게", "에서", "부터", "까지", "처럼", "보다", "으로", "하고", "이가", "이는",
+    "은", "는", "이", "가", "을", "를", "에", "도", "만", "랑", "의", "로", "와", "과", "야", "아",
+], key=len, reverse=True)
+
+# 용언 뒤에 붙는 어미. 감정 어휘 사전이 어간(또는 활용형 앞부분)으로 되어 있어서 어미만 떼면 됩니다.
+ENDINGS = sorted([
+    "었어요", "았어요", "했어요", "었어", "았어", "했어", "어요", "아요", "해요", "이에요", "예요",
+    "습니다", "는데", "거든", "잖아", "구나", "네요", "어서", "아서", "해서", "니까",
+], key=len, reverse=True)
+# 한 글자 어미는 어간이 한 글자여도 뗍니다. ('싫어' -> '싫')
+SHORT_ENDINGS = ["어", "아", "해", "요", "다", "네", "지", "고", "까", "게", "서"]
+
+
+def normalize(text: str) -> str:
+    """NFC 정규화, 소문자화, 공백 정리."""
+    return " ".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN_PATTERN.findall(normalize(text))
+
+
+def _by_length(suffixes: list) -> list:
+    """[(길이, 접미사 집합)] 을 긴 길이부터. 토큰 끝 글자를 잘라 집합에서 찾으면 접미사 수와 상관없이 빠릅니다."""
+    lengths = sorted({len(suffix) for suffix in suffixes}, reverse=True)
+    return [(length, frozenset(suffix for suffix in suffixes if len(suffix) == length)) for length in lengths]
+
+
+_PARTICLES_BY_LENGTH = _by_length(PARTICLES)
+_ENDINGS_BY_LENGTH = _by_length(ENDINGS)
+
+
+def _strip_suffix(token: str, suffixes_by_length: list) -> str:
+    for length, suffixes in suffixes_by_length:
+        # 한 글자 접미사는 '사과' 의 '과' 처럼 단어의 일부일 수 있어서, 두 글자 이상 남을 때만 뗍니다.
+        required = 2 if length == 1 else 1
+        if len(token) - length >= required and token[-length:] in suffixes:
+            return token[:-length]
+    return token
+
+
+def strip_particle(token: str) -> str:
+    """'강아지랑' -> '강아지'."""
+    return _strip_suffix(token, _PARTICLES_BY_LENGTH)
+
+
+def strip_ending(token: str) -> str:
+    """'싫어요' -> '싫'. 남는 부분이 없으면 원래 토큰을 그대로 돌려줍니다."""
+    stripped = _strip_suffix(token, _ENDINGS_BY_LENGTH)
+    if stripped != token:
+        return stripped
+    if len(token) > 1 and token[-1] in SHORT_ENDINGS:
+        return token[:-1]
+    return token
+
+
+def has_emotive_marks(text: str) -> bool:
+    """ㅠㅠ, ㅋㅋ, 느낌표, 하트, 이모지처럼 감정이 드러나는 표시가 있는지 확인합니다."""
+    return bool(_EMOTIVE_PATTERN.search(text or ""))
+
+
+def extract_nouns(text: str, min_length: int = 2) -> list:
+    """조사를 뗀 토큰 중 min_length 글자 이상인 것을 순서대로 중복 없이 돌려줍니다. (명사 후보)"""
+    nouns = []
+    for token in tokenize(text):
+        noun = strip_particle(token)
+        if len(noun) >= min_length and noun not in nouns:
+            nouns.append(noun)
+    return nouns
+
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ["", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"]
+
+
+def decompose_jamo(text: str) -> str:
+    """완성형 한글을 자모 단위로 풉니다. ('고기' -> 'ㄱㅗㄱㅣ') 한글이 아닌 글자는 그대로 둡니다."""
+    jamo = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            jamo.append(_CHOSEONG[code // 588])
+            jamo.append(_JUNGSEONG[(code % 588) // 28])
+            jamo.append(_JONGSEONG[code % 28])
+        else:
+            jamo.append(char)
+    return "".join(jamo)
+
+
+def edit_distance(left: str, right: str) -> int:
+    """레벤슈타인 편집 거리."""
+    if len(left) < len(right):
+        left, right = right, left
+    previous = list(range(len(right) + 1))
+    for i, left_char in enumerate(left, 1):
+        current = [i]
+        for j, right_char in enumerate(right, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (left_char != right_char)))
+        previous = current
+    return previous[-1]
+
+
+def jamo_distance_ratio(left: str, right: str) -> float:
+    """자모 단위 편집 거리를 긴 쪽 길이로 나눈 값. 0 이면 같고 1 에 가까울수록 다릅니다. (오타·받침 실수에 너그럽게 비교)"""
+    left_jamo, right_jamo = decompose_jamo(left), decompose_jamo(right)
+    longest = max(len(left_jamo), len(right_jamo))
+    return edit_distance(left_jamo, right_jamo) / longest if longest else 0.0
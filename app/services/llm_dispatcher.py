@@ -0,0 +1,147 @@
+"""LLM 호출 우선순위 스케줄러.
+
+같은 Ollama 서버(들)를 아이와의 실시간 대화와 백그라운드 분석이 함께 쓰므로, 호출마다 우선순위 등급을 붙여
+빈 자리가 나면 높은 등급의 대기 요청부터 보냅니다.
+- interactive: 아이에게 바로 보여 줄 응답 (대화, 역할놀이, 퀴즈 채점, 주제 전환 판단)
+- background: 대화 저장 후 감정/키워드 분석, 단일 대화 분석, 채팅방 요약
+- batch: 주간 리포트 일괄 생성처럼 늦어져도 되는 작업
+
+전체 동시 호출 수(LLM_MAX_CONCURRENCY)와 등급별 동시 호출 수를 함께 제한하고,
+background + batch 가 함께 쓸 수 있는 자리는 전체에서 interactive_reserved 개를 뺀 만큼으로 묶어서
+백그라운드 작업이 몰려도 interactive 요청이 들어갈 자리가 항상 남도록 합니다.
+"""
+import time
+import asyncio
+import contextlib
+from collections import deque
+from langchain_core.runnables import Runnable
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+BATCH = "batch"
+PRIORITY_ORDER = (INTERACTIVE, BACKGROUND, BATCH)
+
+
+class LLMDispatcher:
+    def __init__(self, max_concurrency: int, class_limits: dict, interactive_reserved: int = 0):
+        self.max_concurrency = max_concurrency
+        # 전체 한도가 1 이면 비워 둘 수 없으므로, 백그라운드가 최소 한 자리는 쓰도록 남깁니다.
+        self.interactive_reserved = max(0, min(interactive_reserved, max_concurrency - 1))
+        if self.interactive_reserved < interactive_reserved:
+            print(f"[경고] 전체 LLM 동시 호출 한도({max_concurrency})가 작아 실시간 요청용 자리를 {self.interactive_reserved}개만 남깁니다.")
+        # 등급별 한도를 0 이하로 두면 전체 한도만 적용합니다.
+        self.class_limits = {
+            priority: class_limits.get(priority) if class_limits.get(priority, 0) > 0 else max_concurrency
+            for priority in PRIORITY_ORDER
+        }
+        self._in_flight = {priority: 0 for priority in PRIORITY_ORDER}
+        self._waiters = {priority: deque() for priority in PRIORITY_ORDER}  # (future, 대기 시작 시각)
+        self._stats = {priority: {"started": 0, "max_queued": 0, "wait_seconds": 0.0} for priority in PRIORITY_ORDER}
+
+    def _can_start(self, priority: str) -> bool:
+        in_flight = sum(self._in_flight.values())
+        if in_flight >= self.max_concurrency or self._in_flight[priority] >= self.class_limits[priority]:
+            return False
+        if priority == INTERACTIVE:
+            return True
+        # background 와 batch 는 실시간 요청용으로 남겨 둔 자리를 쓰지 않습니다.
+        return in_flight - self._in_flight[INTERACTIVE] < self.max_concurrency - self.interactive_reserved
+
+    def _start(self, priority: str, waited: float):
+        self._in_flight[priority] += 1
+        self._stats[priority]["started"] += 1
+        self._stats[priority]["wait_seconds"] += waited
+
+    def _wake_waiters(self):
+        for priority in PRIORITY_ORDER:
+            waiters = self._waiters[priority]
+            while waiters and self._can_start(priority):
+                future, queued_at = waiters.popleft()
+                if future.done():
+                    continue
+                self._start(priority, time.monotonic() - queued_at)
+                future.set_result(None)
+
+    async def acquire(self, priority: str):
+        # 같거나 높은 등급에 먼저 기다리는 요청이 없을 때만 바로 시작합니다.
+        higher_or_equal = PRIORITY_ORDER[:PRIORITY_ORDER.index(priority) + 1]
+        if self._can_start(priority) and not any(self._waiters[p] for p in higher_or_equal):
+            self._start(priority, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters[priority]
+        waiters.append((future, time.monotonic()))
+        self._stats[priority]["max_queued"] = max(self._stats[priority]["max_queued"], len(waiters))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 자리를 받은 직후에 취소되었으면 받은 자리를 돌려줍니다.
+                self.release(priority)
+            else:
+                for entry in waiters:
+                    if entry[0] is future:
+                        waiters.remove(entry)
+                        break
+                # 맨 앞 대기자가 빠져서 뒤의 요청이 바로 시작할 수 있을 수도 있습니다.
+                self._wake_waiters()
+            raise
+
+    def release(self, priority: str):
+        self._in_flight[priority] -= 1
+        self._wake_waiters()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: str):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def bind(self, model, priority: str):
+        """model 호출이 priority 등급으로 스케줄되도록 감쌉니다."""
+        return PrioritizedModel(model, self, priority)
+
+    def snapshot(self) -> dict:
+        result = {"max_concurrency": self.max_concurrency, "interactive_reserved": self.interactive_reserved}
+        for priority in PRIORITY_ORDER:
+            stats = self._stats[priority]
+            result[priority] = {
+                "limit": self.class_limits[priority],
+                "in_flight": self._in_flight[priority],
+                "queued": sum(1 for future, _ in self._waiters[priority] if not future.done()),
+                "max_queued": stats["max_queued"],
+                "started": stats["started"],
+                "avg_wait_ms": round(stats["wait_seconds"] / stats["started"] * 1000, 1) if stats["started"] else 0.0,
+            }
+        return result
+
+
+class PrioritizedModel(Runnable):
+    """체인 안에서 모델 대신 쓰는 Runnable. 호출(스트리밍 포함) 동안 디스패처의 자리를 하나 차지합니다."""
+
+    def __init__(self, bound, dispatcher: LLMDispatcher, priority: str):
+        self.bound = bound
+        self.dispatcher = dispatcher
+        self.priority = priority
+
+    def __getattr__(self, name):
+        # model 이름 등 감싼 모델의 속성은 그대로 보이게 합니다.
+        if name in ("bound", "dispatcher", "priority"):
+            raise AttributeError(name)
+        return getattr(self.bound, name)
+
+    def invoke(self, input, config=None, **kwargs):
+        # 동기 호출은 이벤트 루프 밖이라 스케줄하지 않습니다. (서비스 코드는 모두 비동기 호출을 씁니다)
+        return self.bound.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        async with self.dispatcher.slot(self.priority):
+            return await self.bound.ainvoke(input, config, **kwargs)
+
+    async def astream(self, input, config=None, **kwargs):
+        async with self.dispatcher.slot(self.priority):
+            async for chunk in self.bound.astream(input, config, **kwargs):
+                yield chunk
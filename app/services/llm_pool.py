@@ -0,0 +1,222 @@
+"""여러 Ollama 서버에 LLM 호출을 나눠 보내는 백엔드 풀.
+
+OLLAMA_BACKENDS 에 적은 서버마다 ChatOllama 를 하나씩 만들고, 호출이 들어오면
+- 살아 있는 서버 중 (진행 중인 요청 수 / 동시 처리 한도) 가 가장 작은 곳으로 보내고 (least outstanding requests)
+- 모든 서버가 한도까지 차 있으면 자리가 날 때까지 기다리며
+- 연결 실패·서버 과부하(5xx)면 그 서버를 잠시 빼고 다른 서버로 다시 보냅니다. (스트리밍은 첫 토큰 전까지만)
+빠진 서버는 주기적인 헬스 체크(/api/tags)가 성공하면 다시 넣습니다.
+
+풀 자체가 Runnable 이므로 `prompt | pool | StrOutputParser()` 처럼 모델 자리에 그대로 씁니다.
+"""
+import time
+import asyncio
+import httpx
+from ollama import ResponseError
+from langchain_core.runnables import Runnable
+from langchain_ollama import ChatOllama
+
+# 다른 서버로 다시 보내도 되는 오류 (요청이 서버에서 처리되기 전에 실패한 경우)
+RETRYABLE_ERRORS = (ConnectionError, httpx.TransportError)
+
+
+def parse_backends(spec: str, default_concurrency: int) -> list:
+    """'http://a:11434=4,http://b:11434' -> [('http://a:11434', 4), ('http://b:11434', default_concurrency)]"""
+    backends = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        url, _, limit = item.partition("=")
+        backends[url.strip().rstrip("/")] = int(limit) if limit.strip() else default_concurrency
+    return list(backends.items())
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return isinstance(error, ResponseError) and error.status_code >= 500
+
+
+class LLMBackendPool(Runnable):
+    def __init__(self, model_name: str, backends: list, health_interval: float = 10.0,
+                 failure_cooldown: float = 30.0, model_factory=None, **model_kwargs):
+        """
+        backends: [(base_url, 동시 처리 한도), ...]
+        model_factory: (base_url) -> 모델. 지정하지 않으면 ChatOllama(model=model_name, base_url=base_url, **model_kwargs)
+        """
+        if not backends:
+            raise ValueError("LLM 백엔드가 하나 이상 필요합니다. (OLLAMA_BACKENDS)")
+        self.model = model_name
+        self.health_interval = health_interval
+        self.failure_cooldown = failure_cooldown
+        model_factory = model_factory or (lambda url: ChatOllama(model=model_name, base_url=url, **model_kwargs))
+        self.backends = [
+            {
+                "url": url,
+                "model": model_factory(url),
+                "max_concurrency": limit,
+                "in_flight": 0,
+                "healthy": True,
+                "down_until": 0.0,
+                "requests": 0,
+                "failures": 0,
+                "last_error": None,
+            }
+            for url, limit in backends
+        ]
+        self.failovers = 0
+        self._condition = None
+        self._health_task = None
+
+    @property
+    def max_concurrency(self) -> int:
+        return sum(backend["max_concurrency"] for backend in self.backends)
+
+    # --- 백엔드 선택 ---
+
+    def _available(self, backend: dict) -> bool:
+        return backend["healthy"] or time.monotonic() >= backend["down_until"]
+
+    def _pick(self, exclude: set):
+        remaining = [b for b in self.backends if b["url"] not in exclude]
+        # 살아 있는 서버가 하나도 없으면 빠진 서버라도 시도합니다. (헬스 체크보다 실제 요청이 먼저 회복을 확인)
+        candidates = [b for b in remaining if self._available(b)] or remaining
+        free = [b for b in candidates if b["in_flight"] < b["max_concurrency"]]
+        if not free:
+            return None
+        return min(free, key=lambda b: (b["in_flight"] / b["max_concurrency"], b["in_flight"]))
+
+    async def _acquire(self, exclude: set) -> dict:
+        self._ensure_started()
+        async with self._condition:
+            while True:
+                backend = self._pick(exclude)
+                if backend is not None:
+                    backend["in_flight"] += 1
+                    backend["requests"] += 1
+                    return backend
+                await self._condition.wait()
+
+    async def _release(self, backend: dict):
+        # 취소되더라도 자리 수는 먼저 돌려 놓습니다. (깨우기를 놓친 대기자는 다음 반납이나 헬스 체크 때 깨어남)
+        backend["in_flight"] -= 1
+        async with self._condition:
+            self._condition.notify_all()
+
+    def _mark_failed(self, backend: dict, error: Exception):
+        if backend["healthy"]:
+            print(f"[LLM 풀] {backend['url']} 실패, {self.failure_cooldown:.0f}초 동안 제외: {error}")
+        backend["failures"] += 1
+        backend["healthy"] = False
+        backend["down_until"] = time.monotonic() + self.failure_cooldown
+        backend["last_error"] = str(error)[:200]
+
+    def _mark_ok(self, backend: dict):
+        if not backend["healthy"]:
+            print(f"[LLM 풀] {backend['url']} 복구됨")
+        backend["healthy"] = True
+        backend["down_until"] = 0.0
+
+    # --- 헬스 체크 ---
+
+    def _ensure_started(self):
+        # asyncio 객체는 실행 중인 이벤트 루프 안에서 처음 호출될 때 만듭니다.
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        if self._health_task is None and self.health_interval > 0:
+            self._health_task = asyncio.get_running_loop().create_task(self._health_loop())
+
+    async def check_backend(self, backend: dict, client: httpx.AsyncClient) -> bool:
+        try:
+            response = await client.get(f"{backend['url']}/api/tags")
+            response.raise_for_status()
+            names = {model.get("name") for model in response.json().get("models", [])}
+        except Exception as e:
+            self._mark_failed(backend, e)
+            return False
+        if self.model and self.model not in names and f"{self.model}:latest" not in names:
+            self._mark_failed(backend, RuntimeError(f"모델 {self.model} 이 설치되어 있지 않음"))
+            return False
+        self._mark_ok(backend)
+        return True
+
+    async def check_all(self) -> dict:
+        async with httpx.AsyncClient(timeout=5) as client:
+            results = await asyncio.gather(*(self.check_backend(backend, client) for backend in self.backends))
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify_all()
+        return {backend["url"]: ok for backend, ok in zip(self.backends, results)}
+
+    async def _health_loop(self):
+        while True:
+            try:
+                await self.check_all()
+            except Exception as e:
+                print(f"[LLM 풀] 헬스 체크 오류: {e}")
+            await asyncio.sleep(self.health_interval)
+
+    async def close(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+
+    # --- Runnable ---
+
+    def invoke(self, input, config=None, **kwargs):
+        # 동기 호출은 대기·재시도 없이 지금 가장 한가한 살아 있는 서버로 보냅니다.
+        candidates = [b for b in self.backends if self._available(b)] or self.backends
+        backend = min(candidates, key=lambda b: b["in_flight"] / b["max_concurrency"])
+        return backend["model"].invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        tried = set()
+        while True:
+            backend = await self._acquire(tried)
+            try:
+                result = await backend["model"].ainvoke(input, config, **kwargs)
+                self._mark_ok(backend)
+                return result
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                self._mark_failed(backend, e)
+                tried.add(backend["url"])
+                if len(tried) >= len(self.backends):
+                    raise
+                self.failovers += 1
+            finally:
+                await self._release(backend)
+
+    async def astream(self, input, config=None, **kwargs):
+        tried = set()
+        while True:
+            backend = await self._acquire(tried)
+            started = False
+            try:
+                async for chunk in backend["model"].astream(input, config, **kwargs):
+                    started = True
+                    yield chunk
+                self._mark_ok(backend)
+                return
+            except Exception as e:
+                # 이미 토큰을 보냈으면 다른 서버로 다시 시작할 수 없습니다.
+                if started or not _is_retryable(e):
+                    raise
+                self._mark_failed(backend, e)
+                tried.add(backend["url"])
+                if len(tried) >= len(self.backends):
+                    raise
+                self.failovers += 1
+            finally:
+                await self._release(backend)
+
+    def snapshot(self) -> dict:
+        return {
+            "model": self.model,
+            "failovers": self.failovers,
+            "backends": [
+                {key: backend[key] for key in ("url", "healthy", "in_flight", "max_concurrency", "requests", "failures", "last_error")}
+                for backend in self.backends
+            ],
+        }
@@ -2,6 +2,8 @@ import random
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from app.db.database import DatabaseManager
+from app.services.answer_matcher import match_answer, grading_metrics
+from app.services.grading_cache import GradingCache, grading_version, parse_verdict
 from app.core.config import QUIZ_DATA_PATH
 from app.prompts.prompts import QUIZ_EVAL_SYSTEM_PROMPT, QUIZ_EVAL_FEW_SHOTS
 
@@ -11,6 +13,9 @@ class QuizLogic:
         self.db_manager = db_manager
         self.quizzes_by_topic = self._load_quiz_data(QUIZ_DATA_PATH)
         self.quiz_eval_chain = self._create_quiz_eval_chain()
+        self.grading_cache = GradingCache(
+            db_manager, 'quiz', grading_version(QUIZ_EVAL_SYSTEM_PROMPT, QUIZ_EVAL_FEW_SHOTS, getattr(model, 'model', ''))
+        )
 
     def _load_quiz_data(self, file_path):
         quizzes_by_topic = {}
@@ -52,6 +57,26 @@ class QuizLogic:
         except Exception as e: 
             print(f"[오류] 퀴즈 채점 체인 생성 중 문제 발생: {e}"); return None
     
+    async def _grade(self, question: str, answer: str, user_input: str) -> bool:
+        # 정답과 확실히 같거나 다른 답변은 규칙으로 바로 채점하고, 이미 채점한 답변은 캐시에서 꺼내고, 나머지만 LLM 에 맡깁니다.
+        verdict = match_answer(answer, user_input)
+        if verdict is not None:
+            grading_metrics.record('quiz', 'fast_correct' if verdict else 'fast_incorrect')
+            return verdict
+        verdict = await self.grading_cache.get(question, answer, user_input)
+        if verdict is not None:
+            grading_metrics.record('quiz', 'cache_hit')
+            return verdict
+        grading_metrics.record('quiz', 'llm')
+        eval_result_text = await self.quiz_eval_chain.ainvoke({"answer": answer, "user_input": user_input})
+        verdict = parse_verdict(eval_result_text)
+        if verdict is None:
+            # 판단이 없는 출력은 이번 턴만 오답으로 처리하고, 캐시에는 남기지 않습니다.
+            print(f"[경고] 퀴즈 채점 출력에서 판단을 찾지 못했습니다: {eval_result_text[-80:]!r}")
+            return False
+        await self.grading_cache.set(question, answer, user_input, verdict)
+        return verdict
+
     async def talk(self, req: dict, profile_id: int):
         user_input = req['user_input']
         session_id = req['session_id']
@@ -89,8 +114,7 @@ class QuizLogic:
         current_step_index = quiz_state['current_step']
         current_question = quiz_state['questions'][current_step_index]
         
-        eval_result_text = await self.quiz_eval_chain.ainvoke({"answer": current_question['answer'], "user_input": user_input})
-        is_correct = "[판단: 참]" in eval_result_text
+        is_correct = await self._grade(current_question['question'], current_question['answer'], user_input)
         
         if is_correct:
             quiz_state['current_step'] += 1
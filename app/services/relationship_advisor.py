@@ -1,18 +1,21 @@
 import re
+import asyncio
 from datetime import date, timedelta
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from app.prompts.prompts import RELATIONSHIP_ADVICE_PROMPT_TEMPLATE
-from collections import Counter
+from app.core import time_range
+from app.core.config import WEEKLY_REPORT_LEASE_SECONDS, WEEKLY_REPORT_POLL_INTERVAL, WEEKLY_REPORT_WAIT_TIMEOUT
 from fastapi import HTTPException
 
 class RelationshipAdvisor:
     def __init__(self, model, db_manager):
         self.model = model
         self.db_manager = db_manager
+        self._inflight = {}  # (profile_id, start_date) -> 생성 중인 Task
 
     def get_weekly_report_from_db(self, profile_id: int, start_date: date):
-        conn = self.db_manager._create_db_connection()
+        conn = self.db_manager._get_db_connection()
         if conn is None: return None
         try:
             with conn.cursor() as cursor:
@@ -26,60 +29,111 @@ class RelationshipAdvisor:
             print(f"[DB 오류] 주간 리포트 조회 실패: {e}")
             return None
         finally:
-            if conn: conn.close()
+            if conn: self.db_manager._release_db_connection(conn)
 
-    def save_weekly_report_to_db(self, profile_id: int, start_date: date, end_date: date, report_content: str):
-        conn = self.db_manager._create_db_connection()
-        if conn is None: return
+    def save_weekly_report_to_db(self, profile_id: int, start_date: date, end_date: date, report_content: str) -> bool:
+        """리포트를 저장하고 성공 여부를 반환합니다. (다른 워커가 먼저 저장해 둔 경우도 성공)"""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return False
         try:
             with conn.cursor() as cursor:
                 cursor.execute(
-                    "INSERT INTO weekly_reports (profile_id, start_date, end_date, report_content) VALUES (%s, %s, %s, %s)",
+                    "INSERT INTO weekly_reports (profile_id, start_date, end_date, report_content) VALUES (%s, %s, %s, %s) "
+                    "ON CONFLICT (profile_id, start_date) DO NOTHING",
                     (profile_id, start_date, end_date, report_content)
                 )
             conn.commit()
             print(f"✅ 주간 리포트 저장 완료 (profile_id: {profile_id}, start_date: {start_date})")
+            return True
         except Exception as e:
             print(f"[DB 오류] 주간 리포트 저장 실패: {e}"); conn.rollback()
+            return False
         finally:
-            if conn: conn.close()
+            if conn: self.db_manager._release_db_connection(conn)
 
-    async def generate_and_get_weekly_report(self, profile_id: int):
-        today = date.today()
-        start_of_last_week = today - timedelta(days=today.weekday() + 7)
-        
-        existing_report = self.get_weekly_report_from_db(profile_id, start_of_last_week)
-        if existing_report:
-            print(f"✅ 기존 주간 리포트 조회 성공 (profile_id: {profile_id})")
-            return {"profile_id": profile_id, "advice": existing_report}
+    def get_finished_profile_ids(self, start_date: date):
+        """일괄 생성에서 이미 끝난(done/skipped) 프로필 id 집합을 반환합니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return set()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT profile_id FROM weekly_report_runs WHERE start_date = %s AND status IN ('done', 'skipped')",
+                    (start_date,)
+                )
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"[DB 오류] 주간 리포트 진행 상황 조회 실패: {e}")
+            return set()
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
 
-        print(f"⏳ 기존 리포트 없음. LLM으로 새로 생성 시작 (profile_id: {profile_id})")
-        start_of_this_week = start_of_last_week + timedelta(days=7)
-        records = self.db_manager.get_analyses_by_date_range(profile_id, start_of_last_week, start_of_this_week)
-        if not records:
-            raise HTTPException(status_code=404, detail="지난주에 분석된 대화 기록이 없습니다.")
+    def record_report_run(self, profile_id: int, start_date: date, status: str, error: str = None):
+        """리포트 생성 결과(done/skipped/failed)를 기록합니다. running 상태는 claim_report_generation 으로만 바꿉니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO weekly_report_runs (profile_id, start_date, status, last_error)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (profile_id, start_date) DO UPDATE SET
+                        status = EXCLUDED.status,
+                        last_error = EXCLUDED.last_error,
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    (profile_id, start_date, status, error)
+                )
+            conn.commit()
+        except Exception as e:
+            print(f"[DB 오류] 주간 리포트 진행 상황 기록 실패: {e}"); conn.rollback()
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
 
-        positive_keywords = Counter()
-        negative_keywords = Counter()
-        time_summary = {"오전": {"긍정": 0, "부정": 0}, "오후": {"긍정": 0, "부정": 0}, "저녁": {"긍정": 0, "부정": 0}}
+    def claim_report_generation(self, profile_id: int, start_date: date, lease_seconds: int = WEEKLY_REPORT_LEASE_SECONDS):
+        """해당 주차 리포트 생성을 선점합니다. 다른 워커가 lease_seconds 안에 선점해 생성 중이면 False 를 반환합니다."""
+        conn = self.db_manager._get_db_connection()
+        if conn is None: return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO weekly_report_runs (profile_id, start_date, status, attempts)
+                    VALUES (%s, %s, 'running', 1)
+                    ON CONFLICT (profile_id, start_date) DO UPDATE SET
+                        status = 'running',
+                        attempts = weekly_report_runs.attempts + 1,
+                        last_error = NULL,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE weekly_report_runs.status <> 'running'
+                       OR weekly_report_runs.updated_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+                    RETURNING 1
+                    """,
+                    (profile_id, start_date, lease_seconds)
+                )
+                claimed = cursor.fetchone() is not None
+            conn.commit()
+            return claimed
+        except Exception as e:
+            print(f"[DB 오류] 주간 리포트 생성 선점 실패: {e}"); conn.rollback()
+            return False
+        finally:
+            if conn: self.db_manager._release_db_connection(conn)
 
-        for record in records:
-            hour = record['created_at'].hour
-            if record['keyword']:
-                if record['is_positive']:
-                    positive_keywords[record['keyword']] += 1
-                else:
-                    negative_keywords[record['keyword']] += 1
-            if 6 <= hour < 12: time_period = "오전"
-            elif 12 <= hour < 18: time_period = "오후"
-            else: time_period = "저녁"
-            if record['is_positive']:
-                time_summary[time_period]["긍정"] += 1
-            else:
-                time_summary[time_period]["부정"] += 1
-        
-        pos_kw_str = ", ".join([f"'{kw}'({count}회)" for kw, count in positive_keywords.most_common(5)])
-        neg_kw_str = ", ".join([f"'{kw}'({count}회)" for kw, count in negative_keywords.most_common(5)])
+    async def generate_weekly_report(self, profile_id: int, start_of_last_week: date, start_of_this_week: date):
+        """[start_of_last_week, start_of_this_week) 기간의 분석 기록으로 리포트를 생성해 저장합니다. 기록이 없으면 None 을 반환합니다.
+        저장하지 못하면 예외를 올려서, 호출한 쪽이 리포트 없이 'done' 으로 기록하지 않게 합니다.
+        """
+        top_keywords, time_summary = await asyncio.gather(
+            self.db_manager.aget_top_keywords(profile_id, start_of_last_week, start_of_this_week, limit=5),
+            self.db_manager.aget_time_of_day_sentiment_counts(profile_id, start_of_last_week, start_of_this_week)
+        )
+        if not any(counts["긍정"] or counts["부정"] for counts in time_summary.values()):
+            return None
+
+        pos_kw_str = ", ".join([f"'{item['keyword']}'({item['count']}회)" for item in top_keywords['positive']])
+        neg_kw_str = ", ".join([f"'{item['keyword']}'({item['count']}회)" for item in top_keywords['negative']])
         daily_summary_str = (f"오전(긍정 {time_summary['오전']['긍정']}회, 부정 {time_summary['오전']['부정']}회), "
                              f"오후(긍정 {time_summary['오후']['긍정']}회, 부정 {time_summary['오후']['부정']}회), "
                              f"저녁(긍정 {time_summary['저녁']['긍정']}회, 부정 {time_summary['저녁']['부정']}회)")
@@ -93,5 +147,60 @@ class RelationshipAdvisor:
             "daily_summary": daily_summary_str
         })
         
-        self.save_weekly_report_to_db(profile_id, start_of_last_week, start_of_this_week - timedelta(days=1), advice_markdown)
-        return {"profile_id": profile_id, "advice": advice_markdown}
\ No newline at end of file
+        saved = await self.db_manager._run_sync(
+            self.save_weekly_report_to_db, profile_id, start_of_last_week, start_of_this_week - timedelta(days=1), advice_markdown
+        )
+        if not saved:
+            raise RuntimeError(f"주간 리포트 저장 실패 (profile_id: {profile_id}, start_date: {start_of_last_week})")
+        return advice_markdown
+
+    async def _generate_or_wait(self, profile_id: int, start_of_last_week: date, start_of_this_week: date):
+        """생성을 선점하면 직접 만들고, 다른 워커가 생성 중이면 리포트가 저장될 때까지 기다립니다.
+        WEEKLY_REPORT_WAIT_TIMEOUT 초 안에 리포트를 얻지 못하면(선점이 계속 막히거나 DB 오류로 선점에 실패) 503 을 올립니다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + WEEKLY_REPORT_WAIT_TIMEOUT
+        while True:
+            claimed = await self.db_manager._run_sync(self.claim_report_generation, profile_id, start_of_last_week)
+            if claimed:
+                try:
+                    advice_markdown = await self.generate_weekly_report(profile_id, start_of_last_week, start_of_this_week)
+                except Exception as e:
+                    await self.db_manager._run_sync(self.record_report_run, profile_id, start_of_last_week, 'failed', str(e))
+                    raise
+                status = 'done' if advice_markdown is not None else 'skipped'
+                await self.db_manager._run_sync(self.record_report_run, profile_id, start_of_last_week, status)
+                return advice_markdown
+
+            # 다른 워커가 생성 중. 저장되면 그 결과를 쓰고, 실패했거나 선점 시간이 지나면 다시 선점을 시도합니다.
+            if loop.time() >= deadline:
+                print(f"[오류] 주간 리포트 생성 대기 시간 초과 (profile_id: {profile_id}, start_date: {start_of_last_week})")
+                raise HTTPException(status_code=503, detail="주간 리포트를 생성하는 중입니다. 잠시 후 다시 시도해 주세요.")
+            await asyncio.sleep(WEEKLY_REPORT_POLL_INTERVAL)
+            existing_report = await self.db_manager._run_sync(self.get_weekly_report_from_db, profile_id, start_of_last_week)
+            if existing_report:
+                return existing_report
+
+    async def generate_and_get_weekly_report(self, profile_id: int):
+        start_of_last_week, start_of_this_week = time_range.last_week_dates()
+        
+        # 보통은 app.jobs.weekly_reports 일괄 작업이 미리 만들어 두므로 조회만 하고 끝납니다.
+        existing_report = await self.db_manager._run_sync(self.get_weekly_report_from_db, profile_id, start_of_last_week)
+        if existing_report:
+            print(f"✅ 기존 주간 리포트 조회 성공 (profile_id: {profile_id})")
+            return {"profile_id": profile_id, "advice": existing_report}
+
+        # 같은 프로세스에서 같은 주차를 동시에 요청하면 하나의 생성 작업을 함께 기다립니다.
+        key = (profile_id, start_of_last_week)
+        task = self._inflight.get(key)
+        if task is None:
+            print(f"⏳ 기존 리포트 없음. LLM으로 새로 생성 시작 (profile_id: {profile_id})")
+            task = asyncio.ensure_future(self._generate_or_wait(profile_id, start_of_last_week, start_of_this_week))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # 요청 하나가 끊겨도 다른 요청이 기다리는 생성 작업은 취소되지 않도록 shield 합니다.
+        advice_markdown = await asyncio.shield(task)
+        if advice_markdown is None:
+            raise HTTPException(status_code=404, detail="지난주에 분석된 대화 기록이 없습니다.")
+        return {"profile_id": profile_id, "advice": advice_markdown}
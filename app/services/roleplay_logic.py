@@ -46,7 +46,8 @@ class RolePlayLogic:
         response_text = f"좋아! 지금부터 너는 '{user_role}', 나는 '{bot_role}'이야. 역할에 맞춰 이야기해보자!"
         return response_text, chatroom_id
 
-    async def talk(self, req: dict, profile_id: int, chatroom_id: int):
+    async def _prepare_turn(self, req: dict):
+        """LLM 호출 직전까지의 준비를 합니다. (바로 끝낼 응답, 체인 호출 정보) 중 하나만 채워서 반환합니다."""
         user_input = req['user_input']
         session_id = req['session_id']
         session_state = self.db_manager.store.get(session_id)
@@ -66,13 +67,13 @@ class RolePlayLogic:
                 "response": "알겠어! 역할놀이를 종료할게. 재미있었어!",
                 "user_role": user_role,
                 "bot_role": bot_role
-            }
+            }, None
 
         if not session_state or not session_state.get('roleplay_state'):
-            return {"type": "error", "response": "역할놀이가 시작되지 않았습니다. 먼저 역할놀이를 시작해주세요."}
+            return {"type": "error", "response": "역할놀이가 시작되지 않았습니다. 먼저 역할놀이를 시작해주세요."}, None
 
         if not self.conversational_chain:
-            return {"type": "error", "response": "챗봇 로직 초기화에 실패했습니다."}
+            return {"type": "error", "response": "챗봇 로직 초기화에 실패했습니다."}, None
 
         role_instructions = ROLE_PROMPTS.get(bot_role, "주어진 역할에 충실하게 응답하세요.")
         system_prompt_text = f"""
@@ -110,17 +111,50 @@ class RolePlayLogic:
 - **반말 사용** 
 """
 
+        turn = {
+            "chain_input": {"input": user_input, "system_prompt": system_prompt_text},
+            "config": {'configurable': {'session_id': session_id}},
+            "user_role": user_role,
+            "bot_role": bot_role,
+        }
+        return None, turn
+
+    async def talk(self, req: dict, profile_id: int, chatroom_id: int):
+        early_result, turn = await self._prepare_turn(req)
+        if early_result:
+            return early_result
+
         try:
-            response_text = await self.conversational_chain.ainvoke(
-                {"input": user_input, "system_prompt": system_prompt_text},
-                config={'configurable': {'session_id': session_id}}
-            )
+            response_text = await self.conversational_chain.ainvoke(turn["chain_input"], config=turn["config"])
             return {
                 "type": "continue",
                 "response": response_text,
-                "user_role": user_role,
-                "bot_role": bot_role
+                "user_role": turn["user_role"],
+                "bot_role": turn["bot_role"]
             }
         except Exception as e:
             print(f"[오류] 역할놀이 대화 생성 중 문제 발생: {e}")
-            return {"type": "error", "response": "미안, 지금은 대답하기가 좀 힘들어."}
\ No newline at end of file
+            return {"type": "error", "response": "미안, 지금은 대답하기가 좀 힘들어."}
+
+    async def stream_talk(self, req: dict, profile_id: int, chatroom_id: int):
+        """talk 의 스트리밍 버전. ("token", 조각) 을 생성되는 대로 내보내고, 마지막에 ("done", talk 와 같은 결과) 를 내보냅니다."""
+        early_result, turn = await self._prepare_turn(req)
+        if early_result:
+            yield "done", early_result
+            return
+
+        chunks = []
+        try:
+            async for chunk in self.conversational_chain.astream(turn["chain_input"], config=turn["config"]):
+                chunks.append(chunk)
+                yield "token", chunk
+        except Exception as e:
+            print(f"[오류] 역할놀이 대화 스트리밍 중 문제 발생: {e}")
+            yield "done", {"type": "error", "response": "미안, 지금은 대답하기가 좀 힘들어."}
+            return
+        yield "done", {
+            "type": "continue",
+            "response": "".join(chunks),
+            "user_role": turn["user_role"],
+            "bot_role": turn["bot_role"]
+        }
@@ -0,0 +1,86 @@
+"""채팅방 요약을 대화 도중에 조금씩 갱신하는 요약기.
+
+채팅방을 닫을 때 전체 대화를 한 번에 요약하면 긴 방일수록 가장 비싼 LLM 호출이 되므로,
+every_turns 턴마다 새로 쌓인 턴만 지금까지의 요약에 합쳐(백그라운드) 요약을 미리 만들어 둡니다.
+방을 닫을 때는 진행 중인 갱신만 기다리고 미리 만든 요약을 그대로 씁니다.
+요약이 계속 실패해도 다시 보낼 메시지가 끝없이 늘지 않도록, 밀린 턴은 최근 2 * every_turns 턴까지만 남깁니다.
+"""
+import asyncio
+
+
+class IncrementalRoomSummary:
+    def __init__(self, summarizer, every_turns: int):
+        """summarizer: async (지금까지의 요약, 새 메시지 목록) -> 새 요약"""
+        self.summarizer = summarizer
+        self.every_turns = every_turns
+        self.summary = ""
+        self._pending = []        # 아직 요약에 합치지 않은 메시지
+        self._pending_turns = 0
+        self._folding = []        # 지금 요약에 합치는 중인 메시지
+        self._task = None
+
+    def add_messages(self, messages):
+        self._pending.extend(messages)
+        self._pending_turns += sum(1 for message in messages if message.type == "human")
+        if self._pending_turns >= self.every_turns:
+            self._schedule()
+
+    def _schedule(self):
+        if self._task is not None and not self._task.done():
+            return  # 진행 중인 갱신이 끝나면 그동안 쌓인 턴까지 이어서 합칩니다.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._fold_ready())
+
+    async def _fold_once(self) -> bool:
+        batch, turns = self._pending, self._pending_turns
+        self._pending, self._pending_turns, self._folding = [], 0, batch
+        try:
+            self.summary = await self.summarizer(self.summary, batch)
+            return True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 실패한 턴은 되돌려 두고 다음 갱신이나 방을 닫을 때 다시 합칩니다.
+            print(f"[오류] 채팅방 요약 갱신 실패: {e}")
+            self._pending, self._pending_turns = batch + self._pending, turns + self._pending_turns
+            self._trim_pending()
+            return False
+        finally:
+            self._folding = []
+
+    def _trim_pending(self):
+        """밀린 턴이 2 * every_turns 를 넘으면 오래된 턴부터 버립니다. (요약에는 빠지지만 매 갱신의 프롬프트 크기는 일정)"""
+        max_turns = max(1, self.every_turns) * 2
+        dropped = 0
+        while self._pending_turns > max_turns:
+            if self._pending.pop(0).type == "human":
+                self._pending_turns -= 1
+            dropped += 1
+        while dropped and self._pending and self._pending[0].type != "human":
+            self._pending.pop(0)  # 버린 턴의 봇 응답
+            dropped += 1
+        if dropped:
+            print(f"[경고] 채팅방 요약이 밀려 오래된 메시지 {dropped}개를 요약에서 뺍니다.")
+
+    async def _fold_ready(self):
+        while self._pending_turns >= self.every_turns:
+            if not await self._fold_once():
+                return
+
+    async def finalize(self) -> str:
+        """방을 닫을 때의 요약. 진행 중인 갱신을 기다리고, 아직 요약이 없을 때만 남은 턴을 요약합니다.
+        (이미 요약이 있으면 마지막 갱신 뒤의 몇 턴은 다시 요약하지 않습니다)
+        """
+        if self._task is not None and not self._task.done():
+            await self._task
+        if not self.summary and self._pending:
+            await self._fold_once()
+        return self.summary
+
+    def snapshot(self) -> tuple:
+        """(지금까지의 요약, 아직 요약에 반영되지 않은 메시지) — 합치는 중인 메시지도 포함합니다."""
+        return self.summary, self._folding + self._pending
+
@@ -17,7 +17,13 @@ class SentimentAnalyzer:
 
     async def analyze_individual_negative_talks(self, profile_id: int):
         # DB에서 부정적인 대화 목록 전체 조회 
-        talks = self.db_manager.get_negative_talks_by_profile_id(profile_id)
+        talks = []
+        cursor = None
+        while True:
+            page, cursor = await self.db_manager.aget_negative_talks_by_profile_id(profile_id, cursor=cursor)
+            talks.extend(page)
+            if not cursor:
+                break
         if not talks:
             return {"analyses": []} # 분석할 내용이 없으면 빈 리스트 반환
 
@@ -26,7 +32,8 @@ class SentimentAnalyzer:
         for talk in talks:
             tasks.append(self.analysis_chain.ainvoke({"user_talk": talk['content']}))
 
-        # 모든 분석 태스크를 병렬로 실행하여 결과를 받음 
+        # 모든 분석 태스크를 한꺼번에 만들되, 실제 동시 호출 수는 모델을 감싼 LLM 디스패처의 등급별 한도로 제한됨
+        # (ChatbotSystem.batch_model 을 넘기면 실시간 대화 응답보다 뒤로 밀림)
         analysis_results = await asyncio.gather(*tasks)
 
         # 원본 대화 내용과 분석 결과를 합쳐서 최종 리스트 생성 
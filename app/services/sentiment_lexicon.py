@@ -0,0 +1,75 @@
+"""LLM 감정 분석 전에 돌리는 로컬 사전 분류기.
+
+감정이 없다는 근거가 있는 발화만 '일반'으로 확정합니다.
+- 서버가 만든 안내 문장('역할놀이 시작: ...')과 '응', '알겠어' 같은 짧은 대답(NEUTRAL_REPLIES)
+- 퀴즈·초성·동물 퀴즈의 답변("횡단보도에서 기다려요", "토끼") 중 감정 어휘·위험 표현·부정어·강조어·감정 표시(ㅠㅠ, ! 등)가
+  하나도 없는 짧은 문장
+일상 대화·역할놀이의 자유 발화는 짧아도 사전에 없는 말로 감정을 드러낼 수 있으므로("아빠가 때렸어", "엄마 보고싶어")
+항상 LLM 에 넘깁니다. 잘못 '일반'으로 확정하면 분석이 통째로 빠지므로, 애매하면 항상 LLM 쪽으로 보냅니다.
+
+오프라인 일치율 점검: python -m app.jobs.sentiment_lexicon_report
+"""
+import re
+from app.services.korean_text import normalize, tokenize, has_emotive_marks
+from app.core.config import PRECLASSIFY_MAX_TOKENS
+
+# 어간 또는 활용형 앞부분. 두 글자 이상은 토큰 안에 들어 있기만 해도, 한 글자는 토큰이 그 글자로 시작하면 감정 어휘로 봅니다.
+POSITIVE_STEMS = {
+    "좋", "최고", "신나", "신났", "신난", "재밌", "재미있", "행복", "기쁘", "기뻐", "기뻤", "즐거", "즐겁",
+    "사랑", "고마", "고맙", "감사", "멋지", "멋져", "멋있", "예쁘", "예뻐", "귀여", "귀엽", "맛있", "맛나",
+    "설레", "뿌듯", "칭찬", "웃", "편하", "편해", "잘했", "선물", "생일", "자랑", "짱", "대박", "히히", "헤헤",
+}
+NEGATIVE_STEMS = {
+    "싫", "미워", "밉", "슬프", "슬퍼", "슬펐", "무서", "무섭", "화나", "화났", "화가", "짜증", "속상",
+    "아프", "아파", "아팠", "울", "눈물", "힘들", "힘드", "외로", "외롭", "걱정", "심심", "지루", "재미없",
+    "맛없", "혼나", "혼났", "싸웠", "싸워", "다쳤", "다치", "무시", "괴롭", "놀렸", "놀려", "피곤", "졸려",
+    "배고파", "답답", "억울", "부끄", "창피", "겁나", "미안", "실망", "망했", "죽겠", "최악", "별로",
+}
+# 보호자에게 꼭 전해야 하는 위험·그리움 표현. 감정 어휘가 없어도 LLM 이 판단하게 합니다.
+RISK_STEMS = {
+    "때리", "때렸", "때려", "맞았", "혼내", "혼냈", "부쉈", "부숴", "부서", "망가", "뺏", "빼앗", "잃어버",
+    "보고싶", "보고 싶", "그리워", "그립", "도와줘", "살려", "아무도", "혼자",
+}
+# 감정이 실린 문장에 자주 붙는 강조어와 부정어
+INTENSIFIERS = {"너무", "진짜", "정말", "완전", "엄청", "제일", "되게", "많이"}
+NEGATION_TOKENS = {"안", "못"}
+NEGATION_STEMS = {"않", "없"}
+
+# 서버가 만들어 저장하는 안내 문장
+SYNTHETIC_PREFIXES = ("역할놀이 시작:",)
+# 어느 놀이에서든 감정이 없는 짧은 대답 (문장 전체가 이것과 같을 때만)
+NEUTRAL_REPLIES = {
+    "응", "웅", "어", "네", "넹", "예", "ㅇㅇ", "그래", "그래요", "알겠어", "알겠어요", "알았어", "알았어요",
+    "안녕", "안녕하세요", "다음", "다음 문제", "힌트", "힌트 줘", "힌트 주세요",
+}
+
+_ALL_STEMS = POSITIVE_STEMS | NEGATIVE_STEMS | NEGATION_STEMS | RISK_STEMS
+_LONG_STEM_PATTERN = re.compile("|".join(sorted((stem for stem in _ALL_STEMS if len(stem) >= 2), key=len, reverse=True)))
+_SHORT_STEMS = frozenset(stem for stem in _ALL_STEMS if len(stem) == 1)
+_CUE_TOKENS = frozenset(INTENSIFIERS | NEGATION_TOKENS)
+
+
+def preclassify(text: str, game_turn: bool = False):
+    """감정이 없는 게 확실하면 '일반', 아니면 None(LLM 판단 필요)을 반환합니다.
+    game_turn: 퀴즈·초성·동물 퀴즈의 답변이면 True. 아니면 안내 문장과 NEUTRAL_REPLIES 만 '일반'으로 확정합니다.
+    """
+    normalized = normalize(text)
+    if not normalized:
+        return None
+    if normalized.startswith(SYNTHETIC_PREFIXES):
+        return "일반"
+    if normalized.rstrip(".?~ ") in NEUTRAL_REPLIES:
+        return "일반"
+    if not game_turn or has_emotive_marks(normalized):
+        return None
+
+    tokens = tokenize(normalized)
+    if not tokens or len(tokens) > PRECLASSIFY_MAX_TOKENS:
+        return None
+    # 조사·어미가 붙어도 어간은 토큰 앞쪽에 그대로 남으므로, 두 글자 이상 어휘는 문장 전체에서 한 번에 찾고
+    # 한 글자 어휘('좋', '싫' 등)는 토큰의 첫 글자만 봅니다.
+    if _LONG_STEM_PATTERN.search(normalized):
+        return None
+    if any(token in _CUE_TOKENS or token[0] in _SHORT_STEMS for token in tokens):
+        return None
+    return "일반"
@@ -0,0 +1,60 @@
+"""사용자 발화 분석 결과(LLM 출력) 파서.
+
+모든 파서는 {"sentiment", "keywords", "summary", "keyword"} 형태의 dict 를 반환합니다.
+- sentiment: '긍정' / '부정' / '일반'
+- keywords: talk.keywords 에 저장할 키워드 목록
+- summary, keyword: analysis 테이블에 저장할 요약문과 핵심 단어 (없으면 None)
+"""
+import re
+
+SENTIMENT_PATTERN = re.compile(r"\[판단:\s*(긍정|부정|일반)\s*\]")
+KEYWORDS_PATTERN = re.compile(r"\[키워드:\s*(.*)\]")
+SUMMARY_PATTERN = re.compile(r"\[요약문\]:\s*(.*)")
+CORE_KEYWORD_PATTERN = re.compile(r"\[핵심 단어\]:\s*(.*)")
+
+# 모델이 값을 채우지 않고 자리표시자를 그대로 내보낸 경우
+_EMPTY_VALUES = {"", "없음", "[핵심 단어]", "[요약문]"}
+
+
+def _clean(value: str):
+    value = value.strip() if value else ""
+    return None if value in _EMPTY_VALUES else value
+
+
+def _parse_keywords(raw_response: str) -> list:
+    keywords_match = KEYWORDS_PATTERN.search(raw_response)
+    return [k.strip() for k in keywords_match.group(1).split(',') if k.strip()] if keywords_match else []
+
+
+def parse_sentiment_keywords(raw_response: str) -> dict:
+    """ANALYSIS_PROMPT_TEMPLATE 출력 파싱. 판단이 없으면 '일반'으로 봅니다."""
+    sentiment_match = SENTIMENT_PATTERN.search(raw_response)
+    return {
+        "sentiment": sentiment_match.group(1) if sentiment_match else "일반",
+        "keywords": _parse_keywords(raw_response),
+        "summary": None,
+        "keyword": None,
+    }
+
+
+def parse_combined_analysis(raw_response: str):
+    """COMBINED_TALK_ANALYSIS_PROMPT 출력 파싱.
+
+    판단 줄이 없으면 형식이 깨진 것으로 보고 None 을 반환합니다.
+    긍정/부정인데 요약문이나 핵심 단어가 비어 있으면 summary/keyword 를 None 으로 두어, 호출하는 쪽이 단일 대화 분석만 다시 하게 합니다.
+    """
+    sentiment_match = SENTIMENT_PATTERN.search(raw_response)
+    if not sentiment_match:
+        return None
+    sentiment = sentiment_match.group(1)
+    result = {"sentiment": sentiment, "keywords": _parse_keywords(raw_response), "summary": None, "keyword": None}
+    if sentiment == "일반":
+        return result
+
+    summary_match = SUMMARY_PATTERN.search(raw_response)
+    keyword_match = CORE_KEYWORD_PATTERN.search(raw_response)
+    summary = _clean(summary_match.group(1)) if summary_match else None
+    keyword = _clean(keyword_match.group(1)) if keyword_match else None
+    if summary and keyword:
+        result["summary"], result["keyword"] = summary, keyword
+    return result
@@ -0,0 +1,92 @@
+"""임베딩 없이 글자 n-gram TF-IDF 유사도로 주제 전환을 판단합니다.
+
+새 입력과 최근 대화의 글자 1~3-gram 벡터 사이 코사인 유사도가
+- TOPIC_SAME_ABOVE 이상이면 SAME_TOPIC,
+- TOPIC_NEW_BELOW 미만이면 NEW_TOPIC,
+- 그 사이(애매한 구간)면 None 을 돌려주고 LLM 판단(TOPIC_CHECK_PROMPT_TEMPLATE)에 맡깁니다.
+
+한 글자 주제어('성', '밥')도 잡도록 1-gram 을 포함하며, IDF 는 지금까지 본 발화로 프로세스 안에서 계속 갱신해
+'어', '했어' 처럼 흔한 조각의 비중을 낮춥니다.
+점검: python -m app.jobs.topic_shift_benchmark
+"""
+import math
+from collections import Counter
+from app.services.korean_text import normalize, tokenize
+from app.core.config import TOPIC_NEW_BELOW, TOPIC_SAME_ABOVE, TOPIC_HISTORY_TURNS
+
+SAME_TOPIC = "SAME_TOPIC"
+NEW_TOPIC = "NEW_TOPIC"
+
+# "다른 얘기 하자", "근데 있잖아" 처럼 화제를 바꿀 때 자주 쓰는 표현. 유사도가 높아도 LLM 에 맡깁니다.
+TOPIC_CHANGE_CUES = ("다른 얘기", "다른 이야기", "딴 얘기", "얘기하자", "이야기하자", "있잖아", "그런데", "근데", "말고")
+# 한 단어 대답("응", "아니", "몰라")은 챗봇 질문에 대한 답으로 보고 이어지는 대화로 처리합니다.
+SHORT_REPLY_MAX_TOKENS = 1
+MAX_DOCUMENT_FREQUENCIES = 50000
+
+
+def char_ngrams(text: str, sizes=(1, 2, 3)) -> Counter:
+    """공백을 뺀 정규화 텍스트의 글자 n-gram 빈도."""
+    compact = "".join(tokenize(text))
+    grams = Counter()
+    for size in sizes:
+        for index in range(len(compact) - size + 1):
+            grams[compact[index:index + size]] += 1
+    return grams
+
+
+class TopicShiftScorer:
+    def __init__(self, new_below: float = TOPIC_NEW_BELOW, same_above: float = TOPIC_SAME_ABOVE, history_turns: int = TOPIC_HISTORY_TURNS):
+        self.new_below = new_below
+        self.same_above = same_above
+        self.history_turns = history_turns
+        self._document_frequency = Counter()
+        self._documents = 0
+
+    def _observe(self, grams: Counter):
+        if len(self._document_frequency) > MAX_DOCUMENT_FREQUENCIES:
+            # 메모리가 끝없이 늘지 않도록, 너무 커지면 통계를 처음부터 다시 쌓습니다.
+            self._document_frequency.clear()
+            self._documents = 0
+        self._document_frequency.update(grams.keys())
+        self._documents += 1
+
+    def _weights(self, grams: Counter) -> dict:
+        documents = self._documents + 1
+        return {
+            gram: (1 + math.log(count)) * math.log((documents + 1) / (self._document_frequency[gram] + 1) + 1)
+            for gram, count in grams.items()
+        }
+
+    @staticmethod
+    def _cosine(left: dict, right: dict) -> float:
+        if not left or not right:
+            return 0.0
+        if len(left) > len(right):
+            left, right = right, left
+        dot = sum(weight * right.get(gram, 0.0) for gram, weight in left.items())
+        norm = math.sqrt(sum(w * w for w in left.values())) * math.sqrt(sum(w * w for w in right.values()))
+        return dot / norm if norm else 0.0
+
+    def score(self, history_texts: list, user_input: str) -> float:
+        """최근 history_turns 개 발화를 합친 문맥과 새 입력의 유사도 (0~1)."""
+        input_grams = char_ngrams(user_input)
+        context_grams = Counter()
+        for text in history_texts[-self.history_turns:]:
+            context_grams.update(char_ngrams(text))
+        similarity = self._cosine(self._weights(input_grams), self._weights(context_grams))
+        self._observe(input_grams)
+        return similarity
+
+    def decide(self, history_texts: list, user_input: str) -> tuple:
+        """(SAME_TOPIC / NEW_TOPIC / None, 유사도) 를 반환합니다. None 이면 LLM 으로 판단해야 합니다."""
+        similarity = self.score(history_texts, user_input)
+        normalized = normalize(user_input)
+        has_change_cue = any(cue in normalized for cue in TOPIC_CHANGE_CUES)
+
+        if similarity < self.new_below:
+            if not has_change_cue and len(tokenize(normalized)) <= SHORT_REPLY_MAX_TOKENS:
+                return SAME_TOPIC, similarity
+            return NEW_TOPIC, similarity
+        if similarity >= self.same_above and not has_change_cue:
+            return SAME_TOPIC, similarity
+        return None, similarity